@@ -10,7 +10,16 @@ from sqlmodel import SQLModel
 from alembic import context
 
 # Import all models here so Alembic can detect them
-from src.models import Card, Category, User  # noqa: F401
+from src.models import (  # noqa: F401
+    Card,
+    Category,
+    CategoryPattern,
+    Expense,
+    ExtractionCacheEntry,
+    StoredAudio,
+    TranscriptionCacheEntry,
+    User,
+)
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
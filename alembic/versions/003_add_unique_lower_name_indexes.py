@@ -0,0 +1,54 @@
+"""add unique lower(name) partial indexes on cards and categories
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-18
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "003"
+down_revision: str | None = "002"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+ACTIVE_ROWS = sa.text("deleted_at IS NULL")
+
+
+def _soft_delete_duplicates(table: str) -> None:
+    """Keep the oldest active row per (user_id, lower(name)); soft-delete the rest."""
+    op.execute(
+        f"""
+        UPDATE {table} SET deleted_at = CURRENT_TIMESTAMP
+        WHERE deleted_at IS NULL
+          AND id NOT IN (
+            SELECT min(id) FROM {table}
+            WHERE deleted_at IS NULL
+            GROUP BY user_id, lower(name)
+          )
+        """
+    )
+
+
+def upgrade() -> None:
+    for table in ("cards", "categories"):
+        _soft_delete_duplicates(table)
+        op.create_index(
+            f"uq_{table}_user_id_lower_name",
+            table,
+            ["user_id", sa.text("lower(name)")],
+            unique=True,
+            postgresql_where=ACTIVE_ROWS,
+            sqlite_where=ACTIVE_ROWS,
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_categories_user_id_lower_name", table_name="categories")
+    op.drop_index("uq_cards_user_id_lower_name", table_name="cards")
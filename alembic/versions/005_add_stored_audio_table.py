@@ -0,0 +1,41 @@
+"""add stored_audio table
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-18
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "005"
+down_revision: str | None = "004"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "stored_audio",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("file_unique_id", sa.String(length=64), nullable=False),
+        sa.Column("size_bytes", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("created_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.Column("expires_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_stored_audio_file_unique_id"), "stored_audio", ["file_unique_id"], unique=True
+    )
+    op.create_index(op.f("ix_stored_audio_expires_at"), "stored_audio", ["expires_at"])
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_stored_audio_expires_at"), table_name="stored_audio")
+    op.drop_index(op.f("ix_stored_audio_file_unique_id"), table_name="stored_audio")
+    op.drop_table("stored_audio")
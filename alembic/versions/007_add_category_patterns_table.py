@@ -0,0 +1,49 @@
+"""add category_patterns table
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-18
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "007"
+down_revision: str | None = "006"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "category_patterns",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("description_normalized", sa.String(length=255), nullable=False),
+        sa.Column("category_id", sa.Integer(), nullable=False),
+        sa.Column("confirmation_count", sa.Integer(), nullable=False, server_default="1"),
+        sa.Column("last_used_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.Column("created_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.PrimaryKeyConstraint("id"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.ForeignKeyConstraint(["category_id"], ["categories.id"]),
+        sa.UniqueConstraint(
+            "user_id",
+            "description_normalized",
+            "category_id",
+            name="uq_category_patterns_user_description_category",
+        ),
+    )
+    op.create_index(
+        op.f("ix_category_patterns_user_id"), "category_patterns", ["user_id"], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_category_patterns_user_id"), table_name="category_patterns")
+    op.drop_table("category_patterns")
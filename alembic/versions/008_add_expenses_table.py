@@ -0,0 +1,56 @@
+"""add expenses table with stored description_normalized
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-18
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "008"
+down_revision: str | None = "007"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # description_normalized is written by the application (src.db.normalization);
+    # rows written before it existed are fixed by ``python -m src.db.backfill``.
+    op.create_table(
+        "expenses",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("card_id", sa.Integer(), nullable=True),
+        sa.Column("category_id", sa.Integer(), nullable=False),
+        sa.Column("description", sa.String(length=200), nullable=False),
+        sa.Column("description_normalized", sa.String(length=255), nullable=False),
+        sa.Column("total_amount", sa.Numeric(precision=12, scale=2), nullable=False),
+        sa.Column("installments", sa.Integer(), nullable=False, server_default="1"),
+        sa.Column("expense_date", sa.Date(), nullable=False),
+        sa.Column("is_essential", sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column("confidence_score", sa.Float(), nullable=True),
+        sa.Column("transcription", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.PrimaryKeyConstraint("id"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.ForeignKeyConstraint(["card_id"], ["cards.id"]),
+        sa.ForeignKeyConstraint(["category_id"], ["categories.id"]),
+    )
+    op.create_index(
+        "ix_expenses_user_id_description_normalized",
+        "expenses",
+        ["user_id", "description_normalized"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_expenses_user_id_description_normalized", table_name="expenses")
+    op.drop_table("expenses")
@@ -4,6 +4,8 @@ import logging
 
 from telegram.ext import Application, CommandHandler, ConversationHandler, MessageHandler, filters
 
+from src.bot.audio_jobs import shutdown_audio_job_queue
+from src.bot.context import BOT_CONTEXT_TYPES, BotApplication
 from src.bot.handlers.audio import audio_message_handler
 from src.bot.handlers.cards import (
     CARD_CLOSING_DAY,
@@ -38,7 +40,18 @@ from src.bot.handlers.start import (
     confirm_pin,
     start_handler,
 )
+from src.bot.update_processor import UserOrderedUpdateProcessor
 from src.core.config import settings
+from src.services.auth.pin_service import shutdown_pin_pool
+from src.services.extraction import shutdown_expense_extractor
+from src.services.learning import category_pattern_index
+from src.services.transcription import (
+    LocalWhisperBackend,
+    TranscriptionError,
+    get_transcriber,
+    shutdown_audio_sweeper,
+    start_audio_sweeper,
+)
 
 logging.basicConfig(
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
@@ -47,9 +60,56 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+async def _post_init(application: Application) -> None:
+    """Start the background sweeper/flusher and warm up the local Whisper fallback.
+
+    Loading the model up front keeps the first hedged request from a cold start.
+    """
+    start_audio_sweeper()
+    category_pattern_index.start()
+    fallback = get_transcriber().fallback
+    if isinstance(fallback, LocalWhisperBackend):
+        try:
+            await fallback.warm_up()
+        except TranscriptionError:
+            logger.exception("Local Whisper fallback unavailable; continuing with Groq only")
+
+
+async def _post_stop(application: Application) -> None:
+    """Finish queued voice-note jobs while the bot can still edit messages.
+
+    Pattern counters are flushed after the jobs, which may still confirm expenses.
+    """
+    await shutdown_audio_job_queue()
+    await category_pattern_index.stop()
+    await shutdown_audio_sweeper()
+    await shutdown_expense_extractor()
+
+
+async def _post_shutdown(application: Application) -> None:
+    """Release process-level resources when the bot stops."""
+    shutdown_pin_pool()
+
+
 def create_app() -> Application:
     """Create and configure the Telegram bot application."""
-    application = Application.builder().token(settings.TELEGRAM_BOT_TOKEN).build()
+    application = (
+        Application.builder()
+        .application_class(BotApplication)
+        .context_types(BOT_CONTEXT_TYPES)
+        .token(settings.TELEGRAM_BOT_TOKEN)
+        .concurrent_updates(
+            UserOrderedUpdateProcessor(
+                max_running=settings.BOT_CONCURRENT_UPDATES,
+                max_queue_per_user=settings.BOT_MAX_UPDATES_PER_USER,
+                max_pending=settings.BOT_MAX_PENDING_UPDATES,
+            )
+        )
+        .post_init(_post_init)
+        .post_stop(_post_stop)
+        .post_shutdown(_post_shutdown)
+        .build()
+    )
 
     # /start: new user -> PIN creation (ConversationHandler)
     start_conv = ConversationHandler(
@@ -108,10 +168,42 @@ def create_app() -> Application:
     return application
 
 
+def run_webhook(application: Application) -> None:
+    """Serve Telegram updates over HTTPS webhook (production mode).
+
+    Telegram posts each update to ``{WEBHOOK_URL}/{WEBHOOK_PATH}`` with the
+    ``X-Telegram-Bot-Api-Secret-Token`` header; requests without the matching
+    secret are rejected by the webhook server.
+    """
+    if not settings.WEBHOOK_URL:
+        raise ValueError("WEBHOOK_URL is required when BOT_MODE=webhook.")
+    if not settings.WEBHOOK_SECRET_TOKEN:
+        raise ValueError("WEBHOOK_SECRET_TOKEN is required when BOT_MODE=webhook.")
+
+    url_path = settings.WEBHOOK_PATH.strip("/")
+    logger.info(
+        "Starting bot (webhook on %s:%s/%s, concurrent updates=%s)...",
+        settings.WEBHOOK_LISTEN,
+        settings.WEBHOOK_PORT,
+        url_path,
+        settings.BOT_CONCURRENT_UPDATES,
+    )
+    application.run_webhook(
+        listen=settings.WEBHOOK_LISTEN,
+        port=settings.WEBHOOK_PORT,
+        url_path=url_path,
+        webhook_url=f"{settings.WEBHOOK_URL.rstrip('/')}/{url_path}",
+        secret_token=settings.WEBHOOK_SECRET_TOKEN,
+    )
+
+
 def main() -> None:
-    """Run the bot."""
+    """Run the bot (webhook in production, long polling for development)."""
     app = create_app()
-    logger.info("Starting bot...")
+    if settings.BOT_MODE == "webhook":
+        run_webhook(app)
+        return
+    logger.info("Starting bot (polling)...")
     app.run_polling()
 
 
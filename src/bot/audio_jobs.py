@@ -0,0 +1,150 @@
+"""Background job queue for voice-note processing (FEAT-003).
+
+Download + transcription take seconds; running them in the update handler
+would hold the update (and its per-user slot) for the whole Groq round trip.
+Handlers instead acknowledge immediately and submit a job here. A fixed pool
+of asyncio workers drains a bounded queue; when it is full, ``submit`` raises
+``AudioQueueFullError`` so the handler can shed load with ``AUDIO.QUEUE_FULL``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import logging
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+from src.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+AudioJob = Callable[[], Awaitable[None]]
+
+
+class AudioQueueFullError(Exception):
+    """Raised when the audio job queue is at capacity (load shedding)."""
+
+
+@dataclass(frozen=True, slots=True)
+class AudioJobStats:
+    """Counters exposed for monitoring the audio job queue."""
+
+    queued: int
+    running: int
+    processed: int
+    failed: int
+    rejected: int
+
+
+class AudioJobQueue:
+    """Bounded asyncio queue drained by ``workers`` background tasks.
+
+    Workers are started lazily on the first ``submit`` (inside the running
+    loop). They run in an empty ``contextvars.Context`` so jobs never inherit
+    the submitting update's unit of work.
+    """
+
+    def __init__(self, workers: int = 4, max_size: int = 100) -> None:
+        if workers < 1 or max_size < 1:
+            raise ValueError("workers and max_size must be positive.")
+        self.workers = workers
+        self.max_size = max_size
+        self._queue: asyncio.Queue[AudioJob] | None = None
+        self._tasks: list[asyncio.Task[None]] = []
+        self._running = 0
+        self._processed = 0
+        self._failed = 0
+        self._rejected = 0
+
+    def full(self) -> bool:
+        """Return True if a new job would be rejected."""
+        return self._queue is not None and self._queue.full()
+
+    def submit(self, job: AudioJob) -> None:
+        """Enqueue ``job`` without waiting; raise ``AudioQueueFullError`` when full."""
+        queue = self._ensure_started()
+        try:
+            queue.put_nowait(job)
+        except asyncio.QueueFull:
+            self._rejected += 1
+            raise AudioQueueFullError(f"Audio queue full ({self.max_size} jobs).") from None
+
+    async def join(self) -> None:
+        """Wait until every submitted job has finished."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def stop(self, timeout: float | None = None) -> None:
+        """Let queued jobs finish (up to ``timeout`` seconds), then stop the workers."""
+        if self._queue is None:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except TimeoutError:
+            logger.warning("Audio queue stopped with %s jobs pending", self._queue.qsize())
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+
+    def stats(self) -> AudioJobStats:
+        """Return queue depth and job counters."""
+        return AudioJobStats(
+            queued=self._queue.qsize() if self._queue is not None else 0,
+            running=self._running,
+            processed=self._processed,
+            failed=self._failed,
+            rejected=self._rejected,
+        )
+
+    def _ensure_started(self) -> asyncio.Queue[AudioJob]:
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_size)
+            self._tasks = [
+                asyncio.create_task(
+                    self._worker(self._queue),
+                    name=f"audio-job-worker-{n}",
+                    context=contextvars.Context(),
+                )
+                for n in range(self.workers)
+            ]
+        return self._queue
+
+    async def _worker(self, queue: asyncio.Queue[AudioJob]) -> None:
+        while True:
+            job = await queue.get()
+            self._running += 1
+            try:
+                await job()
+                self._processed += 1
+            except Exception:
+                # Jobs report their own errors to the user; this is a last resort
+                self._failed += 1
+                logger.exception("Unhandled error in audio job")
+            finally:
+                self._running -= 1
+                queue.task_done()
+
+
+_audio_jobs: AudioJobQueue | None = None
+
+
+def get_audio_job_queue() -> AudioJobQueue:
+    """Return the process-wide audio job queue, creating it on first use."""
+    global _audio_jobs
+    if _audio_jobs is None:
+        _audio_jobs = AudioJobQueue(
+            workers=settings.AUDIO_JOB_WORKERS,
+            max_size=settings.AUDIO_JOB_MAX_QUEUE,
+        )
+    return _audio_jobs
+
+
+async def shutdown_audio_job_queue() -> None:
+    """Drain and stop the audio job queue (call while the bot can still send messages)."""
+    global _audio_jobs
+    if _audio_jobs is not None:
+        await _audio_jobs.stop(timeout=settings.AUDIO_JOB_DRAIN_TIMEOUT_SECONDS)
+        _audio_jobs = None
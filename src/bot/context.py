@@ -0,0 +1,46 @@
+"""Bot application and callback context with a per-update unit of work."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from telegram.ext import Application, CallbackContext, ContextTypes, ExtBot
+
+from src.db.unit_of_work import UnitOfWork, current_unit_of_work, unit_of_work
+
+
+class BotContext(CallbackContext[ExtBot[None], dict[Any, Any], dict[Any, Any], dict[Any, Any]]):
+    """Callback context exposing the update's unit of work as ``context.uow``."""
+
+    @property
+    def uow(self) -> UnitOfWork:
+        """Unit of work (shared DB session/transaction) of the update being handled."""
+        uow = current_unit_of_work()
+        if uow is None:
+            raise RuntimeError("No unit of work active: update not processed by BotApplication.")
+        return uow
+
+
+class BotApplication(Application):
+    """Application that wraps each update in its own unit of work."""
+
+    async def process_update(self, update: object) -> None:
+        """Process ``update`` inside a fresh unit of work (one transaction per update)."""
+        async with unit_of_work():
+            await super().process_update(update)
+
+    async def process_error(
+        self,
+        update: object | None,
+        error: Exception,
+        job: Any = None,
+        coroutine: Any = None,
+    ) -> bool:
+        """Discard the update's uncommitted DB work before dispatching the error."""
+        uow = current_unit_of_work()
+        if uow is not None and update is not None:
+            await uow.rollback()
+        return await super().process_error(update, error, job=job, coroutine=coroutine)
+
+
+BOT_CONTEXT_TYPES = ContextTypes(context=BotContext)
@@ -2,10 +2,18 @@
 
 Neste estágio, o handler:
 1. Garante que o usuário está autenticado (sessão válida).
-2. Valida a duração máxima do áudio (60 segundos).
-3. Faz o download temporário do arquivo de áudio do Telegram.
-4. Usa o serviço de transcrição Groq Whisper para obter o texto.
-5. Retorna uma mensagem de prévia da transcrição ou erros AUDIO.* adequados.
+2. Valida a duração máxima do áudio (60 segundos; com AUDIO_CHUNKING_ENABLED,
+   até AUDIO_LONG_MAX_DURATION_SECONDS, transcritos em partes paralelas).
+3. Consulta o cache de transcrições (``file_unique_id`` + idioma + modelo);
+   em hit responde a prévia na hora, sem download nem Groq.
+4. Caso contrário, responde imediatamente "processando…" e enfileira um job em
+   background (``src.bot.audio_jobs``); com a fila cheia, responde AUDIO.QUEUE_FULL.
+
+O job baixa o arquivo para memória (limitado por AUDIO_MAX_FILE_SIZE_BYTES,
+sem arquivo temporário) e o guarda por 7 dias no ``AudioStore`` (RULE-009),
+que também serve re-execuções sem novo download. Depois transcreve via Groq
+Whisper (com fallback local opcional, RULE-010) e edita a mensagem
+"processando…" com a prévia da transcrição ou o erro AUDIO.*.
 
 A extração de entidades, categorização e fluxo de confirmação serão
 implementados em tasks futuras (AUDIO-002+).
@@ -14,37 +22,66 @@ implementados em tasks futuras (AUDIO-002+).
 from __future__ import annotations
 
 import logging
-import tempfile
-from pathlib import Path
+from functools import partial
 
-from telegram import Update
+from sqlalchemy.exc import SQLAlchemyError
+from telegram import Bot, Message, Update
 from telegram.error import TelegramError
-from telegram.ext import ContextTypes
 
+from src.bot.audio_jobs import AudioQueueFullError, get_audio_job_queue
+from src.bot.context import BotContext
 from src.bot.handlers.auth_helpers import get_authenticated_user
+from src.bot.message_editor import CoalescingMessageEditor
 from src.core.config import settings
-from src.services.transcription import TranscriptionError, transcribe_audio
+from src.db import get_async_session
+from src.services.transcription import (
+    AudioStore,
+    TranscriptionError,
+    TranscriptionKey,
+    get_audio_store,
+    get_transcriber,
+    transcribe,
+    transcription_cache,
+)
 
 logger = logging.getLogger(__name__)
 
 MAX_AUDIO_DURATION_SECONDS = settings.AUDIO_MAX_DURATION_SECONDS
+MAX_LONG_AUDIO_DURATION_SECONDS = settings.AUDIO_LONG_MAX_DURATION_SECONDS
+MAX_AUDIO_FILE_SIZE_BYTES = settings.AUDIO_MAX_FILE_SIZE_BYTES
+TRANSCRIPTION_LANGUAGE = "pt"
+
+PROCESSING_FAILED_TEXT = (
+    "❌ Erro ao processar o áudio. Tente novamente.\ncode: AUDIO.TRANSCRIPTION_FAILED"
+)
+TRANSCRIPTION_FAILED_TEXT = (
+    "❌ Erro ao transcrever o áudio. Tente novamente.\ncode: AUDIO.TRANSCRIPTION_FAILED"
+)
+TOO_LARGE_TEXT = "❌ Arquivo de áudio muito grande.\ncode: AUDIO.TOO_LARGE"
+QUEUE_FULL_TEXT = (
+    "⏳ Muitos áudios em processamento no momento. Tente novamente em alguns instantes.\n"
+    "code: AUDIO.QUEUE_FULL"
+)
 
 
-async def audio_message_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+async def audio_message_handler(update: Update, context: BotContext) -> None:
     """Handle incoming voice messages from authenticated users.
 
     Regras principais:
-    - Rejeita áudios com duração > 60s (AUDIO.TOO_LONG).
-    - Em falhas de transcrição ou download, responde com AUDIO.TRANSCRIPTION_FAILED.
-    - Em sucesso, envia apenas uma prévia da transcrição (sem integração ainda
-      com Gemini/fluxo de confirmação).
+    - Rejeita áudios acima da duração máxima (AUDIO.TOO_LONG): 60s, ou
+      AUDIO_LONG_MAX_DURATION_SECONDS com a transcrição em partes habilitada.
+    - Rejeita arquivos acima de AUDIO_MAX_FILE_SIZE_BYTES (AUDIO.TOO_LARGE).
+    - Transcrição já em cache: responde a prévia direto, sem fila.
+    - Com a fila de jobs cheia, responde AUDIO.QUEUE_FULL (load shedding).
+    - Caso contrário, responde "processando…" e enfileira ``process_voice_job``;
+      o handler não espera pelo download/transcrição.
     """
     message = update.message
     if not message:
         return
 
     # Garante sessão/autenticação antes de qualquer processamento pesado.
-    db_user = await get_authenticated_user(update)
+    db_user = await get_authenticated_user(update, context)
     if db_user is None:
         return
 
@@ -56,53 +93,180 @@ async def audio_message_handler(update: Update, context: ContextTypes.DEFAULT_TY
         return
 
     duration_seconds = int(getattr(voice, "duration", 0) or 0)
-    if duration_seconds > MAX_AUDIO_DURATION_SECONDS:
+    max_duration = _max_duration_seconds()
+    if duration_seconds > max_duration:
         await message.reply_text(
             "❌ Áudio muito longo. Máximo permitido: "
-            f"{MAX_AUDIO_DURATION_SECONDS} segundos.\ncode: AUDIO.TOO_LONG"
+            f"{max_duration} segundos.\ncode: AUDIO.TOO_LONG"
         )
         return
 
-    try:
-        tg_file = await context.bot.get_file(voice.file_id)
-    except TelegramError:
-        logger.exception("Erro ao obter arquivo de áudio do Telegram para user_id=%s", db_user.id)
-        await message.reply_text(
-            "❌ Erro ao processar o áudio. Tente novamente.\ncode: AUDIO.TRANSCRIPTION_FAILED"
-        )
+    file_size = int(getattr(voice, "file_size", 0) or 0)
+    if file_size > MAX_AUDIO_FILE_SIZE_BYTES:
+        await message.reply_text(TOO_LARGE_TEXT)
         return
 
-    tmp_path = Path(tempfile.gettempdir()) / f"voice_{voice.file_unique_id}.ogg"
+    cached = await transcription_cache.lookup(
+        context.uow.session,
+        voice.file_unique_id,
+        TRANSCRIPTION_LANGUAGE,
+        get_transcriber().models,
+    )
+    # Last DB access of the update: release the connection before Telegram I/O
+    await context.uow.commit()
+    if cached is not None:
+        logger.info("Transcrição em cache para user_id=%s", db_user.id)
+        await message.reply_text(_preview_text(cached))
+        return
 
-    try:
-        await tg_file.download_to_drive(custom_path=str(tmp_path))
-    except (TelegramError, OSError):
-        logger.exception("Erro ao baixar arquivo de áudio para user_id=%s", db_user.id)
-        await message.reply_text(
-            "❌ Erro ao processar o áudio. Tente novamente.\ncode: AUDIO.TRANSCRIPTION_FAILED"
-        )
-        if tmp_path.exists():
-            tmp_path.unlink(missing_ok=True)
+    queue = get_audio_job_queue()
+    if queue.full():
+        logger.warning("Fila de áudio cheia; rejeitando áudio de user_id=%s", db_user.id)
+        await message.reply_text(QUEUE_FULL_TEXT)
         return
 
+    status_message = await message.reply_text("⏳ Processando seu áudio…")
+    job = partial(
+        process_voice_job,
+        context.bot,
+        status_message,
+        voice.file_id,
+        voice.file_unique_id,
+        db_user.id,
+        duration_seconds=duration_seconds,
+    )
     try:
-        transcription = await transcribe_audio(tmp_path)
-    except TranscriptionError:
-        logger.exception("Falha na transcrição do áudio para user_id=%s", db_user.id)
-        await message.reply_text(
-            "❌ Erro ao transcrever o áudio. Tente novamente.\ncode: AUDIO.TRANSCRIPTION_FAILED"
+        queue.submit(job)
+    except AudioQueueFullError:
+        logger.warning("Fila de áudio cheia; descartando áudio de user_id=%s", db_user.id)
+        await _edit_status(status_message, QUEUE_FULL_TEXT)
+
+
+async def process_voice_job(
+    bot: Bot,
+    status_message: Message,
+    file_id: str,
+    file_unique_id: str,
+    user_id: int,
+    duration_seconds: int = 0,
+) -> None:
+    """Background job: download, transcribe and edit the status message in place.
+
+    Áudios transcritos em partes atualizam a mensagem com a prévia parcial à
+    medida que as partes terminam (edições agrupadas, ver ``message_editor``).
+    """
+    store = get_audio_store()
+    audio = await store.get(file_unique_id) if store is not None else None
+    if audio is None:
+        audio = await _download_audio(bot, status_message, file_id, user_id)
+        if audio is None:
+            return
+        if store is not None:
+            await _retain_audio(store, file_unique_id, audio)
+
+    editor = CoalescingMessageEditor(
+        status_message, min_interval=settings.AUDIO_PREVIEW_EDIT_INTERVAL_SECONDS
+    )
+
+    def show_progress(text: str, done: int, total: int) -> None:
+        editor.update(_progress_text(text, done, total))
+
+    try:
+        transcript = await transcribe(
+            audio,
+            filename=f"{file_unique_id}.ogg",
+            language=TRANSCRIPTION_LANGUAGE,
+            duration=duration_seconds,
+            on_progress=show_progress,
         )
+    except TranscriptionError:
+        logger.exception("Falha na transcrição do áudio para user_id=%s", user_id)
+        await editor.finish(TRANSCRIPTION_FAILED_TEXT)
         return
-    finally:
-        if tmp_path.exists():
-            tmp_path.unlink(missing_ok=True)
 
+    await editor.finish(_preview_text(transcript.text))
+    key = TranscriptionKey(file_unique_id, TRANSCRIPTION_LANGUAGE, transcript.model)
+    await _store_transcription(key, transcript.text, len(audio))
+
+
+async def _download_audio(
+    bot: Bot, status_message: Message, file_id: str, user_id: int
+) -> bytes | None:
+    """Download the voice note into memory; on failure edit the status and return None."""
+    try:
+        tg_file = await bot.get_file(file_id)
+    except TelegramError:
+        logger.exception("Erro ao obter arquivo de áudio do Telegram para user_id=%s", user_id)
+        await _edit_status(status_message, PROCESSING_FAILED_TEXT)
+        return None
+
+    if int(tg_file.file_size or 0) > MAX_AUDIO_FILE_SIZE_BYTES:
+        await _edit_status(status_message, TOO_LARGE_TEXT)
+        return None
+
+    try:
+        audio = bytes(await tg_file.download_as_bytearray())
+    except TelegramError:
+        logger.exception("Erro ao baixar arquivo de áudio para user_id=%s", user_id)
+        await _edit_status(status_message, PROCESSING_FAILED_TEXT)
+        return None
+
+    # file_size é opcional no getFile; valida também o tamanho efetivamente recebido.
+    if len(audio) > MAX_AUDIO_FILE_SIZE_BYTES:
+        await _edit_status(status_message, TOO_LARGE_TEXT)
+        return None
+    return audio
+
+
+async def _retain_audio(store: AudioStore, file_unique_id: str, audio: bytes) -> None:
+    """Keep the audio for re-runs (RULE-009); failures only cost a future re-download."""
+    try:
+        async with get_async_session() as session:
+            await store.put(session, file_unique_id, audio)
+            await session.commit()
+    except (OSError, SQLAlchemyError):
+        logger.exception("Erro ao armazenar áudio (%s)", file_unique_id)
+
+
+def _max_duration_seconds() -> int:
+    """Duration cap: longer notes are only accepted when they can be chunked."""
+    if settings.AUDIO_CHUNKING_ENABLED:
+        return max(MAX_LONG_AUDIO_DURATION_SECONDS, MAX_AUDIO_DURATION_SECONDS)
+    return MAX_AUDIO_DURATION_SECONDS
+
+
+def _preview_text(transcription: str) -> str:
     preview = transcription.strip()
     if len(preview) > 400:
         preview = f"{preview[:397]}..."
-
-    await message.reply_text(
+    return (
         "📝 Prévia da transcrição do seu áudio:\n\n"
         f'"{preview}"\n\n'
         "Obs.: o fluxo completo de extração de dados e confirmação ainda está em desenvolvimento."
     )
+
+
+def _progress_text(partial: str, done: int, total: int) -> str:
+    # Mostra o final do texto parcial: é a parte que acabou de chegar.
+    preview = partial.strip()
+    if len(preview) > 400:
+        preview = f"...{preview[-397:]}"
+    return f'⏳ Transcrevendo… ({done}/{total})\n\n"{preview}"'
+
+
+async def _store_transcription(key: TranscriptionKey, transcription: str, audio_bytes: int) -> None:
+    """Persist the transcription for later hits; failures only cost a future cache miss."""
+    try:
+        async with get_async_session() as session:
+            await transcription_cache.put(session, key, transcription, audio_bytes)
+            await session.commit()
+    except SQLAlchemyError:
+        logger.exception("Erro ao salvar transcrição em cache (%s)", key.file_unique_id)
+
+
+async def _edit_status(status_message: Message, text: str) -> None:
+    """Replace the "processando…" message text; failures are only logged."""
+    try:
+        await status_message.edit_text(text)
+    except TelegramError:
+        logger.exception("Erro ao editar mensagem de status do áudio")
@@ -1,31 +1,41 @@
 """Shared auth helpers for handlers that require an active session (RULE-008)."""
 
-from sqlmodel import Session, select
+from sqlmodel import select
 from telegram import Update
 
-from src.db.engine import engine
+from src.bot.context import BotContext
 from src.models import User
+from src.services.auth.cache import CachedAuthUser, auth_user_cache
 from src.services.auth.session import is_locked, is_session_valid
 
 
-async def get_authenticated_user(update: Update) -> User | None:
+async def get_authenticated_user(update: Update, context: BotContext) -> CachedAuthUser | None:
     """Load user by telegram_id and ensure session is valid.
 
+    The lock/session fields are served from ``auth_user_cache``; only a miss
+    queries the update's unit of work (``context.uow``), so steady-state
+    commands do not touch the database for the auth check.
+
     If user is missing, locked, or session expired, sends the appropriate
-    message and returns None. Otherwise returns the DB User.
+    message and returns None. Otherwise returns the cached user snapshot.
     """
     user = update.effective_user
     message = update.message
     if not user or not message:
         return None
 
-    with Session(engine) as session:
-        stmt = select(User).where(User.telegram_id == user.id)
-        db_user = session.exec(stmt).first()
-
+    db_user = auth_user_cache.get(user.id)
     if db_user is None:
-        await message.reply_text("Você ainda não tem um PIN. Use /start para ativar seu acesso.")
-        return None
+        session = context.uow.session
+        stmt = select(User).where(User.telegram_id == user.id)
+        row = (await session.exec(stmt)).first()
+        if row is None:
+            await message.reply_text(
+                "Você ainda não tem um PIN. Use /start para ativar seu acesso."
+            )
+            return None
+        db_user = CachedAuthUser.from_user(row)
+        auth_user_cache.put(db_user)
 
     if is_locked(db_user):
         await message.reply_text(
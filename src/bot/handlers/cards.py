@@ -4,12 +4,13 @@ import logging
 from datetime import UTC, datetime
 
 from sqlalchemy import func
-from sqlmodel import Session, select
+from sqlmodel import select
 from telegram import Update
-from telegram.ext import ContextTypes, ConversationHandler
+from telegram.ext import ConversationHandler
 
+from src.bot.context import BotContext
 from src.bot.handlers.auth_helpers import get_authenticated_user
-from src.db.engine import engine
+from src.db.dialect import dialect_insert
 from src.models import Card
 from src.services.cards.validation import (
     CARD_INVALID_CLOSING_DAY,
@@ -34,14 +35,14 @@ KEY_CARD_DUE_DAY = "card_due_day"
 
 
 # ---- /add_cartao ----
-async def add_cartao_start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
+async def add_cartao_start(update: Update, context: BotContext) -> int:
     """Entry: require auth, then ask for card name."""
     user = update.effective_user
     message = update.message
     if not user or not message:
         return ConversationHandler.END
 
-    db_user = await get_authenticated_user(update)
+    db_user = await get_authenticated_user(update, context)
     if db_user is None:
         return ConversationHandler.END
 
@@ -55,7 +56,7 @@ async def add_cartao_start(update: Update, context: ContextTypes.DEFAULT_TYPE) -
     return CARD_NAME
 
 
-async def add_cartao_name(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
+async def add_cartao_name(update: Update, context: BotContext) -> int:
     """Receive name, validate, ask last 4 digits."""
     message = update.message
     if not message or not message.text:
@@ -76,7 +77,7 @@ async def add_cartao_name(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     return CARD_LAST_DIGITS
 
 
-async def add_cartao_last_digits(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
+async def add_cartao_last_digits(update: Update, context: BotContext) -> int:
     """Receive last digits, validate, ask closing day."""
     message = update.message
     if not message or not message.text:
@@ -96,7 +97,7 @@ async def add_cartao_last_digits(update: Update, context: ContextTypes.DEFAULT_T
     return CARD_CLOSING_DAY
 
 
-async def add_cartao_closing_day(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
+async def add_cartao_closing_day(update: Update, context: BotContext) -> int:
     """Receive closing day, validate, ask due day."""
     message = update.message
     if not message or not message.text:
@@ -117,7 +118,7 @@ async def add_cartao_closing_day(update: Update, context: ContextTypes.DEFAULT_T
     return CARD_DUE_DAY
 
 
-async def add_cartao_due_day(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
+async def add_cartao_due_day(update: Update, context: BotContext) -> int:
     """Receive due day, validate, check duplicate, save card."""
     message = update.message
     if not message or not message.text:
@@ -135,7 +136,7 @@ async def add_cartao_due_day(update: Update, context: ContextTypes.DEFAULT_TYPE)
     if not user:
         return ConversationHandler.END
 
-    db_user = await get_authenticated_user(update)
+    db_user = await get_authenticated_user(update, context)
     if db_user is None:
         return ConversationHandler.END
 
@@ -151,29 +152,30 @@ async def add_cartao_due_day(update: Update, context: ContextTypes.DEFAULT_TYPE)
         await message.reply_text("Erro: dados incompletos. Tente /add_cartao de novo.")
         return ConversationHandler.END
 
-    # Check duplicate: same user, same name (case-insensitive), not deleted
-    with Session(engine) as session:
-        stmt = (
-            select(Card)
-            .where(Card.user_id == db_user.id)
-            .where(Card.deleted_at == None)  # noqa: E711
-            .where(func.lower(Card.name) == name.lower())
-        )
-        existing = session.exec(stmt).first()
-        if existing is not None:
-            await message.reply_text("❌ Já existe um cartão com esse nome.\ncode: CARD.DUPLICATE")
-            return CARD_DUE_DAY
-
-        card = Card(
-            user_id=db_user.id,
-            name=name,
-            last_digits=last_digits,
-            closing_day=closing_day,
-            due_day=day,
+    # Single INSERT ... ON CONFLICT against uq_cards_user_id_lower_name: a duplicate
+    # (same user, same name case-insensitive, not deleted) inserts nothing.
+    card = Card(
+        user_id=db_user.id,
+        name=name,
+        last_digits=last_digits,
+        closing_day=closing_day,
+        due_day=day,
+    )
+    session = context.uow.session
+    stmt = (
+        dialect_insert(session, Card)
+        .values(**card.model_dump(exclude={"id"}))
+        .on_conflict_do_nothing(
+            index_elements=[Card.user_id, func.lower(Card.name)],
+            index_where=Card.deleted_at.is_(None),  # type: ignore[union-attr]
         )
-        session.add(card)
-        session.commit()
-        session.refresh(card)
+        .returning(Card.id)
+    )
+    card.id = (await session.exec(stmt)).scalar_one_or_none()
+    if card.id is None:
+        await message.reply_text("❌ Já existe um cartão com esse nome.\ncode: CARD.DUPLICATE")
+        return CARD_DUE_DAY
+    await context.uow.commit()
 
     # Clear conversation data
     user_data.pop(KEY_CARD_NAME, None)
@@ -190,7 +192,7 @@ async def add_cartao_due_day(update: Update, context: ContextTypes.DEFAULT_TYPE)
     return ConversationHandler.END
 
 
-async def add_cartao_cancel(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
+async def add_cartao_cancel(update: Update, context: BotContext) -> int:
     """Cancel add card conversation."""
     if context.user_data:
         context.user_data.pop(KEY_CARD_NAME, None)
@@ -203,24 +205,24 @@ async def add_cartao_cancel(update: Update, context: ContextTypes.DEFAULT_TYPE)
 
 
 # ---- /list_cartoes ----
-async def list_cartoes_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+async def list_cartoes_handler(update: Update, context: BotContext) -> None:
     """List active cards for the authenticated user."""
     message = update.message
     if not message:
         return
 
-    db_user = await get_authenticated_user(update)
+    db_user = await get_authenticated_user(update, context)
     if db_user is None:
         return
 
-    with Session(engine) as session:
-        stmt = (
-            select(Card)
-            .where(Card.user_id == db_user.id)
-            .where(Card.deleted_at == None)  # noqa: E711
-            .order_by(Card.name)
-        )
-        cards = list(session.exec(stmt).all())
+    session = context.uow.session
+    stmt = (
+        select(Card)
+        .where(Card.user_id == db_user.id)
+        .where(Card.deleted_at == None)  # noqa: E711
+        .order_by(Card.name)
+    )
+    cards = list((await session.exec(stmt)).all())
 
     if not cards:
         await message.reply_text(
@@ -238,13 +240,13 @@ async def list_cartoes_handler(update: Update, context: ContextTypes.DEFAULT_TYP
 
 
 # ---- /delete_cartao ----
-async def delete_cartao_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+async def delete_cartao_handler(update: Update, context: BotContext) -> None:
     """Soft delete card by id. Usage: /delete_cartao <id>."""
     message = update.message
     if not message:
         return
 
-    db_user = await get_authenticated_user(update)
+    db_user = await get_authenticated_user(update, context)
     if db_user is None:
         return
 
@@ -264,22 +266,22 @@ async def delete_cartao_handler(update: Update, context: ContextTypes.DEFAULT_TY
         return
 
     card_name: str | None = None
-    with Session(engine) as session:
-        stmt = (
-            select(Card)
-            .where(Card.id == card_id)
-            .where(Card.user_id == db_user.id)
-            .where(Card.deleted_at == None)  # noqa: E711
-        )
-        card = session.exec(stmt).first()
+    session = context.uow.session
+    stmt = (
+        select(Card)
+        .where(Card.id == card_id)
+        .where(Card.user_id == db_user.id)
+        .where(Card.deleted_at == None)  # noqa: E711
+    )
+    card = (await session.exec(stmt)).first()
 
-        if card is None:
-            await message.reply_text("❌ Cartão não encontrado.\ncode: CARD.NOT_FOUND")
-            return
+    if card is None:
+        await message.reply_text("❌ Cartão não encontrado.\ncode: CARD.NOT_FOUND")
+        return
 
-        card_name = card.name
-        card.deleted_at = datetime.now(UTC)
-        session.add(card)
-        session.commit()
+    card_name = card.name
+    card.deleted_at = datetime.now(UTC)
+    session.add(card)
+    await context.uow.commit()
 
     await message.reply_text(f'✅ Cartão "{card_name}" removido.')
@@ -4,18 +4,19 @@ import logging
 from datetime import UTC, datetime
 
 from sqlalchemy import func
-from sqlmodel import Session, select
+from sqlmodel import select
 from telegram import Update
-from telegram.ext import ContextTypes
 
+from src.bot.context import BotContext
 from src.bot.handlers.auth_helpers import get_authenticated_user
-from src.db.engine import engine
+from src.db.dialect import dialect_insert
 from src.models import Category
+from src.services.learning import category_pattern_index
 
 logger = logging.getLogger(__name__)
 
 
-async def add_categoria_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+async def add_categoria_handler(update: Update, context: BotContext) -> None:
     """Create a new custom category for the authenticated user.
 
     Usage: /add_categoria <nome>
@@ -24,7 +25,7 @@ async def add_categoria_handler(update: Update, context: ContextTypes.DEFAULT_TY
     if not message:
         return
 
-    db_user = await get_authenticated_user(update)
+    db_user = await get_authenticated_user(update, context)
     if db_user is None:
         return
 
@@ -41,51 +42,52 @@ async def add_categoria_handler(update: Update, context: ContextTypes.DEFAULT_TY
     raw_name = parts[1].strip()
     name = raw_name[:50]
 
-    with Session(engine) as session:
-        # Check duplicate (case-insensitive, not deleted, default or custom)
-        stmt = (
-            select(Category)
-            .where(Category.user_id == db_user.id)
-            .where(Category.deleted_at == None)  # noqa: E711
-            .where(func.lower(Category.name) == name.lower())
+    # Single INSERT ... ON CONFLICT against uq_categories_user_id_lower_name: a duplicate
+    # (case-insensitive, not deleted, default or custom) inserts nothing, even under races.
+    category = Category(
+        user_id=db_user.id,
+        name=name,
+        is_default=False,
+    )
+    session = context.uow.session
+    stmt = (
+        dialect_insert(session, Category)
+        .values(**category.model_dump(exclude={"id"}))
+        .on_conflict_do_nothing(
+            index_elements=[Category.user_id, func.lower(Category.name)],
+            index_where=Category.deleted_at.is_(None),  # type: ignore[union-attr]
         )
-        existing = session.exec(stmt).first()
-        if existing is not None:
-            await message.reply_text(
-                "❌ Já existe uma categoria com esse nome.\ncode: CATEGORY.DUPLICATE"
-            )
-            return
-
-        category = Category(
-            user_id=db_user.id,
-            name=name,
-            is_default=False,
+        .returning(Category.id)
+    )
+    category.id = (await session.exec(stmt)).scalar_one_or_none()
+    if category.id is None:
+        await message.reply_text(
+            "❌ Já existe uma categoria com esse nome.\ncode: CATEGORY.DUPLICATE"
         )
-        session.add(category)
-        session.commit()
-        session.refresh(category)
+        return
+    await context.uow.commit()
 
     await message.reply_text(f"✅ Categoria cadastrada: {category.name} (ID: {category.id})")
 
 
-async def list_categorias_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+async def list_categorias_handler(update: Update, context: BotContext) -> None:
     """List all (default + custom) active categories for the user."""
     message = update.message
     if not message:
         return
 
-    db_user = await get_authenticated_user(update)
+    db_user = await get_authenticated_user(update, context)
     if db_user is None:
         return
 
-    with Session(engine) as session:
-        stmt = (
-            select(Category)
-            .where(Category.user_id == db_user.id)
-            .where(Category.deleted_at == None)  # noqa: E711
-            .order_by(Category.is_default.desc(), Category.name)  # type: ignore[attr-defined]
-        )
-        categories = list(session.exec(stmt).all())
+    session = context.uow.session
+    stmt = (
+        select(Category)
+        .where(Category.user_id == db_user.id)
+        .where(Category.deleted_at == None)  # noqa: E711
+        .order_by(Category.is_default.desc(), Category.name)  # type: ignore[attr-defined]
+    )
+    categories = list((await session.exec(stmt)).all())
 
     if not categories:
         await message.reply_text(
@@ -102,7 +104,7 @@ async def list_categorias_handler(update: Update, context: ContextTypes.DEFAULT_
     await message.reply_text("\n".join(lines))
 
 
-async def delete_categoria_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+async def delete_categoria_handler(update: Update, context: BotContext) -> None:
     """Soft delete a custom category by id.
 
     Usage: /delete_categoria <id>
@@ -111,7 +113,7 @@ async def delete_categoria_handler(update: Update, context: ContextTypes.DEFAULT
     if not message:
         return
 
-    db_user = await get_authenticated_user(update)
+    db_user = await get_authenticated_user(update, context)
     if db_user is None:
         return
 
@@ -130,28 +132,29 @@ async def delete_categoria_handler(update: Update, context: ContextTypes.DEFAULT
         return
 
     category_name: str | None = None
-    with Session(engine) as session:
-        stmt = (
-            select(Category)
-            .where(Category.id == category_id)
-            .where(Category.user_id == db_user.id)
-            .where(Category.deleted_at == None)  # noqa: E711
+    session = context.uow.session
+    stmt = (
+        select(Category)
+        .where(Category.id == category_id)
+        .where(Category.user_id == db_user.id)
+        .where(Category.deleted_at == None)  # noqa: E711
+    )
+    category = (await session.exec(stmt)).first()
+
+    if category is None:
+        await message.reply_text("❌ Categoria não encontrada.\ncode: CATEGORY.NOT_FOUND")
+        return
+
+    if category.is_default:
+        await message.reply_text(
+            "❌ Não é possível excluir categorias padrão.\ncode: CATEGORY.CANNOT_DELETE_DEFAULT"
         )
-        category = session.exec(stmt).first()
-
-        if category is None:
-            await message.reply_text("❌ Categoria não encontrada.\ncode: CATEGORY.NOT_FOUND")
-            return
-
-        if category.is_default:
-            await message.reply_text(
-                "❌ Não é possível excluir categorias padrão.\ncode: CATEGORY.CANNOT_DELETE_DEFAULT"
-            )
-            return
-
-        category_name = category.name
-        category.deleted_at = datetime.now(UTC)
-        session.add(category)
-        session.commit()
+        return
+
+    category_name = category.name
+    category.deleted_at = datetime.now(UTC)
+    session.add(category)
+    await context.uow.commit()
+    category_pattern_index.forget_category(db_user.id, category_id)
 
     await message.reply_text(f'✅ Categoria "{category_name}" removida.')
@@ -1,16 +1,17 @@
 """Handler for /login command (existing user PIN authentication)."""
 
 import logging
-from datetime import UTC, datetime
 
-from sqlmodel import Session, select
+from sqlmodel import select
 from telegram import Update
-from telegram.ext import ContextTypes, ConversationHandler
+from telegram.ext import ConversationHandler
 
-from src.db.engine import engine
+from src.bot.context import BotContext
 from src.models import User
-from src.services.auth import verify_pin
-from src.services.auth.session import is_locked, lock_duration
+from src.services.auth import PinServiceBusyError, verify_pin_async
+from src.services.auth.cache import auth_user_cache
+from src.services.auth.login_attempts import record_failed_login, record_successful_login
+from src.services.auth.session import is_locked
 
 logger = logging.getLogger(__name__)
 
@@ -22,7 +23,7 @@ def is_valid_pin(pin: str) -> bool:
     return pin.isdigit() and 4 <= len(pin) <= 6
 
 
-async def login_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
+async def login_handler(update: Update, context: BotContext) -> int:
     """Entry point for /login.
 
     - No user in DB: tell to use /start.
@@ -34,9 +35,9 @@ async def login_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> i
     if not user or not message:
         return ConversationHandler.END
 
-    with Session(engine) as session:
-        stmt = select(User).where(User.telegram_id == user.id)
-        db_user = session.exec(stmt).first()
+    session = context.uow.session
+    stmt = select(User).where(User.telegram_id == user.id)
+    db_user = (await session.exec(stmt)).first()
 
     if db_user is None:
         await message.reply_text("Você ainda não tem um PIN. Use /start para ativar seu acesso.")
@@ -55,7 +56,7 @@ async def login_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> i
     return ASK_LOGIN_PIN
 
 
-async def login_ask_pin(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
+async def login_ask_pin(update: Update, context: BotContext) -> int:
     """Receive PIN, verify, update failed_attempts/locked_until/last_login."""
     user = update.effective_user
     message = update.message
@@ -69,56 +70,65 @@ async def login_ask_pin(update: Update, context: ContextTypes.DEFAULT_TYPE) -> i
         )
         return ASK_LOGIN_PIN
 
-    with Session(engine) as session:
-        stmt = select(User).where(User.telegram_id == user.id)
-        db_user = session.exec(stmt).first()
-        if db_user is None:
-            await message.reply_text("Erro: usuário não encontrado. Use /start.")
-            return ConversationHandler.END
-
-        if is_locked(db_user):
-            await message.reply_text(
-                "🔒 Conta bloqueada por muitas tentativas.\n"
-                "Tente novamente em 15 minutos.\n"
-                "code: AUTH.ACCOUNT_LOCKED"
-            )
-            return ConversationHandler.END
-
-        if verify_pin(pin, db_user.pin_hash):
-            # Success: reset lock, set last_login
-            db_user.failed_attempts = 0
-            db_user.locked_until = None
-            db_user.last_login = datetime.now(UTC)
-            session.add(db_user)
-            session.commit()
-            logger.info("User %s login success", user.id)
-            await message.reply_text("✅ Login realizado! Você pode usar o bot.")
-            return ConversationHandler.END
-
-        # Wrong PIN: increment failed_attempts
-        db_user.failed_attempts = (db_user.failed_attempts or 0) + 1
-        if db_user.failed_attempts >= 3:
-            db_user.locked_until = datetime.now(UTC) + lock_duration()
-            session.add(db_user)
-            session.commit()
-            logger.warning("User %s account locked after 3 failed attempts", user.id)
-            await message.reply_text(
-                "🔒 Conta bloqueada por muitas tentativas.\n"
-                "Tente novamente em 15 minutos.\n"
-                "code: AUTH.ACCOUNT_LOCKED"
-            )
-            return ConversationHandler.END
-
-        session.add(db_user)
-        session.commit()
-        remaining = 3 - db_user.failed_attempts
+    session = context.uow.session
+    stmt = select(User).where(User.telegram_id == user.id)
+    db_user = (await session.exec(stmt)).first()
+    if db_user is None:
+        await message.reply_text("Erro: usuário não encontrado. Use /start.")
+        return ConversationHandler.END
+
+    if is_locked(db_user):
+        await message.reply_text(
+            "🔒 Conta bloqueada por muitas tentativas.\n"
+            "Tente novamente em 15 minutos.\n"
+            "code: AUTH.ACCOUNT_LOCKED"
+        )
+        return ConversationHandler.END
+
+    try:
+        pin_ok = await verify_pin_async(pin, db_user.pin_hash)
+    except PinServiceBusyError:
+        # Not counted as a failed attempt: the PIN was never checked
+        logger.warning("PIN hashing pool busy; asking user %s to retry", user.id)
         await message.reply_text(
-            f"❌ PIN incorreto. Tentativas restantes: {remaining}.\nDigite seu PIN novamente:"
+            "⏳ Muitas solicitações no momento. Digite seu PIN novamente em alguns segundos.\n"
+            "code: AUTH.SERVICE_BUSY"
         )
         return ASK_LOGIN_PIN
 
+    if pin_ok:
+        await record_successful_login(session, user.id)
+        await context.uow.commit()
+        auth_user_cache.invalidate(user.id)
+        logger.info("User %s login success", user.id)
+        await message.reply_text("✅ Login realizado! Você pode usar o bot.")
+        return ConversationHandler.END
+
+    # Wrong PIN: increment failed_attempts / lock in one statement (RULE-007)
+    result = await record_failed_login(session, user.id)
+    await context.uow.commit()
+    auth_user_cache.invalidate(user.id)
+    if result is None:
+        await message.reply_text("Erro: usuário não encontrado. Use /start.")
+        return ConversationHandler.END
+
+    if result.locked:
+        logger.warning("User %s account locked after 3 failed attempts", user.id)
+        await message.reply_text(
+            "🔒 Conta bloqueada por muitas tentativas.\n"
+            "Tente novamente em 15 minutos.\n"
+            "code: AUTH.ACCOUNT_LOCKED"
+        )
+        return ConversationHandler.END
+
+    await message.reply_text(
+        f"❌ PIN incorreto. Tentativas restantes: {result.remaining_attempts}.\n"
+        "Digite seu PIN novamente:"
+    )
+    return ASK_LOGIN_PIN
+
 
-async def login_cancel(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
+async def login_cancel(update: Update, context: BotContext) -> int:
     """Cancel login conversation."""
     if update.message:
         await update.message.reply_text("Login cancelado. Use /login quando quiser.")
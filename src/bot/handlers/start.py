@@ -2,14 +2,14 @@
 
 import logging
 
-from sqlmodel import Session, select
+from sqlmodel import select
 from telegram import Update
-from telegram.ext import ContextTypes, ConversationHandler
+from telegram.ext import ConversationHandler
 
-from src.db.engine import engine
-from src.db.seed import seed_default_categories
+from src.bot.context import BotContext
+from src.db.seed import seed_default_categories_async
 from src.models import User
-from src.services.auth import hash_pin
+from src.services.auth import PinServiceBusyError, hash_pin_async
 
 logger = logging.getLogger(__name__)
 
@@ -38,7 +38,7 @@ def build_onboarding_message(first_name: str | None) -> str:
     )
 
 
-async def start_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
+async def start_handler(update: Update, context: BotContext) -> int:
     """Entry point for /start.
 
     - New user: start PIN creation conversation.
@@ -49,9 +49,9 @@ async def start_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> i
     if not user or not message:
         return ConversationHandler.END
 
-    with Session(engine) as session:
-        stmt = select(User).where(User.telegram_id == user.id)
-        existing = session.exec(stmt).first()
+    session = context.uow.session
+    stmt = select(User).where(User.telegram_id == user.id)
+    existing = (await session.exec(stmt)).first()
 
     if existing is not None:
         await message.reply_text(
@@ -68,7 +68,7 @@ async def start_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> i
     return ASK_PIN
 
 
-async def ask_pin(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
+async def ask_pin(update: Update, context: BotContext) -> int:
     """Collect PIN and ask confirmation."""
     message = update.message
     if not message or not message.text:
@@ -90,7 +90,7 @@ async def ask_pin(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     return CONFIRM_PIN
 
 
-async def confirm_pin(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
+async def confirm_pin(update: Update, context: BotContext) -> int:
     """Confirm PIN, create user, and end conversation."""
     user = update.effective_user
     message = update.message
@@ -111,19 +111,26 @@ async def confirm_pin(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int
         )
         return ASK_PIN
 
-    pin_hash = hash_pin(pending_pin)
+    try:
+        pin_hash = await hash_pin_async(pending_pin)
+    except PinServiceBusyError:
+        logger.warning("PIN hashing pool busy; asking user %s to retry", user.id)
+        await message.reply_text(
+            "⏳ Muitas solicitações no momento. Digite a confirmação do PIN novamente "
+            "em alguns segundos.\ncode: AUTH.SERVICE_BUSY"
+        )
+        return CONFIRM_PIN
 
-    with Session(engine) as session:
-        # Re-check to avoid duplicates if user restarted conversation
-        stmt = select(User).where(User.telegram_id == user.id)
-        existing = session.exec(stmt).first()
-        if existing is None:
-            new_user = User(telegram_id=user.id, pin_hash=pin_hash)
-            session.add(new_user)
-            session.commit()
-            session.refresh(new_user)
-            if new_user.id is not None:
-                seed_default_categories(session, new_user.id)
+    session = context.uow.session
+    # Re-check to avoid duplicates if user restarted conversation
+    stmt = select(User).where(User.telegram_id == user.id)
+    existing = (await session.exec(stmt)).first()
+    if existing is None:
+        new_user = User(telegram_id=user.id, pin_hash=pin_hash)
+        session.add(new_user)
+        await session.flush()  # assigns new_user.id; user + seed commit together
+        if new_user.id is not None:
+            await seed_default_categories_async(session, new_user.id)
 
     user_data.pop("pending_pin", None)
     onboarding_text = build_onboarding_message(user.first_name)
@@ -131,7 +138,7 @@ async def confirm_pin(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int
     return ConversationHandler.END
 
 
-async def cancel(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
+async def cancel(update: Update, context: BotContext) -> int:
     """Cancel PIN creation conversation."""
     user_data = context.user_data
     if user_data is not None:
@@ -0,0 +1,101 @@
+"""Coalesced, rate-limited edits of a single Telegram message.
+
+Progressive previews (e.g. chunked transcriptions) produce many intermediate
+texts. Editing the message for each one would hit Telegram's flood limits
+(roughly one edit per second per chat) and fail with ``RetryAfter``. The
+editor keeps only the latest pending text and flushes it at most once per
+``min_interval`` seconds, so intermediate states that are overtaken before
+the next slot are simply skipped. ``finish`` sends the final text, which is
+never dropped.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import time
+import warnings
+from datetime import timedelta
+
+from telegram import Message
+from telegram.error import RetryAfter, TelegramError
+from telegram.warnings import PTBDeprecationWarning
+
+logger = logging.getLogger(__name__)
+
+
+class CoalescingMessageEditor:
+    """Edit ``message`` with the latest text, at most once per ``min_interval`` seconds."""
+
+    def __init__(self, message: Message, min_interval: float = 1.5) -> None:
+        self.message = message
+        self.min_interval = min_interval
+        self._pending: str | None = None
+        self._shown: str | None = None
+        self._last_edit = float("-inf")
+        self._flusher: asyncio.Task[None] | None = None
+        self.edits = 0
+        self.coalesced = 0
+
+    def update(self, text: str) -> None:
+        """Schedule ``text`` for display, replacing any text not yet shown."""
+        if self._pending is not None:
+            self.coalesced += 1
+        self._pending = text
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush_later())
+
+    async def finish(self, text: str) -> None:
+        """Show ``text`` as the final state, dropping pending intermediate updates."""
+        if self._flusher is not None and not self._flusher.done():
+            self._flusher.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._flusher
+        self._pending = None
+        await asyncio.sleep(self._wait_time())
+        await self._edit(text, final=True)
+
+    def _wait_time(self) -> float:
+        return max(self._last_edit + self.min_interval - time.monotonic(), 0.0)
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self._wait_time())
+        text, self._pending = self._pending, None
+        if text is not None:
+            await self._edit(text, final=False)
+
+    async def _edit(self, text: str, *, final: bool) -> None:
+        if text == self._shown:
+            # Telegram rejects edits that do not change the text
+            return
+        try:
+            await self.message.edit_text(text)
+        except RetryAfter as exc:
+            if not final:
+                logger.warning("Edit rate limited; skipping intermediate update")
+                return
+            await asyncio.sleep(_retry_seconds(exc))
+            try:
+                await self.message.edit_text(text)
+            except TelegramError:
+                logger.exception("Erro ao editar mensagem de status")
+                return
+        except TelegramError:
+            logger.exception("Erro ao editar mensagem de status")
+            return
+        finally:
+            self._last_edit = time.monotonic()
+        self._shown = text
+        self.edits += 1
+
+
+def _retry_seconds(exc: RetryAfter) -> float:
+    """``retry_after`` is an int or a timedelta depending on ``PTB_TIMEDELTA``."""
+    with warnings.catch_warnings():
+        # Both types are handled; the int-access deprecation does not apply
+        warnings.simplefilter("ignore", PTBDeprecationWarning)
+        retry_after = exc.retry_after
+    if isinstance(retry_after, timedelta):
+        return retry_after.total_seconds()
+    return float(retry_after)
@@ -0,0 +1,147 @@
+"""Update processor: strict per-user ordering, parallelism across users.
+
+``ConversationHandler`` flows (``/start``, ``/login``, ``/add_cartao``) assume a
+user's messages are handled one at a time and in order. With concurrent
+updates enabled, PTB would otherwise run two messages of the same user at
+once. This processor queues updates per ``effective_user.id`` and only lets
+the head of each queue run, under a global limit shared by all users.
+
+PTB's own semaphore (``max_concurrent_updates``) is used as the admission cap
+for updates in flight (queued or running); ``max_running`` bounds the ones
+actually executing, so a user's queued updates never hold a running slot.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import logging
+from collections import deque
+from collections.abc import Awaitable
+from dataclasses import dataclass
+from typing import Any
+
+from telegram import Update
+from telegram.ext import BaseUpdateProcessor
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class UpdateQueueStats:
+    """Snapshot of the processor queues for monitoring."""
+
+    running: int
+    queued: int
+    active_users: int
+    max_user_depth: int
+    dropped: int
+
+
+class UserOrderedUpdateProcessor(BaseUpdateProcessor):
+    """Run updates of the same user in arrival order and different users in parallel.
+
+    Args:
+        max_running: Global limit of updates executing at once.
+        max_queue_per_user: Updates a single user may have in flight (running
+            included); further updates from that user are dropped.
+        max_pending: Admission cap for updates in flight across all users.
+    """
+
+    def __init__(self, max_running: int, max_queue_per_user: int, max_pending: int) -> None:
+        if max_running < 1 or max_queue_per_user < 1:
+            raise ValueError("max_running and max_queue_per_user must be positive.")
+        # PTB only processes updates concurrently when this is > 1
+        super().__init__(max_concurrent_updates=max(max_pending, max_running, 2))
+        self.max_running = max_running
+        self.max_queue_per_user = max_queue_per_user
+        self._running = asyncio.Semaphore(max_running)
+        self._running_count = 0
+        self._queues: dict[int, deque[asyncio.Future[None]]] = {}
+        self._dropped = 0
+
+    async def do_process_update(self, update: object, coroutine: Awaitable[Any]) -> None:
+        """Wait for this user's earlier updates, then run under the global limit."""
+        user_id = _user_key(update)
+        if user_id is None:
+            await self._run(coroutine)
+            return
+
+        queue = self._queues.setdefault(user_id, deque())
+        if len(queue) >= self.max_queue_per_user:
+            self._dropped += 1
+            logger.warning(
+                "Dropping update for user %s: %s updates already queued", user_id, len(queue)
+            )
+            _discard(coroutine)
+            return
+
+        turn: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        queue.append(turn)
+        if len(queue) == 1:
+            turn.set_result(None)
+        started = False
+        try:
+            await turn
+            started = True
+            await self._run(coroutine)
+        finally:
+            if not started:
+                _discard(coroutine)
+            self._leave(user_id, queue, turn)
+
+    async def _run(self, coroutine: Awaitable[Any]) -> None:
+        async with self._running:
+            self._running_count += 1
+            try:
+                await coroutine
+            finally:
+                self._running_count -= 1
+
+    def _leave(
+        self, user_id: int, queue: deque[asyncio.Future[None]], turn: asyncio.Future[None]
+    ) -> None:
+        """Remove ``turn`` from the user's queue and hand the turn to the next update."""
+        was_head = queue[0] is turn
+        queue.remove(turn)
+        if not queue:
+            del self._queues[user_id]
+        elif was_head and not queue[0].done():
+            queue[0].set_result(None)
+
+    def queue_depths(self) -> dict[int, int]:
+        """Return updates in flight per user id (running + waiting)."""
+        return {user_id: len(queue) for user_id, queue in self._queues.items()}
+
+    def stats(self) -> UpdateQueueStats:
+        """Return queue-depth metrics."""
+        depths = [len(queue) for queue in self._queues.values()]
+        return UpdateQueueStats(
+            running=self._running_count,
+            queued=sum(depths),
+            active_users=len(depths),
+            max_user_depth=max(depths, default=0),
+            dropped=self._dropped,
+        )
+
+    async def initialize(self) -> None:
+        """Nothing to allocate; queues are created on demand."""
+
+    async def shutdown(self) -> None:
+        """Log updates still queued when the application stops."""
+        stats = self.stats()
+        if stats.queued:
+            logger.warning("Update processor shutting down with %s queued updates", stats.queued)
+
+
+def _user_key(update: object) -> int | None:
+    """Ordering key: the Telegram user id, or None for updates without a user."""
+    if isinstance(update, Update) and update.effective_user is not None:
+        return update.effective_user.id
+    return None
+
+
+def _discard(coroutine: Awaitable[Any]) -> None:
+    """Close a coroutine that will never run (avoids 'never awaited' warnings)."""
+    if inspect.iscoroutine(coroutine):
+        coroutine.close()
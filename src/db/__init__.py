@@ -1,6 +1,6 @@
 """Database module."""
 
-from src.db.engine import create_db_and_tables, engine
-from src.db.session import get_session
+from src.db.engine import async_engine, create_db_and_tables, engine
+from src.db.session import get_async_session, get_session
 
-__all__ = ["engine", "get_session", "create_db_and_tables"]
+__all__ = ["engine", "async_engine", "get_session", "get_async_session", "create_db_and_tables"]
@@ -0,0 +1,134 @@
+"""Backfill ``description_normalized`` with the current normalizer (RULE-005).
+
+Run after the normalizer changes or after loading rows written without it:
+
+    python -m src.db.backfill [--batch-size 500]
+
+Rows are read in primary-key order, ``batch_size`` at a time (keyset
+pagination, no OFFSET), and each batch is committed on its own. The command
+can be interrupted and run again, and only rows whose stored value differs
+are written.
+
+``category_patterns`` has no raw description, so the stored value is
+normalized again. When that makes two rows of the same (user, category)
+equal, their confirmations are merged into the existing row. The pattern
+index caches patterns in memory: run this with the bot stopped, or restart
+the bot afterwards.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+from dataclasses import dataclass
+
+from sqlalchemy import update
+from sqlmodel import Session, col, select
+
+from src.db.normalization import normalize_description
+from src.models import CategoryPattern, Expense
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class BackfillStats:
+    """Rows read, rewritten and merged for one table."""
+
+    table: str
+    scanned: int
+    updated: int
+    merged: int = 0
+
+
+def backfill_expenses(session: Session, batch_size: int = 500) -> BackfillStats:
+    """Recompute ``expenses.description_normalized`` from ``description``."""
+    scanned = updated = 0
+    last_id = 0
+    while True:
+        stmt = (
+            select(Expense.id, Expense.description, Expense.description_normalized)
+            .where(col(Expense.id) > last_id)
+            .order_by(col(Expense.id))
+            .limit(batch_size)
+        )
+        rows = session.exec(stmt).all()
+        if not rows:
+            break
+        changes = [
+            {"id": expense_id, "description_normalized": normalized}
+            for expense_id, description, stored in rows
+            if (normalized := normalize_description(description)) != stored
+        ]
+        if changes:
+            session.execute(update(Expense), changes)  # bulk UPDATE by primary key
+        session.commit()
+        scanned += len(rows)
+        updated += len(changes)
+        last_id = rows[-1][0] or last_id
+    return BackfillStats("expenses", scanned, updated)
+
+
+def backfill_category_patterns(session: Session, batch_size: int = 500) -> BackfillStats:
+    """Normalize ``category_patterns.description_normalized`` again, merging duplicates."""
+    scanned = updated = merged = 0
+    last_id = 0
+    while True:
+        stmt = (
+            select(CategoryPattern)
+            .where(col(CategoryPattern.id) > last_id)
+            .order_by(col(CategoryPattern.id))
+            .limit(batch_size)
+        )
+        patterns = session.exec(stmt).all()
+        if not patterns:
+            break
+        last_id = patterns[-1].id or last_id  # read before the row may be merged away
+        for pattern in patterns:
+            normalized = normalize_description(pattern.description_normalized)
+            if normalized == pattern.description_normalized:
+                continue
+            existing = session.exec(
+                select(CategoryPattern).where(
+                    CategoryPattern.user_id == pattern.user_id,
+                    CategoryPattern.description_normalized == normalized,
+                    CategoryPattern.category_id == pattern.category_id,
+                )
+            ).first()
+            if existing is None:
+                pattern.description_normalized = normalized
+                updated += 1
+                continue
+            existing.confirmation_count += pattern.confirmation_count
+            existing.last_used_at = max(existing.last_used_at, pattern.last_used_at)
+            existing.created_at = min(existing.created_at, pattern.created_at)
+            session.delete(pattern)
+            merged += 1
+        session.commit()
+        scanned += len(patterns)
+    return BackfillStats("category_patterns", scanned, updated, merged)
+
+
+def main() -> None:
+    """Backfill every ``description_normalized`` column."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0] if __doc__ else None)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    from src.db.engine import engine
+
+    with Session(engine) as session:
+        for backfill in (backfill_expenses, backfill_category_patterns):
+            stats = backfill(session, args.batch_size)
+            logger.info(
+                "%s: %d scanned, %d updated, %d merged",
+                stats.table,
+                stats.scanned,
+                stats.updated,
+                stats.merged,
+            )
+
+
+if __name__ == "__main__":
+    main()
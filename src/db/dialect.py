@@ -0,0 +1,18 @@
+"""Dialect-aware statement helpers (Postgres in production, SQLite in tests)."""
+
+from typing import Any
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+
+def dialect_insert(session: AsyncSession, model: Any) -> Any:
+    """Return an ``INSERT`` for ``model`` supporting ``on_conflict_do_nothing``.
+
+    Both the PostgreSQL and SQLite constructs accept the same
+    ``index_elements`` / ``index_where`` arguments, so callers can target a
+    partial unique index the same way on either database.
+    """
+    if session.bind is not None and session.bind.dialect.name == "sqlite":
+        return sqlite.insert(model)
+    return postgresql.insert(model)
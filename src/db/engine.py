@@ -1,10 +1,30 @@
 """Database engine configuration for SQLModel."""
 
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from sqlmodel import SQLModel, create_engine
 
 from src.core.config import settings
 
-# Create database engine
+# Sync URL scheme -> async driver used by the bot handlers
+_ASYNC_DRIVERS: dict[str, str] = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def get_async_database_url(url: str) -> str:
+    """Return ``url`` rewritten to use an async driver (asyncpg / aiosqlite).
+
+    URLs that already name an async driver (or an unknown scheme) are returned as-is.
+    """
+    scheme, sep, rest = url.partition("://")
+    if not sep:
+        return url
+    return f"{_ASYNC_DRIVERS.get(scheme, scheme)}://{rest}"
+
+
+# Create database engine (sync: Alembic, scripts, seed)
 engine = create_engine(
     settings.DATABASE_URL,
     echo=False,  # Set to True for SQL query logging
@@ -13,6 +33,17 @@ engine = create_engine(
     max_overflow=10,
 )
 
+# Async engine used by the Telegram handlers (does not block the event loop).
+# Each concurrently processed update may hold one connection for its unit of
+# work; the overflow serves background jobs (audio, cache writes, flushes).
+async_engine: AsyncEngine = create_async_engine(
+    get_async_database_url(settings.DATABASE_URL),
+    echo=False,
+    pool_pre_ping=True,
+    pool_size=settings.BOT_CONCURRENT_UPDATES,
+    max_overflow=10,
+)
+
 
 def create_db_and_tables() -> None:
     """Create all database tables from SQLModel metadata."""
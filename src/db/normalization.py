@@ -0,0 +1,76 @@
+"""Description normalization shared by models, services and backfills (RULE-005).
+
+``normalize_description`` is the application's definition of the
+``lower(unaccent(trim(description)))`` key in RULE-005:
+
+1. only spaces are trimmed (not tabs or newlines);
+2. precomposed letters lose their diacritics (canonical decomposition, so
+   compatibility forms such as ``º`` or ``½`` are kept). A few letters
+   without a decomposition are spelled out (``ß`` -> ``ss``, ``ø`` -> ``o``,
+   ``ﬁ`` -> ``fi``);
+3. ``str.lower``.
+
+``"  Açaí da Esquina "`` -> ``"acai da esquina"``.
+
+It is not checked against PostgreSQL's ``unaccent`` or ``lower``, which
+depend on the rules file and the collation. ``description_normalized``
+columns are written from Python with this function and lookups compare
+stored values, so SQL must never compute the expression itself.
+"""
+
+from __future__ import annotations
+
+import unicodedata
+
+# Spellings for letters and ligatures without a canonical decomposition
+_UNACCENT_SPECIAL = str.maketrans(
+    {
+        "Æ": "AE",
+        "æ": "ae",
+        "Ð": "D",
+        "ð": "d",
+        "Ø": "O",
+        "ø": "o",
+        "Þ": "TH",
+        "þ": "th",
+        "ß": "ss",
+        "ẞ": "SS",
+        "Đ": "D",
+        "đ": "d",
+        "Ħ": "H",
+        "ħ": "h",
+        "ı": "i",
+        "Ĳ": "IJ",
+        "ĳ": "ij",
+        "ĸ": "q",
+        "Ŀ": "L",
+        "ŀ": "l",
+        "Ł": "L",
+        "ł": "l",
+        "Ŋ": "N",
+        "ŋ": "n",
+        "Œ": "OE",
+        "œ": "oe",
+        "Ŧ": "T",
+        "ŧ": "t",
+        "ﬀ": "ff",
+        "ﬁ": "fi",
+        "ﬂ": "fl",
+        "ﬃ": "ffi",
+        "ﬄ": "ffl",
+        "ﬅ": "st",
+        "ﬆ": "st",
+    }
+)
+
+
+def unaccent(text: str) -> str:
+    """Remove diacritics and spell out letters such as ``ß`` and ``ø``."""
+    decomposed = unicodedata.normalize("NFD", text.translate(_UNACCENT_SPECIAL))
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return unicodedata.normalize("NFC", stripped)
+
+
+def normalize_description(description: str) -> str:
+    """Trim spaces, strip accents and lowercase (RULE-005)."""
+    return unaccent(description.strip(" ")).lower()
@@ -1,6 +1,7 @@
 """Seed data: default categories per user."""
 
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from src.models import Category
 
@@ -28,3 +29,17 @@ def seed_default_categories(session: Session, user_id: int) -> None:
     for name in DEFAULT_CATEGORY_NAMES:
         session.add(Category(user_id=user_id, name=name, is_default=True, is_essential=False))
     session.commit()
+
+
+async def seed_default_categories_async(session: AsyncSession, user_id: int) -> None:
+    """Async variant of ``seed_default_categories`` for handlers on the async engine."""
+    stmt = select(Category).where(
+        Category.user_id == user_id,
+        Category.is_default == True,  # noqa: E712
+    )
+    existing = (await session.exec(stmt)).first()
+    if existing is not None:
+        return
+    for name in DEFAULT_CATEGORY_NAMES:
+        session.add(Category(user_id=user_id, name=name, is_default=True, is_essential=False))
+    await session.commit()
@@ -1,10 +1,12 @@
 """Database session management."""
 
-from collections.abc import Iterator
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager
 
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from src.db.engine import engine
+from src.db.engine import async_engine, engine
 
 
 def get_session() -> Iterator[Session]:
@@ -23,3 +25,32 @@ def get_session() -> Iterator[Session]:
     """
     with Session(engine) as session:
         yield session
+
+
+def new_async_session() -> AsyncSession:
+    """Create an async session bound to the async engine (caller closes it).
+
+    No connection is checked out from the pool until the first statement runs.
+    """
+    return AsyncSession(async_engine, expire_on_commit=False)
+
+
+@asynccontextmanager
+async def get_async_session() -> AsyncIterator[AsyncSession]:
+    """Get an async database session (async equivalent of ``get_session``).
+
+    Objects are not expired on commit, so attributes stay readable after
+    ``commit()`` without an implicit (blocking) refresh.
+
+    Yields:
+        AsyncSession: SQLModel async database session
+
+    Example:
+        ```python
+        async with get_async_session() as session:
+            result = await session.exec(select(User))
+            users = result.all()
+        ```
+    """
+    async with new_async_session() as session:
+        yield session
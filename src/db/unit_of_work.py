@@ -0,0 +1,99 @@
+"""Request-scoped unit of work: one session and one transaction per Telegram update.
+
+The bot application opens a ``UnitOfWork`` around each update (see
+``src.bot.context``). The auth helper and the handler body share its session,
+so a command costs one pooled connection checkout instead of one per query.
+"""
+
+from __future__ import annotations
+
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.db.session import new_async_session
+
+_current_unit_of_work: ContextVar[UnitOfWork | None] = ContextVar(
+    "current_unit_of_work", default=None
+)
+
+
+class UnitOfWork:
+    """Lazily opened async session shared by everything handling one update.
+
+    The session (and therefore the pool checkout) is only created on first use,
+    so updates that never touch the DB cost nothing. The open transaction
+    (ORM changes and Core statements alike) is committed when the unit of work
+    ends successfully and rolled back on error.
+
+    ``commit()`` also returns the connection to the pool; call it before slow
+    network I/O (Telegram replies) so an idle transaction does not hold a
+    connection other updates are waiting for.
+    """
+
+    def __init__(self) -> None:
+        self._session: AsyncSession | None = None
+
+    @property
+    def session(self) -> AsyncSession:
+        """Return the shared session, creating it on first access."""
+        if self._session is None:
+            self._session = new_async_session()
+        return self._session
+
+    async def commit(self) -> None:
+        """Commit and release the connection (no-op if the session was never used).
+
+        The session stays usable: the next statement checks out a connection again.
+        """
+        if self._session is not None:
+            await self._session.commit()
+
+    async def rollback(self) -> None:
+        """Roll back the current transaction (no-op if the session was never used)."""
+        if self._session is not None:
+            await self._session.rollback()
+
+    async def close(self, *, commit: bool = True) -> None:
+        """End the unit of work: commit the open transaction if ``commit``, then close."""
+        session = self._session
+        if session is None:
+            return
+        self._session = None
+        try:
+            # Not only session.new/dirty: Core UPDATE ... RETURNING leaves no ORM state
+            if commit and session.in_transaction():
+                await session.commit()
+        finally:
+            await session.close()
+
+
+@asynccontextmanager
+async def unit_of_work() -> AsyncIterator[UnitOfWork]:
+    """Open a unit of work and make it current for the enclosed block.
+
+    Example:
+        ```python
+        async with unit_of_work() as uow:
+            uow.session.add(card)
+            await uow.commit()
+        ```
+    """
+    uow = UnitOfWork()
+    token = _current_unit_of_work.set(uow)
+    try:
+        yield uow
+    except BaseException:
+        await uow.close(commit=False)
+        raise
+    else:
+        await uow.close()
+    finally:
+        _current_unit_of_work.reset(token)
+
+
+def current_unit_of_work() -> UnitOfWork | None:
+    """Return the unit of work active in this task, if any."""
+    return _current_unit_of_work.get()
@@ -1,7 +1,21 @@
 """Models module."""
 
+from src.models.audio import StoredAudio
 from src.models.card import Card
 from src.models.category import Category
+from src.models.category_pattern import CategoryPattern
+from src.models.expense import Expense
+from src.models.extraction import ExtractionCacheEntry
+from src.models.transcription import TranscriptionCacheEntry
 from src.models.user import User
 
-__all__ = ["User", "Card", "Category"]
+__all__ = [
+    "User",
+    "Card",
+    "Category",
+    "TranscriptionCacheEntry",
+    "StoredAudio",
+    "ExtractionCacheEntry",
+    "CategoryPattern",
+    "Expense",
+]
@@ -0,0 +1,23 @@
+"""Retained voice-note audio (RULE-009): one row per stored file."""
+
+from datetime import UTC, datetime
+
+from sqlmodel import Field, SQLModel
+
+from src.db.types import UTCDateTime
+
+
+class StoredAudio(SQLModel, table=True):
+    """Audio kept on disk by ``AudioStore``, keyed by Telegram ``file_unique_id``.
+
+    ``expires_at`` is indexed: the sweeper reads expired rows in order from
+    the index instead of walking the storage directory.
+    """
+
+    __tablename__ = "stored_audio"
+
+    id: int | None = Field(default=None, primary_key=True)
+    file_unique_id: str = Field(max_length=64, unique=True, index=True)
+    size_bytes: int = Field(default=0)
+    created_at: datetime = Field(default_factory=lambda: datetime.now(UTC), sa_type=UTCDateTime)
+    expires_at: datetime = Field(sa_type=UTCDateTime, index=True)
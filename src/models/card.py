@@ -2,13 +2,27 @@
 
 from datetime import UTC, datetime
 
+import sqlalchemy as sa
 from sqlmodel import Field, SQLModel
 
+from src.db.types import UTCDateTime
+
 
 class Card(SQLModel, table=True):
     """Card model: user card with closing and due dates (soft delete)."""
 
     __tablename__ = "cards"
+    __table_args__ = (
+        # Case-insensitive unique name among active rows (migration 003)
+        sa.Index(
+            "uq_cards_user_id_lower_name",
+            "user_id",
+            sa.func.lower(sa.column("name")),
+            unique=True,
+            postgresql_where=sa.text("deleted_at IS NULL"),
+            sqlite_where=sa.text("deleted_at IS NULL"),
+        ),
+    )
 
     id: int | None = Field(default=None, primary_key=True)
     user_id: int = Field(foreign_key="users.id", index=True)
@@ -17,6 +31,6 @@ class Card(SQLModel, table=True):
     closing_day: int = Field(ge=1, le=31, description="Invoice closing day (1-31)")
     due_day: int = Field(ge=1, le=31, description="Invoice due day (1-31)")
     is_debit: bool = Field(default=False)
-    deleted_at: datetime | None = Field(default=None)
-    created_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
-    updated_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
+    deleted_at: datetime | None = Field(default=None, sa_type=UTCDateTime)
+    created_at: datetime = Field(default_factory=lambda: datetime.now(UTC), sa_type=UTCDateTime)
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(UTC), sa_type=UTCDateTime)
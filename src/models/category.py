@@ -2,18 +2,32 @@
 
 from datetime import UTC, datetime
 
+import sqlalchemy as sa
 from sqlmodel import Field, SQLModel
 
+from src.db.types import UTCDateTime
+
 
 class Category(SQLModel, table=True):
     """Category model: user category (default or custom), soft delete."""
 
     __tablename__ = "categories"
+    __table_args__ = (
+        # Case-insensitive unique name among active rows (migration 003)
+        sa.Index(
+            "uq_categories_user_id_lower_name",
+            "user_id",
+            sa.func.lower(sa.column("name")),
+            unique=True,
+            postgresql_where=sa.text("deleted_at IS NULL"),
+            sqlite_where=sa.text("deleted_at IS NULL"),
+        ),
+    )
 
     id: int | None = Field(default=None, primary_key=True)
     user_id: int = Field(foreign_key="users.id", index=True)
     name: str = Field(max_length=50)
     is_default: bool = Field(default=False, description="True for seed/default categories")
     is_essential: bool = Field(default=False)
-    deleted_at: datetime | None = Field(default=None)
-    created_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
+    deleted_at: datetime | None = Field(default=None, sa_type=UTCDateTime)
+    created_at: datetime = Field(default_factory=lambda: datetime.now(UTC), sa_type=UTCDateTime)
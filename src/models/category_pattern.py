@@ -0,0 +1,36 @@
+"""Learned description -> category patterns (FEAT-004, RULE-003)."""
+
+from datetime import UTC, datetime
+
+import sqlalchemy as sa
+from sqlmodel import Field, SQLModel
+
+from src.db.types import UTCDateTime
+
+
+class CategoryPattern(SQLModel, table=True):
+    """How many times a user confirmed ``category_id`` for a normalized description.
+
+    One row per (user, description, category): a description confirmed under
+    two categories keeps both counts, and the most confirmed one is suggested
+    once it reaches 3 confirmations (RULE-003).
+    """
+
+    __tablename__ = "category_patterns"
+    __table_args__ = (
+        # Leads with (user_id, description_normalized): also the lookup index
+        sa.UniqueConstraint(
+            "user_id",
+            "description_normalized",
+            "category_id",
+            name="uq_category_patterns_user_description_category",
+        ),
+    )
+
+    id: int | None = Field(default=None, primary_key=True)
+    user_id: int = Field(foreign_key="users.id", index=True)
+    description_normalized: str = Field(max_length=255, description="RULE-005 normalization")
+    category_id: int = Field(foreign_key="categories.id")
+    confirmation_count: int = Field(default=1)
+    last_used_at: datetime = Field(default_factory=lambda: datetime.now(UTC), sa_type=UTCDateTime)
+    created_at: datetime = Field(default_factory=lambda: datetime.now(UTC), sa_type=UTCDateTime)
@@ -0,0 +1,47 @@
+"""Expense model: one confirmed expense (FEAT-003, FEAT-006)."""
+
+from datetime import UTC, date, datetime
+from decimal import Decimal
+from typing import Any
+
+import sqlalchemy as sa
+from sqlmodel import Field, SQLModel
+
+from src.db.normalization import normalize_description
+from src.db.types import UTCDateTime
+
+
+class Expense(SQLModel, table=True):
+    """Expense with its category, optional card and installment count.
+
+    ``description_normalized`` (RULE-005) is maintained on every ORM insert
+    and update, so it never has to be computed in a query. Core statements
+    that write ``description`` must set it with ``normalize_description``.
+    """
+
+    __tablename__ = "expenses"
+    __table_args__ = (
+        # Per-user lookups by normalized description (learning, duplicates)
+        sa.Index("ix_expenses_user_id_description_normalized", "user_id", "description_normalized"),
+    )
+
+    id: int | None = Field(default=None, primary_key=True)
+    user_id: int = Field(foreign_key="users.id")
+    card_id: int | None = Field(default=None, foreign_key="cards.id")
+    category_id: int = Field(foreign_key="categories.id")
+    description: str = Field(max_length=200)
+    description_normalized: str = Field(default="", max_length=255)
+    total_amount: Decimal = Field(max_digits=12, decimal_places=2, gt=0)
+    installments: int = Field(default=1, ge=1)
+    expense_date: date = Field(description="Expense date (never in the future)")
+    is_essential: bool = Field(default=False)
+    confidence_score: float | None = Field(default=None, ge=0, le=1)
+    transcription: str | None = Field(default=None, sa_type=sa.Text)
+    created_at: datetime = Field(default_factory=lambda: datetime.now(UTC), sa_type=UTCDateTime)
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(UTC), sa_type=UTCDateTime)
+
+
+@sa.event.listens_for(Expense, "before_insert")
+@sa.event.listens_for(Expense, "before_update")
+def _maintain_description_normalized(mapper: Any, connection: Any, target: Expense) -> None:
+    target.description_normalized = normalize_description(target.description)
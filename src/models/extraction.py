@@ -0,0 +1,31 @@
+"""Persistent extraction cache entries (LLM output per normalized phrase)."""
+
+from datetime import UTC, datetime
+
+import sqlalchemy as sa
+from sqlmodel import Field, SQLModel
+
+from src.db.types import UTCDateTime
+
+
+class ExtractionCacheEntry(SQLModel, table=True):
+    """LLM extraction of a phrase, keyed by text hash + category-set hash + model.
+
+    The text is normalized before hashing, so "Spotify 21,90" and " spotify
+    21,90" share an entry. The category-set hash changes when the user's
+    categories change, since the suggested category depends on them.
+    """
+
+    __tablename__ = "extraction_cache"
+    __table_args__ = (
+        sa.UniqueConstraint(
+            "text_hash", "categories_hash", "model", name="uq_extraction_cache_key"
+        ),
+    )
+
+    id: int | None = Field(default=None, primary_key=True)
+    text_hash: str = Field(max_length=64)
+    categories_hash: str = Field(max_length=64)
+    model: str = Field(max_length=64)
+    result: str = Field(sa_type=sa.Text, description="Validated LLM output (JSON)")
+    created_at: datetime = Field(default_factory=lambda: datetime.now(UTC), sa_type=UTCDateTime)
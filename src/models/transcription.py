@@ -0,0 +1,31 @@
+"""Persistent transcription cache entries (content-addressed by Telegram file)."""
+
+from datetime import UTC, datetime
+
+import sqlalchemy as sa
+from sqlmodel import Field, SQLModel
+
+from src.db.types import UTCDateTime
+
+
+class TranscriptionCacheEntry(SQLModel, table=True):
+    """Transcribed text of a voice note, keyed by file_unique_id + language + model.
+
+    Telegram keeps ``file_unique_id`` stable across forwards and re-sends, so the
+    same audio is only transcribed once per language/model.
+    """
+
+    __tablename__ = "transcription_cache"
+    __table_args__ = (
+        sa.UniqueConstraint(
+            "file_unique_id", "language", "model", name="uq_transcription_cache_key"
+        ),
+    )
+
+    id: int | None = Field(default=None, primary_key=True)
+    file_unique_id: str = Field(max_length=64)
+    language: str = Field(max_length=8)
+    model: str = Field(max_length=64)
+    text: str = Field(sa_type=sa.Text)
+    audio_bytes: int = Field(default=0, description="Size of the transcribed audio file")
+    created_at: datetime = Field(default_factory=lambda: datetime.now(UTC), sa_type=UTCDateTime)
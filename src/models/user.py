@@ -4,6 +4,8 @@ from datetime import datetime
 
 from sqlmodel import Field, SQLModel
 
+from src.db.types import UTCDateTime
+
 
 class User(SQLModel, table=True):
     """User model: Telegram user with PIN and session data."""
@@ -14,5 +16,5 @@ class User(SQLModel, table=True):
     telegram_id: int = Field(unique=True, index=True)
     pin_hash: str = Field(min_length=1)
     failed_attempts: int = Field(default=0)
-    locked_until: datetime | None = Field(default=None)
-    last_login: datetime | None = Field(default=None)
+    locked_until: datetime | None = Field(default=None, sa_type=UTCDateTime)
+    last_login: datetime | None = Field(default=None, sa_type=UTCDateTime)
@@ -1,6 +1,18 @@
 """Auth services: PIN hash, verification, session and lock."""
 
-from src.services.auth.pin_service import hash_pin, verify_pin
+from src.services.auth.cache import AuthUserCache, CachedAuthUser, auth_user_cache
+from src.services.auth.login_attempts import (
+    FailedLoginResult,
+    record_failed_login,
+    record_successful_login,
+)
+from src.services.auth.pin_service import (
+    PinServiceBusyError,
+    hash_pin,
+    hash_pin_async,
+    verify_pin,
+    verify_pin_async,
+)
 from src.services.auth.session import (
     is_locked,
     is_session_valid,
@@ -10,7 +22,16 @@ from src.services.auth.session import (
 __all__ = [
     "hash_pin",
     "verify_pin",
+    "hash_pin_async",
+    "verify_pin_async",
+    "PinServiceBusyError",
     "is_locked",
     "is_session_valid",
     "lock_duration",
+    "AuthUserCache",
+    "CachedAuthUser",
+    "auth_user_cache",
+    "FailedLoginResult",
+    "record_failed_login",
+    "record_successful_login",
 ]
@@ -0,0 +1,115 @@
+"""In-process TTL/LRU cache of the user fields needed by the auth check (RULE-007, RULE-008).
+
+``get_authenticated_user`` runs on every command and voice note; caching the
+lock/session fields by ``telegram_id`` makes the steady-state check free of DB
+round trips. Entries must be invalidated whenever ``failed_attempts``,
+``locked_until`` or ``last_login`` change (see ``login_ask_pin``).
+"""
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+
+from src.core.config import settings
+from src.models import User
+
+
+@dataclass(frozen=True, slots=True)
+class CachedAuthUser:
+    """Snapshot of the ``User`` fields read by ``is_locked`` / ``is_session_valid``."""
+
+    id: int
+    telegram_id: int
+    locked_until: datetime | None
+    last_login: datetime | None
+
+    @classmethod
+    def from_user(cls, user: User) -> "CachedAuthUser":
+        """Build a snapshot from a persisted ``User`` (``id`` must be set)."""
+        if user.id is None:
+            raise ValueError("Cannot cache a user without id.")
+        return cls(
+            id=user.id,
+            telegram_id=user.telegram_id,
+            locked_until=user.locked_until,
+            last_login=user.last_login,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class CacheStats:
+    """Counters exposed for monitoring the auth cache."""
+
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+
+    @property
+    def hit_ratio(self) -> float:
+        """Hits over lookups (0.0 when there were no lookups)."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class AuthUserCache:
+    """Size-bounded LRU with per-entry TTL, keyed by ``telegram_id``."""
+
+    def __init__(self, max_size: int = 10_000, ttl_seconds: float = 300.0) -> None:
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[int, tuple[float, CachedAuthUser]] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, telegram_id: int) -> CachedAuthUser | None:
+        """Return the cached snapshot, or None on miss/expiry."""
+        entry = self._entries.get(telegram_id)
+        if entry is None:
+            self._misses += 1
+            return None
+        expires_at, snapshot = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[telegram_id]
+            self._misses += 1
+            return None
+        self._entries.move_to_end(telegram_id)
+        self._hits += 1
+        return snapshot
+
+    def put(self, snapshot: CachedAuthUser) -> None:
+        """Insert/refresh a snapshot, evicting the least recently used entries."""
+        if self.max_size <= 0:
+            return
+        key = snapshot.telegram_id
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, snapshot)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def invalidate(self, telegram_id: int) -> None:
+        """Drop the entry for ``telegram_id`` (after lock/login state changes)."""
+        self._entries.pop(telegram_id, None)
+
+    def clear(self) -> None:
+        """Drop all entries and reset counters."""
+        self._entries.clear()
+        self._hits = self._misses = self._evictions = 0
+
+    def stats(self) -> CacheStats:
+        """Return current hit/miss/eviction counters and size."""
+        return CacheStats(
+            hits=self._hits,
+            misses=self._misses,
+            evictions=self._evictions,
+            size=len(self._entries),
+        )
+
+
+auth_user_cache = AuthUserCache(
+    max_size=settings.AUTH_CACHE_MAX_SIZE,
+    ttl_seconds=settings.AUTH_CACHE_TTL_SECONDS,
+)
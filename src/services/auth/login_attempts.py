@@ -0,0 +1,81 @@
+"""Atomic failed/successful login accounting (RULE-007, RULE-008).
+
+Each outcome is a single ``UPDATE ... RETURNING`` evaluated by the database, so
+PINs submitted concurrently from two devices cannot overwrite each other's
+``failed_attempts`` increment. Column references inside ``SET`` see the
+pre-update row on both SQLite and Postgres.
+"""
+
+from dataclasses import dataclass
+from datetime import UTC, datetime
+
+from sqlalchemy import case, literal, update
+from sqlmodel import col
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.db.types import UTCDateTime
+from src.models import User
+from src.services.auth.session import lock_duration
+
+# RULE-007: lock after this many consecutive failed PIN attempts
+MAX_FAILED_ATTEMPTS = 3
+
+
+@dataclass(frozen=True, slots=True)
+class FailedLoginResult:
+    """State of the account after recording a wrong PIN."""
+
+    failed_attempts: int
+    locked_until: datetime | None
+
+    @property
+    def locked(self) -> bool:
+        """True if this attempt reached the lock threshold."""
+        return self.failed_attempts >= MAX_FAILED_ATTEMPTS
+
+    @property
+    def remaining_attempts(self) -> int:
+        """Attempts left before the account is locked."""
+        return max(MAX_FAILED_ATTEMPTS - self.failed_attempts, 0)
+
+
+async def record_failed_login(session: AsyncSession, telegram_id: int) -> FailedLoginResult | None:
+    """Increment ``failed_attempts`` and lock the account on the threshold, atomically.
+
+    Does not commit. Returns None if no user has ``telegram_id``.
+    """
+    attempts = col(User.failed_attempts) + 1
+    # Typed literal: a bare aware datetime would bind as timestamptz, not naive UTC
+    lock_expiry = literal(datetime.now(UTC) + lock_duration(), UTCDateTime())
+    stmt = (
+        update(User)
+        .where(col(User.telegram_id) == telegram_id)
+        .values(
+            failed_attempts=attempts,
+            locked_until=case(
+                (attempts >= MAX_FAILED_ATTEMPTS, lock_expiry),
+                else_=col(User.locked_until),
+            ),
+        )
+        .returning(col(User.failed_attempts), col(User.locked_until))
+        .execution_options(synchronize_session=False)
+    )
+    row = (await session.exec(stmt)).first()  # type: ignore[call-overload]
+    if row is None:
+        return None
+    return FailedLoginResult(failed_attempts=row.failed_attempts, locked_until=row.locked_until)
+
+
+async def record_successful_login(session: AsyncSession, telegram_id: int) -> bool:
+    """Reset the lock state and set ``last_login`` in one statement.
+
+    Does not commit. Returns False if no user has ``telegram_id``.
+    """
+    stmt = (
+        update(User)
+        .where(col(User.telegram_id) == telegram_id)
+        .values(failed_attempts=0, locked_until=None, last_login=datetime.now(UTC))
+        .returning(col(User.id))
+        .execution_options(synchronize_session=False)
+    )
+    return (await session.exec(stmt)).first() is not None  # type: ignore[call-overload]
@@ -1,7 +1,19 @@
-"""PIN hashing and verification using bcrypt (cost=12)."""
+"""PIN hashing and verification using bcrypt (cost=12).
+
+bcrypt at cost 12 takes hundreds of milliseconds of CPU. Handlers use the
+``*_async`` wrappers, which run it on a bounded process pool.
+"""
+
+import asyncio
+import multiprocessing
+import os
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
 
 import bcrypt
 
+from src.core.config import settings
+
 # Bcrypt cost factor (rounds). PRD: cost=12.
 PIN_BCRYPT_COST = 12
 
@@ -34,3 +46,101 @@ def verify_pin(pin: str, pin_hash: str) -> bool:
         pin.encode("utf-8"),
         pin_hash.encode("ascii"),
     )
+
+
+class PinServiceBusyError(Exception):
+    """Too many PIN hash/verify jobs pending; the caller should ask the user to retry."""
+
+
+class PinHasherPool:
+    """Bounded process pool running bcrypt off the event loop, with admission control.
+
+    At most ``max_pending`` jobs (running + queued) are accepted; beyond that
+    ``PinServiceBusyError`` is raised immediately instead of queueing, so a burst
+    of logins saturates the cores without building an unbounded backlog.
+    """
+
+    def __init__(self, max_workers: int | None = None, max_pending: int = 64) -> None:
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_pending = max_pending
+        self._pending = 0
+        self._executor: ProcessPoolExecutor | None = None
+
+    @property
+    def pending(self) -> int:
+        """Jobs currently running or queued in the pool."""
+        return self._pending
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn: forking a process that runs asyncio/DB threads is unsafe
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    async def _run[T](self, fn: Callable[..., T], *args: str) -> T:
+        if self._pending >= self.max_pending:
+            raise PinServiceBusyError(
+                f"PIN hashing queue full ({self._pending}/{self.max_pending} pending)."
+            )
+        self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            self._pending -= 1
+
+    async def hash_pin(self, pin: str) -> str:
+        """Async ``hash_pin`` executed in the pool."""
+        return await self._run(hash_pin, pin)
+
+    async def verify_pin(self, pin: str, pin_hash: str) -> bool:
+        """Async ``verify_pin`` executed in the pool."""
+        return await self._run(verify_pin, pin, pin_hash)
+
+    def shutdown(self) -> None:
+        """Stop the worker processes (a later call re-creates them lazily)."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+
+_pin_pool: PinHasherPool | None = None
+
+
+def get_pin_pool() -> PinHasherPool:
+    """Return the process-wide PIN hasher pool configured from settings."""
+    global _pin_pool
+
+    if _pin_pool is None:
+        _pin_pool = PinHasherPool(
+            max_workers=settings.PIN_HASH_WORKERS,
+            max_pending=settings.PIN_HASH_MAX_PENDING,
+        )
+    return _pin_pool
+
+
+async def hash_pin_async(pin: str) -> str:
+    """Hash a PIN on the process pool without blocking the event loop.
+
+    Raises:
+        PinServiceBusyError: If the pool already has ``PIN_HASH_MAX_PENDING`` jobs.
+    """
+    return await get_pin_pool().hash_pin(pin)
+
+
+async def verify_pin_async(pin: str, pin_hash: str) -> bool:
+    """Verify a PIN on the process pool without blocking the event loop.
+
+    Raises:
+        PinServiceBusyError: If the pool already has ``PIN_HASH_MAX_PENDING`` jobs.
+    """
+    return await get_pin_pool().verify_pin(pin, pin_hash)
+
+
+def shutdown_pin_pool() -> None:
+    """Shut down the process-wide pool (called on application shutdown)."""
+    if _pin_pool is not None:
+        _pin_pool.shutdown()
@@ -1,8 +1,7 @@
 """Session and account lock logic (RULE-007, RULE-008)."""
 
 from datetime import UTC, datetime, timedelta
-
-from src.models import User
+from typing import Protocol
 
 # RULE-007: lock duration after 3 failed PIN attempts
 LOCK_DURATION_MINUTES = 15
@@ -10,7 +9,17 @@ LOCK_DURATION_MINUTES = 15
 SESSION_VALID_HOURS = 24
 
 
-def is_locked(user: User) -> bool:
+class AuthState(Protocol):
+    """Lock/session fields shared by ``User`` and the cached auth snapshot."""
+
+    @property
+    def locked_until(self) -> datetime | None: ...
+
+    @property
+    def last_login(self) -> datetime | None: ...
+
+
+def is_locked(user: AuthState) -> bool:
     """Return True if user account is locked (within lock window)."""
     if user.locked_until is None:
         return False
@@ -22,7 +31,7 @@ def is_locked(user: User) -> bool:
     return now < locked_until
 
 
-def is_session_valid(user: User) -> bool:
+def is_session_valid(user: AuthState) -> bool:
     """Return True if user has a valid session (last_login within 24h)."""
     if user.last_login is None:
         return False
@@ -1 +1,50 @@
-"""Extraction service module."""
+"""Extraction service module.
+
+Extração de despesas a partir do texto transcrito: caminho rápido por regras
+(valores, datas relativas) e Gemini apenas quando a confiança é baixa, com
+cache de respostas por frase normalizada.
+"""
+
+from src.services.extraction.amounts import AmountMatch, find_digit_amounts, find_word_amounts
+from src.services.extraction.cache import ExtractionCache, extraction_cache
+from src.services.extraction.dates import (
+    EXPENSE_FUTURE_DATE,
+    ResolvedDate,
+    day_table,
+    resolve_date,
+    validate_expense_date,
+)
+from src.services.extraction.extractor import (
+    ExpenseExtractor,
+    ExtractionStats,
+    LLMExtractor,
+    get_expense_extractor,
+    shutdown_expense_extractor,
+)
+from src.services.extraction.fast_path import ExtractedExpense, FastPathExtractor, fold, tokenize
+from src.services.extraction.gemini import ExtractionError, GeminiExtractor, get_gemini_extractor
+
+__all__ = [
+    "AmountMatch",
+    "find_digit_amounts",
+    "find_word_amounts",
+    "ExtractionCache",
+    "extraction_cache",
+    "EXPENSE_FUTURE_DATE",
+    "ResolvedDate",
+    "day_table",
+    "resolve_date",
+    "validate_expense_date",
+    "ExpenseExtractor",
+    "ExtractionStats",
+    "LLMExtractor",
+    "get_expense_extractor",
+    "shutdown_expense_extractor",
+    "ExtractedExpense",
+    "FastPathExtractor",
+    "fold",
+    "tokenize",
+    "ExtractionError",
+    "GeminiExtractor",
+    "get_gemini_extractor",
+]
@@ -0,0 +1,223 @@
+"""Money amounts in Portuguese (BRL): digits and spoken number words.
+
+Handles the forms that appear in transcribed voice notes:
+
+- digits: ``R$ 12,90``, ``1.234,56``, ``30 reais``, ``12.90``;
+- number words: ``trinta reais``, ``mil e duzentos``, ``cento e vinte``,
+  ``trinta e cinco reais e cinquenta centavos`` and the colloquial
+  ``trinta e cinco e cinquenta`` (a second group that cannot continue the
+  first one is read as centavos, unless a currency word follows it:
+  ``quinze reais e dez reais`` is two amounts).
+
+Both finders take folded tokens (lowercase, no accents; ``R$`` as ``r$``)
+and return token spans.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from decimal import Decimal
+
+UNITS = {
+    "zero": 0,
+    "um": 1,
+    "uma": 1,
+    "dois": 2,
+    "duas": 2,
+    "tres": 3,
+    "quatro": 4,
+    "cinco": 5,
+    "seis": 6,
+    "sete": 7,
+    "oito": 8,
+    "nove": 9,
+    "dez": 10,
+    "onze": 11,
+    "doze": 12,
+    "treze": 13,
+    "catorze": 14,
+    "quatorze": 14,
+    "quinze": 15,
+    "dezesseis": 16,
+    "dezessete": 17,
+    "dezoito": 18,
+    "dezenove": 19,
+    "vinte": 20,
+    "trinta": 30,
+    "quarenta": 40,
+    "cinquenta": 50,
+    "sessenta": 60,
+    "setenta": 70,
+    "oitenta": 80,
+    "noventa": 90,
+    "cem": 100,
+    "cento": 100,
+    "duzentos": 200,
+    "duzentas": 200,
+    "trezentos": 300,
+    "trezentas": 300,
+    "quatrocentos": 400,
+    "quatrocentas": 400,
+    "quinhentos": 500,
+    "quinhentas": 500,
+    "seiscentos": 600,
+    "seiscentas": 600,
+    "setecentos": 700,
+    "setecentas": 700,
+    "oitocentos": 800,
+    "oitocentas": 800,
+    "novecentos": 900,
+    "novecentas": 900,
+}
+THOUSAND = "mil"
+NUMBER_WORDS = frozenset(UNITS) | {THOUSAND}
+CURRENCY_WORDS = frozenset({"real", "reais", "conto", "contos", "pila", "pilas"})
+CENTS_WORDS = frozenset({"centavo", "centavos"})
+
+# Digit tokens: 1.234,56 | 12,90 | 12.90 | 1234 (a preceding "r$" token marks currency)
+NUMBER_TOKEN_RE = re.compile(r"\d{1,3}(?:\.\d{3})+(?:,\d{1,2})?|\d+(?:[.,]\d{1,2})?")
+
+
+@dataclass(frozen=True, slots=True)
+class AmountMatch:
+    """An amount found in the tokens and how explicit it was.
+
+    ``start``/``end`` delimit the tokens it spans, currency words included.
+    """
+
+    value: Decimal
+    start: int
+    end: int
+    has_currency: bool
+    from_words: bool
+
+
+def parse_decimal(number: str) -> Decimal:
+    """Parse ``1.234,56`` / ``12,90`` / ``12.90`` / ``12`` into a Decimal."""
+    if "," in number:
+        return Decimal(number.replace(".", "").replace(",", "."))
+    if re.fullmatch(r"\d{1,3}(?:\.\d{3})+", number):
+        return Decimal(number.replace(".", ""))
+    return Decimal(number)
+
+
+def find_digit_amounts(tokens: list[str]) -> list[AmountMatch]:
+    """Return amounts written with digits (``r$ 12,90``, ``30 reais``, ``12.90``)."""
+    matches: list[AmountMatch] = []
+    for i, token in enumerate(tokens):
+        if not NUMBER_TOKEN_RE.fullmatch(token):
+            continue
+        start = i - 1 if i > 0 and tokens[i - 1] == "r$" else i
+        end = i + 2 if i + 1 < len(tokens) and tokens[i + 1] in CURRENCY_WORDS else i + 1
+        matches.append(
+            AmountMatch(
+                value=parse_decimal(token).quantize(Decimal("0.01")),
+                start=start,
+                end=end,
+                has_currency=start < i or end > i + 1,
+                from_words=False,
+            )
+        )
+    return matches
+
+
+def find_word_amounts(tokens: list[str]) -> list[AmountMatch]:
+    """Return spoken amounts in ``tokens`` (folded words), with token indexes.
+
+    A lone ``um``/``uma`` is an article unless a currency word follows it.
+    """
+    matches: list[AmountMatch] = []
+    i = 0
+    while i < len(tokens):
+        if tokens[i] not in NUMBER_WORDS:
+            i += 1
+            continue
+        match = _parse_word_amount(tokens, i)
+        if match is None:
+            i += 1
+            continue
+        matches.append(match)
+        i = match.end
+    return matches
+
+
+def _parse_word_amount(tokens: list[str], start: int) -> AmountMatch | None:
+    # Each group is (value, token index after it): reais first, then centavos
+    groups: list[tuple[int, int]] = []
+    current: int | None = None
+    last = 0
+    end = start
+    has_currency = False
+    cents_marked = False
+    i = start
+    while i < len(tokens):
+        token = tokens[i]
+        if token == THOUSAND:
+            current, last = (current or 1) * 1000, 1000
+            end = i + 1
+        elif token in UNITS:
+            number = UNITS[token]
+            if current is not None and number >= _place(last):
+                # "trinta e cinco e cinquenta": 50 cannot extend 35, so a new group starts
+                groups.append((current, end))
+                current = None
+            current = number if current is None else current + number
+            last = number
+            end = i + 1
+        elif token == "e" and i + 1 < len(tokens) and tokens[i + 1] in NUMBER_WORDS:
+            pass
+        elif token in CURRENCY_WORDS and current is not None and not groups:
+            has_currency = True
+            end = i + 1
+            groups.append((current, end))
+            current = None
+        elif token in CURRENCY_WORDS and current is not None:
+            # "quinze reais e dez reais": the second group is another amount, not centavos
+            current = None
+            break
+        elif token in CENTS_WORDS and current is not None:
+            cents_marked = True
+            end = i + 1
+            break
+        else:
+            break
+        i += 1
+    if current is not None:
+        groups.append((current, end))
+    if not groups:
+        return None
+
+    reais, end = groups[0]
+    if cents_marked and len(groups) == 1:
+        value = Decimal(reais) / 100  # "cinquenta centavos"
+    elif len(groups) > 1 and groups[1][0] < 100:
+        value = Decimal(reais) + Decimal(groups[1][0]) / 100
+        end = groups[1][1]
+    else:
+        value = Decimal(reais)
+    has_currency = has_currency or cents_marked
+    if value == 1 and tokens[start] in {"um", "uma"} and not has_currency:
+        return None  # article: "comprei um lanche"
+    return AmountMatch(
+        value=value.quantize(Decimal("0.01")),
+        start=start,
+        end=end,
+        has_currency=has_currency,
+        from_words=True,
+    )
+
+
+def _place(value: int) -> int:
+    """Smallest value that can no longer extend a number ending in ``value``.
+
+    ``trinta`` (30) accepts units (< 10), ``cento`` (100) accepts < 100,
+    ``mil`` accepts < 1000; units and teens (1-19) accept nothing.
+    """
+    if value >= 1000:
+        return 1000
+    if value >= 100:
+        return 100
+    if value >= 20:
+        return 10
+    return 1
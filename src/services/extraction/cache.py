@@ -0,0 +1,154 @@
+"""Two-tier extraction cache: in-process LRU backed by ``extraction_cache``.
+
+Users repeat the same phrases ("Spotify 21,90" every month). The LLM output
+for a phrase depends only on the normalized text and on the categories it
+may suggest, so it is cached under both. A user whose categories change
+gets a new key and a fresh answer. Dates are not part of the cached answer
+(see ``gemini.CachedExtraction``), so an entry stays valid on later days.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from collections import OrderedDict
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from sqlmodel import col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.core.config import settings
+from src.db.dialect import dialect_insert
+from src.models import ExtractionCacheEntry
+from src.services.extraction.fast_path import fold
+
+_SPACES_RE = re.compile(r"\s+")
+
+
+@dataclass(frozen=True, slots=True)
+class ExtractionKey:
+    """Cache key: the same phrase, offered the same categories, on the same model."""
+
+    text_hash: str
+    categories_hash: str
+    model: str
+
+
+@dataclass(frozen=True, slots=True)
+class ExtractionCacheStats:
+    """Counters exposed for monitoring the extraction cache."""
+
+    memory_hits: int
+    db_hits: int
+    misses: int
+    size: int
+
+    @property
+    def hits(self) -> int:
+        """Hits on either tier."""
+        return self.memory_hits + self.db_hits
+
+    @property
+    def hit_ratio(self) -> float:
+        """Hits over lookups (0.0 when there were no lookups)."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+def normalize_text(text: str) -> str:
+    """Fold case/accents and collapse whitespace (``" Spotify  21,90"`` -> ``"spotify 21,90"``)."""
+    return _SPACES_RE.sub(" ", fold(text)).strip()
+
+
+def categories_hash(categories: Iterable[str]) -> str:
+    """Order-insensitive hash of the user's category names."""
+    names = sorted({normalize_text(name) for name in categories})
+    return hashlib.sha256("\n".join(names).encode()).hexdigest()
+
+
+def extraction_key(text: str, categories: Iterable[str], model: str) -> ExtractionKey:
+    """Build the cache key for ``text`` extracted with ``categories`` on ``model``."""
+    text_hash = hashlib.sha256(normalize_text(text).encode()).hexdigest()
+    return ExtractionKey(text_hash, categories_hash(categories), model)
+
+
+class ExtractionCache:
+    """LRU of serialized LLM results in front of the ``extraction_cache`` table."""
+
+    def __init__(self, max_size: int = 4096) -> None:
+        self.max_size = max_size
+        self._entries: OrderedDict[ExtractionKey, str] = OrderedDict()
+        self._memory_hits = 0
+        self._db_hits = 0
+        self._misses = 0
+
+    async def get(self, session: AsyncSession, key: ExtractionKey) -> str | None:
+        """Return the cached result for ``key`` (memory first, then the table)."""
+        result = self._entries.get(key)
+        if result is not None:
+            self._entries.move_to_end(key)
+            self._memory_hits += 1
+            return result
+        stmt = select(ExtractionCacheEntry.result).where(
+            ExtractionCacheEntry.text_hash == key.text_hash,
+            ExtractionCacheEntry.categories_hash == key.categories_hash,
+            ExtractionCacheEntry.model == key.model,
+        )
+        result = (await session.exec(stmt)).first()
+        if result is None:
+            self._misses += 1
+            return None
+        self._db_hits += 1
+        self._remember(key, result)
+        return result
+
+    async def put(self, session: AsyncSession, key: ExtractionKey, result: str) -> None:
+        """Store a result in both tiers. Does not commit.
+
+        Concurrent extractions of the same phrase may race to insert; the
+        unique key turns the loser into a no-op.
+        """
+        self._remember(key, result)
+        stmt = (
+            dialect_insert(session, ExtractionCacheEntry)
+            .values(
+                text_hash=key.text_hash,
+                categories_hash=key.categories_hash,
+                model=key.model,
+                result=result,
+            )
+            .on_conflict_do_nothing(
+                index_elements=[
+                    col(ExtractionCacheEntry.text_hash),
+                    col(ExtractionCacheEntry.categories_hash),
+                    col(ExtractionCacheEntry.model),
+                ]
+            )
+        )
+        await session.exec(stmt)
+
+    def clear(self) -> None:
+        """Drop the memory tier and reset counters (the table is untouched)."""
+        self._entries.clear()
+        self._memory_hits = self._db_hits = self._misses = 0
+
+    def stats(self) -> ExtractionCacheStats:
+        """Return hit/miss counters and the memory tier size."""
+        return ExtractionCacheStats(
+            memory_hits=self._memory_hits,
+            db_hits=self._db_hits,
+            misses=self._misses,
+            size=len(self._entries),
+        )
+
+    def _remember(self, key: ExtractionKey, result: str) -> None:
+        if self.max_size <= 0:
+            return
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+
+extraction_cache = ExtractionCache(max_size=settings.EXTRACTION_CACHE_MAX_SIZE)
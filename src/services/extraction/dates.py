@@ -0,0 +1,252 @@
+"""Relative dates in PT-BR expense phrases (FEAT-005), resolved without a model.
+
+Understands ``hoje``/``ontem``/``anteontem``, weekdays (``sábado``,
+``sábado passado``, ``sexta retrasada``, ``segunda-feira``), ``dia 5``/
+``dia cinco``/``dia primeiro`` and ``dia 5 de setembro`` (last year's when
+this year's is still ahead). ``amanhã``, ``próximo sábado`` and ``sábado
+que vem`` resolve to future dates, which expenses may not have
+(``EXPENSE.FUTURE_DATE``).
+
+Words are looked up in ``TOKEN_TABLE``, which is built once at import. The
+offsets that depend on the current date are also precomputed: days back to
+each weekday, and the last date of each day of the month. They are built
+once per day by ``day_table`` and cached. Resolving a phrase is then a token
+scan plus dict lookups, fast enough for the fast path and for checking LLM
+output.
+"""
+
+from __future__ import annotations
+
+import calendar
+from dataclasses import dataclass
+from datetime import date, timedelta
+from enum import Enum
+from functools import lru_cache
+
+# Error codes per TECH_SPECS (map to consolidated error codes)
+EXPENSE_FUTURE_DATE = "EXPENSE.FUTURE_DATE"
+
+WEEKDAY_LABELS = ("segunda", "terça", "quarta", "quinta", "sexta", "sábado", "domingo")
+
+
+class Kind(Enum):
+    """Role of a word in a date expression."""
+
+    DAYS_AGO = "days_ago"  # value: days before today (negative = future)
+    WEEKDAY = "weekday"  # value: 0 = Monday ... 6 = Sunday
+    DAY = "day"  # "dia": a day number follows
+    MONTH = "month"  # value: 1-12
+    LAST = "last"  # value: weeks further back ("passado" 1, "retrasado" 2)
+    NEXT = "next"  # "proximo", "que vem"
+    FILLER = "filler"  # "feira" in "segunda-feira"
+
+
+@dataclass(frozen=True, slots=True)
+class DateToken:
+    """Entry of ``TOKEN_TABLE``."""
+
+    kind: Kind
+    value: int = 0
+    label: str = ""
+
+
+def _build_token_table() -> dict[str, DateToken]:
+    table = {
+        "hoje": DateToken(Kind.DAYS_AGO, 0, "hoje"),
+        "ontem": DateToken(Kind.DAYS_AGO, 1, "ontem"),
+        "anteontem": DateToken(Kind.DAYS_AGO, 2, "anteontem"),
+        "amanha": DateToken(Kind.DAYS_AGO, -1, "amanhã"),
+        "dia": DateToken(Kind.DAY),
+        "passado": DateToken(Kind.LAST, 1),
+        "passada": DateToken(Kind.LAST, 1),
+        "retrasado": DateToken(Kind.LAST, 2),
+        "retrasada": DateToken(Kind.LAST, 2),
+        "proximo": DateToken(Kind.NEXT),
+        "proxima": DateToken(Kind.NEXT),
+        "feira": DateToken(Kind.FILLER),
+    }
+    for weekday, label in enumerate(("segunda", "terca", "quarta", "quinta", "sexta")):
+        table[label] = DateToken(Kind.WEEKDAY, weekday)
+    table["sabado"] = DateToken(Kind.WEEKDAY, 5)
+    table["domingo"] = DateToken(Kind.WEEKDAY, 6)
+    months = (
+        "janeiro fevereiro marco abril maio junho julho agosto setembro outubro novembro dezembro"
+    )
+    for month, name in enumerate(months.split(), start=1):
+        table[name] = DateToken(Kind.MONTH, month)
+    return table
+
+
+TOKEN_TABLE = _build_token_table()
+
+# Spoken day numbers: "dia cinco", "dia vinte e cinco", "dia primeiro"
+DAY_UNITS = {
+    "primeiro": 1,
+    "um": 1,
+    "dois": 2,
+    "tres": 3,
+    "quatro": 4,
+    "cinco": 5,
+    "seis": 6,
+    "sete": 7,
+    "oito": 8,
+    "nove": 9,
+    "dez": 10,
+    "onze": 11,
+    "doze": 12,
+    "treze": 13,
+    "catorze": 14,
+    "quatorze": 14,
+    "quinze": 15,
+    "dezesseis": 16,
+    "dezessete": 17,
+    "dezoito": 18,
+    "dezenove": 19,
+}
+DAY_TENS = {"vinte": 20, "trinta": 30}
+
+
+@dataclass(frozen=True, slots=True)
+class DayTable:
+    """Offsets for one ``today``: weekdays and days of the month, looked back."""
+
+    today: date
+    weekday_days_back: tuple[int, ...]  # index: weekday; 0 when it is today
+    day_of_month: tuple[date, ...]  # index: day - 1; latest such date <= today
+
+
+@lru_cache(maxsize=8)
+def day_table(today: date) -> DayTable:
+    """Return the precomputed offsets for ``today`` (built once per day)."""
+    weekday_days_back = tuple((today.weekday() - weekday) % 7 for weekday in range(7))
+    day_of_month = tuple(_latest_day_of_month(today, day) for day in range(1, 32))
+    return DayTable(today, weekday_days_back, day_of_month)
+
+
+@dataclass(frozen=True, slots=True)
+class ResolvedDate:
+    """A date found in the tokens, with the label shown on confirmation.
+
+    ``start``/``end`` delimit the tokens it spans. ``error`` is
+    ``EXPENSE_FUTURE_DATE`` when the date is after ``today``.
+    """
+
+    value: date
+    label: str
+    start: int
+    end: int
+    error: str | None = None
+
+
+def resolve_date(tokens: list[str], today: date) -> ResolvedDate | None:
+    """Return the first date expression in ``tokens`` (folded words), or None."""
+    table = day_table(today)
+    for i, token in enumerate(tokens):
+        entry = TOKEN_TABLE.get(token)
+        if entry is None:
+            continue
+        if entry.kind is Kind.DAYS_AGO:
+            return _result(today - timedelta(days=entry.value), entry.label, i, i + 1, today)
+        if entry.kind is Kind.WEEKDAY:
+            return _resolve_weekday(tokens, i, entry.value, table)
+        if entry.kind is Kind.NEXT and i + 1 < len(tokens):
+            following = TOKEN_TABLE.get(tokens[i + 1])
+            if following is not None and following.kind is Kind.WEEKDAY:
+                return _resolve_weekday(tokens, i, following.value, table)
+        if entry.kind is Kind.DAY:
+            resolved = _resolve_day(tokens, i, table)
+            if resolved is not None:
+                return resolved
+    return None
+
+
+def validate_expense_date(value: date, today: date) -> tuple[bool, str | None]:
+    """Validate an expense date (e.g. from the LLM): not after ``today``.
+
+    Returns:
+        (True, None) if valid, (False, error_code) otherwise.
+    """
+    if value > today:
+        return False, EXPENSE_FUTURE_DATE
+    return True, None
+
+
+def _resolve_weekday(tokens: list[str], start: int, weekday: int, table: DayTable) -> ResolvedDate:
+    """``[próximo] sábado [-feira] [passado | retrasado | que vem]``."""
+    end = start + 1
+    future = TOKEN_TABLE[tokens[start]].kind is Kind.NEXT
+    if future:
+        end += 1
+    if end < len(tokens) and tokens[end] == "feira":
+        end += 1
+    days_back = table.weekday_days_back[weekday]
+    label = WEEKDAY_LABELS[weekday]
+    following = TOKEN_TABLE.get(tokens[end]) if end < len(tokens) else None
+    if following is not None and following.kind is Kind.LAST:
+        # "sábado passado" is never today: the latest one strictly before it
+        days_back = (days_back or 7) + 7 * (following.value - 1)
+        label = f"{label} {tokens[end]}"
+        end += 1
+    elif end + 1 < len(tokens) and tokens[end] == "que" and tokens[end + 1] == "vem":
+        future = True
+        end += 2
+    if future:
+        days_back -= 7  # the next occurrence after today
+        label = f"{'próximo' if weekday >= 5 else 'próxima'} {WEEKDAY_LABELS[weekday]}"
+    value = table.today - timedelta(days=days_back)
+    return _result(value, label, start, end, table.today)
+
+
+def _resolve_day(tokens: list[str], start: int, table: DayTable) -> ResolvedDate | None:
+    """``dia 5`` / ``dia cinco`` / ``dia vinte e cinco`` [``de setembro``]."""
+    day, end = _day_number(tokens, start + 1)
+    if day is None or not 1 <= day <= 31:
+        return None
+    month = None
+    if end + 1 < len(tokens) and tokens[end] == "de":
+        entry = TOKEN_TABLE.get(tokens[end + 1])
+        if entry is not None and entry.kind is Kind.MONTH:
+            month = entry.value
+            end += 2
+    if month is None:
+        value = table.day_of_month[day - 1]
+        return _result(value, f"dia {day}", start, end, table.today)
+    # An explicit month: the latest such date, i.e. last year once it is still ahead
+    today = table.today
+    year = today.year if (month, day) <= (today.month, today.day) else today.year - 1
+    if day > calendar.monthrange(year, month)[1]:
+        return None
+    label = f"dia {day}/{month:02d}" if year == today.year else f"dia {day}/{month:02d}/{year}"
+    return _result(date(year, month, day), label, start, end, today)
+
+
+def _day_number(tokens: list[str], i: int) -> tuple[int | None, int]:
+    """Parse the day after ``dia`` at ``i``; return (day or None, index after it)."""
+    if i >= len(tokens):
+        return None, i
+    token = tokens[i]
+    if token.isdigit():
+        return int(token), i + 1
+    if token in DAY_UNITS:
+        return DAY_UNITS[token], i + 1
+    if token in DAY_TENS:
+        tens = DAY_TENS[token]
+        if i + 2 < len(tokens) and tokens[i + 1] == "e" and tokens[i + 2] in DAY_UNITS:
+            return tens + DAY_UNITS[tokens[i + 2]], i + 3
+        return tens, i + 1
+    return None, i
+
+
+def _result(value: date, label: str, start: int, end: int, today: date) -> ResolvedDate:
+    error = EXPENSE_FUTURE_DATE if value > today else None
+    return ResolvedDate(value=value, label=label, start=start, end=end, error=error)
+
+
+def _latest_day_of_month(today: date, day: int) -> date:
+    """Latest date <= ``today`` falling on ``day`` (skips months that lack it)."""
+    year, month = today.year, today.month
+    if day > today.day:
+        year, month = (year, month - 1) if month > 1 else (year - 1, 12)
+    while day > calendar.monthrange(year, month)[1]:
+        year, month = (year, month - 1) if month > 1 else (year - 1, 12)
+    return date(year, month, day)
@@ -0,0 +1,134 @@
+"""Expense extraction: local fast path first, LLM only when unsure.
+
+``ExpenseExtractor`` runs ``FastPathExtractor``. When the result is at least
+``min_confidence`` (RULE-006: 0.9 allows direct confirmation), the LLM is
+not called. Otherwise the text goes to the configured ``LLMExtractor``.
+``stats()`` reports the share of messages resolved locally and their
+latency.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import date
+from typing import Protocol
+
+from src.core.config import settings
+from src.services.extraction.fast_path import ExtractedExpense, FastPathExtractor
+from src.services.extraction.gemini import (
+    ExtractionError,
+    get_gemini_extractor,
+    shutdown_gemini_extractor,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class LLMExtractor(Protocol):
+    """Slow path: an LLM-backed extractor (e.g. Gemini Flash)."""
+
+    async def extract(
+        self, text: str, today: date, categories: Sequence[str] = ()
+    ) -> ExtractedExpense | None:
+        """Return the expense in ``text`` or None if there is none.
+
+        ``categories`` are the user's category names the LLM may suggest from.
+        """
+        ...
+
+
+@dataclass(frozen=True, slots=True)
+class ExtractionStats:
+    """Counters exposed for monitoring how often the LLM is skipped."""
+
+    messages: int
+    local: int
+    llm_calls: int
+    local_seconds: float
+
+    @property
+    def local_ratio(self) -> float:
+        """Share of messages resolved by the fast path (0.0 when there were none)."""
+        return self.local / self.messages if self.messages else 0.0
+
+    @property
+    def mean_local_latency_ms(self) -> float:
+        """Mean fast-path time of locally resolved messages, in milliseconds."""
+        return self.local_seconds / self.local * 1000 if self.local else 0.0
+
+
+class ExpenseExtractor:
+    """Fast path with an optional LLM fallback for low-confidence results."""
+
+    def __init__(self, llm: LLMExtractor | None = None, min_confidence: float = 0.9) -> None:
+        self.llm = llm
+        self.min_confidence = min_confidence
+        self.fast_path = FastPathExtractor()
+        self._messages = 0
+        self._local = 0
+        self._llm_calls = 0
+        self._local_seconds = 0.0
+
+    async def extract(
+        self, text: str, today: date | None = None, categories: Sequence[str] = ()
+    ) -> ExtractedExpense | None:
+        """Return the expense in ``text``.
+
+        Without an LLM, or when the LLM call fails, a low-confidence local
+        result is returned as is; callers can read ``confidence`` and ask the
+        user to confirm.
+        """
+        today = today or date.today()
+        self._messages += 1
+        started = time.perf_counter()
+        local = self.fast_path.extract(text, today)
+        elapsed = time.perf_counter() - started
+        if local is not None and local.confidence >= self.min_confidence:
+            self._local += 1
+            self._local_seconds += elapsed
+            return local
+        if self.llm is None:
+            return local
+        self._llm_calls += 1
+        logger.debug(
+            "Fast path unsure (confidence=%s); calling LLM",
+            local.confidence if local else None,
+        )
+        try:
+            return await self.llm.extract(text, today, categories)
+        except ExtractionError:
+            logger.exception("LLM extraction failed; using the fast-path result")
+            return local
+
+    def stats(self) -> ExtractionStats:
+        """Return local/LLM counters and fast-path latency."""
+        return ExtractionStats(
+            messages=self._messages,
+            local=self._local,
+            llm_calls=self._llm_calls,
+            local_seconds=self._local_seconds,
+        )
+
+
+_expense_extractor: ExpenseExtractor | None = None
+
+
+def get_expense_extractor() -> ExpenseExtractor:
+    """Return the process-wide extractor built from settings."""
+    global _expense_extractor
+    if _expense_extractor is None:
+        _expense_extractor = ExpenseExtractor(
+            llm=get_gemini_extractor(),
+            min_confidence=settings.EXTRACTION_LOCAL_MIN_CONFIDENCE,
+        )
+    return _expense_extractor
+
+
+async def shutdown_expense_extractor() -> None:
+    """Drop the extractor and close the LLM connection pool."""
+    global _expense_extractor
+    _expense_extractor = None
+    await shutdown_gemini_extractor()
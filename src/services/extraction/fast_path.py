@@ -0,0 +1,189 @@
+"""Deterministic expense extraction for simple utterances (no LLM).
+
+Most voice notes are short and formulaic: "gastei trinta reais no Uber
+hoje", "paguei R$ 12,90 na padaria". They can be parsed with a token scan
+in well under a millisecond. ``FastPathExtractor`` finds the amount (see
+``amounts``), the date (see ``dates``) and the merchant/description, and
+scores how sure it is. Callers send the text to the LLM only when the score is below
+the threshold (see ``ExpenseExtractor``).
+"""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+
+from src.services.extraction.amounts import (
+    CENTS_WORDS,
+    CURRENCY_WORDS,
+    NUMBER_WORDS,
+    AmountMatch,
+    find_digit_amounts,
+    find_word_amounts,
+)
+from src.services.extraction.dates import TOKEN_TABLE, Kind, resolve_date, validate_expense_date
+
+# "R$", numbers with separators, or words (accented letters included)
+TOKEN_RE = re.compile(r"R\$|\d+(?:[.,]\d+)*|[^\W\d_]+", re.IGNORECASE)
+
+SPEND_VERBS = frozenset(
+    {"gastei", "paguei", "comprei", "torrei", "custou", "deu", "saiu", "foi", "gasto", "gastamos"}
+)
+FUTURE_WORDS = frozenset({"vou", "vamos", "irei", "depois"})
+# "hoje", "ontem"...: never part of a description, even when not the resolved date
+DATE_WORDS = frozenset(word for word, entry in TOKEN_TABLE.items() if entry.kind is Kind.DAYS_AGO)
+# Prepositions that introduce the merchant/place ("no Uber", "na padaria")
+PLACE_PREPOSITIONS = frozenset({"no", "na", "nos", "nas", "em", "num", "numa"})
+# Kept inside a description between content words ("conta de luz")
+INNER_CONNECTORS = frozenset({"de", "do", "da", "dos", "das"})
+STOPWORDS = (
+    frozenset(
+        {
+            "eu", "a", "o", "as", "os", "um", "uma", "uns", "umas", "e", "com", "pra", "para",
+            "pro", "por", "pelo", "pela", "que", "me", "mim", "meu", "minha", "agora", "ai",
+            "la", "aqui", "so", "mais", "ja", "valor", "total", "r$", "dia",
+        }
+    )
+    | SPEND_VERBS
+    | PLACE_PREPOSITIONS
+    | INNER_CONNECTORS
+    | CURRENCY_WORDS
+    | CENTS_WORDS
+    | NUMBER_WORDS
+    | DATE_WORDS
+    | FUTURE_WORDS
+)  # fmt: skip
+
+
+@dataclass(frozen=True, slots=True)
+class ExtractedExpense:
+    """An expense read from a transcription, with how sure the reader is (0-1).
+
+    ``error`` is the validation error code (e.g. ``EXPENSE_FUTURE_DATE``) when
+    the expense cannot be saved as read; the caller must ask the user.
+    """
+
+    description: str
+    amount: Decimal
+    date: date
+    confidence: float
+    source: str = "rules"
+    category: str | None = None
+    error: str | None = None
+
+
+def fold(text: str) -> str:
+    """Lowercase and strip accents (``Açaí`` -> ``acai``)."""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def tokenize(text: str) -> tuple[list[str], list[str]]:
+    """Return the original tokens and their folded forms (same indexes)."""
+    words = TOKEN_RE.findall(text)
+    return words, [fold(word) for word in words]
+
+
+class FastPathExtractor:
+    """Rule-based extractor for single, explicitly stated expenses."""
+
+    def extract(self, text: str, today: date) -> ExtractedExpense | None:
+        """Return the expense in ``text``, or None when no amount is found."""
+        words, tokens = tokenize(text)
+        resolved = resolve_date(tokens, today)
+        date_span = range(resolved.start, resolved.end) if resolved else range(0)
+        amounts = _amount_candidates(tokens, date_span)
+        if not amounts:
+            return None
+        amount = _pick_amount(amounts)
+
+        confidence = 1.0
+        if not any(token in SPEND_VERBS for token in tokens):
+            confidence -= 0.1
+        if not amount.has_currency:
+            confidence -= 0.15 if amount.from_words else 0.1
+        elif amount.from_words:
+            confidence -= 0.05
+        if len(amounts) > 1:
+            # Several amounts usually mean several expenses: let the LLM split them
+            confidence -= 0.4
+        if any(token in FUTURE_WORDS for token in tokens) or (resolved and resolved.error):
+            # Expenses cannot be in the future (EXPENSE.FUTURE_DATE): leave it to the caller
+            confidence -= 0.5
+
+        consumed = {i for match in amounts for i in range(match.start, match.end)}
+        consumed.update(date_span)
+        phrases = _description_phrases(words, tokens, consumed)
+        if not phrases:
+            confidence -= 0.4
+            description = ""
+        else:
+            confidence -= min(0.1 * (len(phrases) - 1), 0.3)
+            description = phrases[0]
+
+        expense_date = resolved.value if resolved else today
+        _, error = validate_expense_date(expense_date, today)
+        return ExtractedExpense(
+            description=description,
+            amount=amount.value,
+            date=expense_date,
+            confidence=round(max(confidence, 0.0), 2),
+            error=error,
+        )
+
+
+def _amount_candidates(tokens: list[str], date_span: range) -> list[AmountMatch]:
+    """Amounts outside the date expression ("dia 15" is a date, not an amount)."""
+    matches = find_digit_amounts(tokens) + find_word_amounts(tokens)
+    return sorted(
+        (match for match in matches if match.start not in date_span),
+        key=lambda match: match.start,
+    )
+
+
+def _pick_amount(amounts: list[AmountMatch]) -> AmountMatch:
+    """Prefer an amount marked as money ("R$", "reais"), then the first one."""
+    return next((match for match in amounts if match.has_currency), amounts[0])
+
+
+def _description_phrases(words: list[str], tokens: list[str], consumed: set[int]) -> list[str]:
+    """Content-word phrases not used by the amount, place phrases first.
+
+    A phrase is a run of content words, optionally joined by ``de``/``do``/
+    ``da`` ("conta de luz"). Phrases introduced by ``no``/``na``/``em`` are
+    the merchant or place and rank first.
+    """
+    place: list[str] = []
+    other: list[str] = []
+    i = 0
+    while i < len(tokens):
+        if i in consumed or tokens[i] in STOPWORDS or tokens[i][0].isdigit():
+            i += 1
+            continue
+        start = i
+        end = i + 1
+        while end < len(tokens):
+            if end not in consumed and _is_content(tokens[end]):
+                end += 1
+            elif (
+                tokens[end] in INNER_CONNECTORS
+                and end + 1 < len(tokens)
+                and end + 1 not in consumed
+                and _is_content(tokens[end + 1])
+            ):
+                end += 2
+            else:
+                break
+        phrase = " ".join(words[start:end])
+        phrase = phrase[0].upper() + phrase[1:]
+        is_place = start > 0 and tokens[start - 1] in PLACE_PREPOSITIONS
+        (place if is_place else other).append(phrase)
+        i = end
+    return place + other
+
+
+def _is_content(token: str) -> bool:
+    return token not in STOPWORDS and not token[0].isdigit()
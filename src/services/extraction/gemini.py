@@ -0,0 +1,368 @@
+"""Gemini Flash expense extraction (slow path of ``ExpenseExtractor``).
+
+Calls the Generative Language REST API through one shared ``httpx``
+connection pool. Each request asks for strict JSON output
+(``responseMimeType`` plus ``responseSchema``), and the reply is validated
+with pydantic before use.
+
+Each call has a token budget. The prompt is estimated at ~4 characters per
+token and the transcription is truncated to fit ``max_input_tokens``. The
+output is capped with ``maxOutputTokens``.
+
+Results are cached by normalized phrase plus the user's category-set hash
+(``extraction_cache``). Concurrent requests for the same key share one call,
+so a repeated phrase never reaches the API twice. The date is resolved
+locally (``dates``) on every use, which keeps cached answers valid on later
+days.
+
+``GEMINI_BASE_URL`` can point at ``stub_server`` to run the pipeline offline.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import random
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Any
+
+import httpx
+from pydantic import BaseModel, Field, ValidationError, field_validator
+from sqlalchemy.exc import SQLAlchemyError
+
+from src.core.config import settings
+from src.db.session import get_async_session
+from src.services.extraction.cache import ExtractionKey, extraction_cache, extraction_key
+from src.services.extraction.dates import resolve_date, validate_expense_date
+from src.services.extraction.fast_path import ExtractedExpense, tokenize
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS_CODES = frozenset({408, 429})
+CHARS_PER_TOKEN = 4
+
+RESPONSE_SCHEMA: dict[str, Any] = {
+    "type": "OBJECT",
+    "properties": {
+        "detected": {"type": "BOOLEAN"},
+        "description": {"type": "STRING"},
+        "amount": {"type": "NUMBER"},
+        "date": {"type": "STRING", "description": "YYYY-MM-DD"},
+        "category": {"type": "STRING", "nullable": True},
+        "confidence": {"type": "NUMBER"},
+    },
+    "required": ["detected", "description", "amount", "date", "confidence"],
+}
+
+PROMPT_TEMPLATE = """Extraia a despesa do texto abaixo e responda apenas com o JSON do schema.
+Data atual: {today}. Valores em R$ (BRL). Datas futuras são inválidas.
+Categorias do usuário: {categories}. Use uma delas em "category" ou null.
+Se o texto não contém despesa, responda "detected": false.
+
+Texto: "{text}"
+"""
+
+
+class ExtractionError(Exception):
+    """Erro de alto nível ao extrair despesa via Gemini."""
+
+
+class GeminiExpense(BaseModel):
+    """JSON returned by the model (``RESPONSE_SCHEMA``)."""
+
+    detected: bool
+    description: str = ""
+    amount: Decimal = Decimal(0)
+    expense_date: date | None = Field(default=None, alias="date")
+    category: str | None = None
+    confidence: float = Field(default=0.0, ge=0.0, le=1.0)
+
+    @field_validator("expense_date", mode="before")
+    @classmethod
+    def _empty_date_is_none(cls, value: object) -> object:
+        # "required" in the schema makes the model send "" when there is no date
+        return value or None
+
+
+class CachedExtraction(BaseModel):
+    """What is cached: the model's answer with its date stored as days before the call.
+
+    ``days_ago`` is only used when the text has no date expression that
+    ``resolve_date`` understands.
+    """
+
+    detected: bool
+    description: str = ""
+    amount: Decimal = Decimal(0)
+    days_ago: int | None = None
+    category: str | None = None
+    confidence: float = 0.0
+
+
+@dataclass(frozen=True, slots=True)
+class GeminiStats:
+    """API usage counters (cache hits are in ``extraction_cache.stats()``)."""
+
+    api_calls: int
+    coalesced: int
+    failures: int
+    truncated: int
+    prompt_tokens: int
+    output_tokens: int
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token), rounded up."""
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def build_prompt(
+    text: str, today: date, categories: Sequence[str], max_tokens: int
+) -> tuple[str, bool]:
+    """Render the prompt, truncating ``text`` so the prompt fits ``max_tokens``.
+
+    Returns:
+        (prompt, True if ``text`` was truncated).
+
+    Raises:
+        ExtractionError: The prompt does not fit even with an empty text.
+    """
+    category_list = ", ".join(categories) or "nenhuma"
+    overhead = PROMPT_TEMPLATE.format(today=today.isoformat(), categories=category_list, text="")
+    budget_chars = (max_tokens - estimate_tokens(overhead)) * CHARS_PER_TOKEN
+    if budget_chars <= 0:
+        raise ExtractionError("Prompt de extração excede o orçamento de tokens.")
+    text = text.strip().replace('"', "'")
+    prompt = PROMPT_TEMPLATE.format(
+        today=today.isoformat(), categories=category_list, text=text[:budget_chars]
+    )
+    return prompt, len(text) > budget_chars
+
+
+class GeminiExtractor:
+    """``LLMExtractor`` backed by Gemini, with a shared pool and a response cache."""
+
+    def __init__(
+        self,
+        api_key: str,
+        model: str = "gemini-1.5-flash",
+        base_url: str = "https://generativelanguage.googleapis.com",
+        timeout: float = 30.0,
+        max_attempts: int = 3,
+        max_connections: int = 10,
+        max_input_tokens: int = 2048,
+        max_output_tokens: int = 256,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        self.model = model
+        self.max_attempts = max_attempts
+        self.max_input_tokens = max_input_tokens
+        self.max_output_tokens = max_output_tokens
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            headers={"x-goog-api-key": api_key},
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections, max_keepalive_connections=max_connections
+            ),
+            transport=transport,
+        )
+        self._pending: dict[ExtractionKey, asyncio.Future[str]] = {}
+        self._api_calls = 0
+        self._coalesced = 0
+        self._failures = 0
+        self._truncated = 0
+        self._prompt_tokens = 0
+        self._output_tokens = 0
+
+    async def extract(
+        self, text: str, today: date, categories: Sequence[str] = ()
+    ) -> ExtractedExpense | None:
+        """Return the expense in ``text`` (None if the model found none).
+
+        Raises:
+            ExtractionError: API/validation failure after retries.
+        """
+        key = extraction_key(text, categories, self.model)
+        # Single flight: concurrent requests for a key share one lookup/API call.
+        # The key leaves _pending only after the result is in the memory tier.
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = asyncio.ensure_future(self._lookup_or_call(key, text, today, categories))
+            self._pending[key] = pending
+            pending.add_done_callback(lambda _: self._pending.pop(key, None))
+        else:
+            self._coalesced += 1
+        result = await asyncio.shield(pending)
+        return _to_expense(CachedExtraction.model_validate_json(result), text, today)
+
+    def stats(self) -> GeminiStats:
+        """Return API call and token counters."""
+        return GeminiStats(
+            api_calls=self._api_calls,
+            coalesced=self._coalesced,
+            failures=self._failures,
+            truncated=self._truncated,
+            prompt_tokens=self._prompt_tokens,
+            output_tokens=self._output_tokens,
+        )
+
+    async def aclose(self) -> None:
+        """Close the connection pool."""
+        await self._client.aclose()
+
+    async def _cached(self, key: ExtractionKey) -> str | None:
+        """Cache lookup; a database failure only costs an API call."""
+        try:
+            async with get_async_session() as session:
+                return await extraction_cache.get(session, key)
+        except SQLAlchemyError:
+            logger.exception("Erro ao consultar cache de extração")
+            return None
+
+    async def _lookup_or_call(
+        self, key: ExtractionKey, text: str, today: date, categories: Sequence[str]
+    ) -> str:
+        cached = await self._cached(key)
+        if cached is not None:
+            return cached
+        answer = await self._generate(text, today, categories)
+        cached = CachedExtraction(
+            detected=answer.detected,
+            description=answer.description.strip(),
+            amount=answer.amount,
+            days_ago=(today - answer.expense_date).days if answer.expense_date else None,
+            category=answer.category,
+            confidence=answer.confidence,
+        ).model_dump_json()
+        try:
+            async with get_async_session() as session:
+                await extraction_cache.put(session, key, cached)
+                await session.commit()
+        except SQLAlchemyError:
+            logger.exception("Erro ao salvar cache de extração")
+        return cached
+
+    async def _generate(self, text: str, today: date, categories: Sequence[str]) -> GeminiExpense:
+        prompt, truncated = build_prompt(text, today, categories, self.max_input_tokens)
+        if truncated:
+            self._truncated += 1
+            logger.warning("Transcrição truncada para caber em %s tokens", self.max_input_tokens)
+        body = {
+            "contents": [{"role": "user", "parts": [{"text": prompt}]}],
+            "generationConfig": {
+                "responseMimeType": "application/json",
+                "responseSchema": RESPONSE_SCHEMA,
+                "maxOutputTokens": self.max_output_tokens,
+                "temperature": 0,
+            },
+        }
+        data = await self._post(f"/v1beta/models/{self.model}:generateContent", body)
+        usage = data.get("usageMetadata", {})
+        self._prompt_tokens += int(usage.get("promptTokenCount", 0))
+        self._output_tokens += int(usage.get("candidatesTokenCount", 0))
+        try:
+            candidate = data["candidates"][0]
+            truncated_output = candidate.get("finishReason") == "MAX_TOKENS"
+            if not truncated_output:
+                return GeminiExpense.model_validate_json(candidate["content"]["parts"][0]["text"])
+        except (KeyError, IndexError, TypeError, ValidationError) as exc:
+            self._failures += 1
+            raise ExtractionError("Resposta inválida do Gemini.") from exc
+        self._failures += 1
+        raise ExtractionError("Resposta do Gemini excedeu maxOutputTokens.")
+
+    async def _post(self, path: str, body: dict[str, Any]) -> dict[str, Any]:
+        """POST with jittered exponential retry on timeouts, 408/429 and 5xx."""
+        attempt = 1
+        while True:
+            self._api_calls += 1
+            try:
+                response = await self._client.post(path, json=body)
+            except httpx.TransportError as exc:
+                error: Exception = exc
+                retryable = True
+            else:
+                if response.is_success:
+                    try:
+                        data: dict[str, Any] = response.json()
+                    except json.JSONDecodeError as exc:
+                        self._failures += 1
+                        raise ExtractionError("Resposta inválida do Gemini.") from exc
+                    return data
+                error = httpx.HTTPStatusError(
+                    f"Gemini respondeu {response.status_code}",
+                    request=response.request,
+                    response=response,
+                )
+                retryable = (
+                    response.status_code in RETRYABLE_STATUS_CODES or response.status_code >= 500
+                )
+            if not retryable or attempt == self.max_attempts:
+                self._failures += 1
+                raise ExtractionError("Falha ao extrair despesa via Gemini.") from error
+            delay = random.uniform(0, 0.5 * 2 ** (attempt - 1))
+            logger.warning(
+                "Gemini call failed (%s); retry %s/%s in %.2fs",
+                error,
+                attempt,
+                self.max_attempts - 1,
+                delay,
+            )
+            await asyncio.sleep(delay)
+            attempt += 1
+
+
+def _to_expense(cached: CachedExtraction, text: str, today: date) -> ExtractedExpense | None:
+    if not cached.detected:
+        return None
+    resolved = resolve_date(tokenize(text)[1], today)
+    if resolved is not None:
+        expense_date = resolved.value
+    else:
+        expense_date = today - timedelta(days=cached.days_ago or 0)
+    valid, error = validate_expense_date(expense_date, today)
+    return ExtractedExpense(
+        description=cached.description,
+        amount=cached.amount.quantize(Decimal("0.01")),
+        date=expense_date,
+        # A future date is never confirmed automatically (EXPENSE.FUTURE_DATE)
+        confidence=cached.confidence if valid else min(cached.confidence, 0.5),
+        source="llm",
+        category=cached.category,
+        error=error,
+    )
+
+
+_gemini_extractor: GeminiExtractor | None = None
+
+
+def get_gemini_extractor() -> GeminiExtractor | None:
+    """Return the process-wide Gemini extractor, or None without ``GOOGLE_API_KEY``."""
+    global _gemini_extractor
+    if not settings.GOOGLE_API_KEY:
+        return None
+    if _gemini_extractor is None:
+        _gemini_extractor = GeminiExtractor(
+            api_key=settings.GOOGLE_API_KEY,
+            model=settings.GEMINI_MODEL,
+            base_url=settings.GEMINI_BASE_URL,
+            timeout=settings.GEMINI_TIMEOUT_SECONDS,
+            max_attempts=settings.GEMINI_MAX_ATTEMPTS,
+            max_connections=settings.GEMINI_MAX_CONNECTIONS,
+            max_input_tokens=settings.GEMINI_MAX_INPUT_TOKENS,
+            max_output_tokens=settings.GEMINI_MAX_OUTPUT_TOKENS,
+        )
+    return _gemini_extractor
+
+
+async def shutdown_gemini_extractor() -> None:
+    """Close the shared connection pool, if it was created."""
+    global _gemini_extractor
+    if _gemini_extractor is not None:
+        await _gemini_extractor.aclose()
+        _gemini_extractor = None
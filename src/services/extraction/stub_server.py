@@ -0,0 +1,169 @@
+"""Local stand-in for the Gemini ``generateContent`` endpoint (offline load tests).
+
+Answers the extraction prompt built by ``gemini.build_prompt`` with the
+rule-based ``FastPathExtractor``, wrapped in the same response envelope
+Gemini uses (candidates, ``usageMetadata``). An optional fixed latency
+mimics the real API. Run it and point the bot at it::
+
+    python -m src.services.extraction.stub_server --port 8089 --latency 0.4
+    GEMINI_BASE_URL=http://127.0.0.1:8089 GOOGLE_API_KEY=stub ...
+
+Tests start it in-process with ``StubGeminiServer`` (port 0 picks a free port).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import threading
+import time
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+from src.services.extraction.fast_path import FastPathExtractor, fold
+from src.services.extraction.gemini import estimate_tokens
+
+PATH_RE = re.compile(r"^/v1beta/models/[^/:]+:generateContent$")
+TODAY_RE = re.compile(r"Data atual: (\d{4}-\d{2}-\d{2})")
+CATEGORIES_RE = re.compile(r"Categorias do usuário: (.*?)\. Use")
+TEXT_RE = re.compile(r'Texto: "(.*)"', re.DOTALL)
+
+
+def answer_prompt(prompt: str) -> dict[str, Any]:
+    """Return the JSON object the model would answer for an extraction prompt."""
+    today_match = TODAY_RE.search(prompt)
+    text_match = TEXT_RE.search(prompt)
+    categories_match = CATEGORIES_RE.search(prompt)
+    today = date.fromisoformat(today_match.group(1)) if today_match else date.today()
+    text = text_match.group(1) if text_match else ""
+    categories = categories_match.group(1).split(", ") if categories_match else []
+
+    expense = FastPathExtractor().extract(text, today)
+    if expense is None:
+        return {"detected": False, "description": "", "amount": 0, "date": "", "confidence": 1}
+    folded = fold(text)
+    category = next((name for name in categories if fold(name) in folded), None)
+    return {
+        "detected": True,
+        "description": expense.description,
+        "amount": float(expense.amount),
+        "date": expense.date.isoformat(),
+        "category": category,
+        "confidence": expense.confidence,
+    }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+    server: _StubHTTPServer
+
+    def do_POST(self) -> None:  # noqa: N802 - BaseHTTPRequestHandler API
+        if not PATH_RE.match(self.path):
+            self._send(404, {"error": {"code": 404, "message": "Not found"}})
+            return
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        prompt = body["contents"][0]["parts"][0]["text"]
+        answer = json.dumps(answer_prompt(prompt), ensure_ascii=False)
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        with self.server.lock:
+            self.server.requests += 1
+        self._send(
+            200,
+            {
+                "candidates": [
+                    {
+                        "content": {"role": "model", "parts": [{"text": answer}]},
+                        "finishReason": "STOP",
+                    }
+                ],
+                "usageMetadata": {
+                    "promptTokenCount": estimate_tokens(prompt),
+                    "candidatesTokenCount": estimate_tokens(answer),
+                },
+            },
+        )
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        pass  # one line per request would drown load-test output
+
+    def _send(self, status: int, payload: dict[str, Any]) -> None:
+        data = json.dumps(payload, ensure_ascii=False).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=UTF-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class _StubHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], latency: float) -> None:
+        super().__init__(address, _Handler)
+        self.latency = latency
+        self.requests = 0
+        self.lock = threading.Lock()
+
+
+class StubGeminiServer:
+    """In-process stub server on a background thread."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0) -> None:
+        self._server = _StubHTTPServer((host, port), latency)
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        """URL to use as ``GEMINI_BASE_URL``."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host!s}:{port}"
+
+    @property
+    def requests(self) -> int:
+        """Requests answered so far."""
+        return self._server.requests
+
+    def start(self) -> StubGeminiServer:
+        """Serve on a daemon thread."""
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="stub-gemini", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and close the socket."""
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> StubGeminiServer:
+        return self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+
+def main() -> None:
+    """Run the stub server in the foreground."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0] if __doc__ else None)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds per request")
+    args = parser.parse_args()
+    server = _StubHTTPServer((args.host, args.port), args.latency)
+    print(f"Stub Gemini on http://{args.host}:{args.port} (latency {args.latency}s)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1 +1,28 @@
-"""Learning service module."""
+"""Learning service module.
+
+Categorias aprendidas a partir das confirmações do usuário (FEAT-004):
+padrões por descrição normalizada, consultados em memória, com busca
+aproximada por trigramas para variações de grafia e um classificador
+Naive Bayes por usuário antes de recorrer ao Gemini.
+"""
+
+from src.db.normalization import normalize_description
+from src.services.learning.classifier import NaiveBayesClassifier
+from src.services.learning.fuzzy import TrigramIndex, similarity
+from src.services.learning.patterns import (
+    CategoryPatternIndex,
+    PatternIndexStats,
+    PatternSuggestion,
+    category_pattern_index,
+)
+
+__all__ = [
+    "normalize_description",
+    "TrigramIndex",
+    "NaiveBayesClassifier",
+    "similarity",
+    "CategoryPatternIndex",
+    "PatternIndexStats",
+    "PatternSuggestion",
+    "category_pattern_index",
+]
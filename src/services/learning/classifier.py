@@ -0,0 +1,114 @@
+"""Per-user multinomial Naive Bayes over hashed bag-of-words descriptions.
+
+Descriptions whose words the user has already confirmed in other
+combinations ("uber aeroporto" after "uber" and "uber centro") are
+categorized locally instead of asking Gemini.
+
+The model holds only the sufficient statistics: per-category word counts
+(``N_FEATURES`` hashed buckets, float32), per-category document counts and
+totals. Training is therefore incremental. Each confirmation adds one
+document, and ``learn`` with a weight replays ``category_patterns`` rows
+when a user's index is warmed. Those rows are the persisted form of the
+model, so no extra table or query is needed.
+"""
+
+from __future__ import annotations
+
+import re
+import zlib
+
+import numpy as np
+import numpy.typing as npt
+
+N_FEATURES = 1024  # 4 KiB per category and user
+_WORD_RE = re.compile(r"[^\W_]+")
+
+
+def hashed_features(description: str, n_features: int = N_FEATURES) -> list[int]:
+    """Bucket of each word of ``description`` (stable across processes)."""
+    return [zlib.crc32(word.encode()) % n_features for word in _WORD_RE.findall(description)]
+
+
+class NaiveBayesClassifier:
+    """Multinomial Naive Bayes with Laplace/Lidstone smoothing ``alpha``."""
+
+    __slots__ = (
+        "n_features",
+        "alpha",
+        "category_ids",
+        "_feature_counts",
+        "_totals",
+        "_documents",
+    )
+
+    def __init__(self, n_features: int = N_FEATURES, alpha: float = 0.1) -> None:
+        self.n_features = n_features
+        self.alpha = alpha
+        self.category_ids: list[int] = []
+        self._feature_counts: npt.NDArray[np.float32] = np.zeros((0, n_features), np.float32)
+        self._totals: npt.NDArray[np.float64] = np.zeros(0)
+        self._documents: npt.NDArray[np.float64] = np.zeros(0)
+
+    @property
+    def documents(self) -> int:
+        """Number of confirmations the model was trained on."""
+        return int(self._documents.sum())
+
+    def category_documents(self, category_id: int) -> int:
+        """Number of confirmations learned for ``category_id``."""
+        if category_id not in self.category_ids:
+            return 0
+        return int(self._documents[self.category_ids.index(category_id)])
+
+    def learn(self, description: str, category_id: int, weight: int = 1) -> None:
+        """Count ``weight`` confirmations of ``category_id`` for ``description``."""
+        features = hashed_features(description, self.n_features)
+        if not features:
+            return
+        if category_id in self.category_ids:
+            row = self.category_ids.index(category_id)
+        else:
+            row = len(self.category_ids)
+            self.category_ids.append(category_id)
+            self._feature_counts = np.vstack(
+                [self._feature_counts, np.zeros((1, self.n_features), np.float32)]
+            )
+            self._totals = np.append(self._totals, 0.0)
+            self._documents = np.append(self._documents, 0.0)
+        np.add.at(self._feature_counts[row], features, weight)
+        self._totals[row] += weight * len(features)
+        self._documents[row] += weight
+
+    def forget(self, category_id: int) -> None:
+        """Drop everything learned for a (deleted) category."""
+        if category_id not in self.category_ids:
+            return
+        row = self.category_ids.index(category_id)
+        del self.category_ids[row]
+        self._feature_counts = np.delete(self._feature_counts, row, axis=0)
+        self._totals = np.delete(self._totals, row)
+        self._documents = np.delete(self._documents, row)
+
+    def predict(self, description: str) -> tuple[int, float] | None:
+        """Return ``(category_id, posterior probability)`` of the likeliest category.
+
+        None without categories or when no word of ``description`` was seen
+        in training (the prior alone says nothing about the description).
+        """
+        features = hashed_features(description, self.n_features)
+        if not self.category_ids or not features:
+            return None
+        counts = self._feature_counts[:, features]  # (categories, words)
+        known = counts.sum(axis=0) > 0
+        if not known.any():
+            return None
+        counts = counts[:, known]
+        scores = (
+            np.log(self._documents / self._documents.sum())
+            + np.log(counts + self.alpha).sum(axis=1)
+            - counts.shape[1] * np.log(self._totals + self.alpha * self.n_features)
+        )
+        posterior = np.exp(scores - scores.max())
+        posterior /= posterior.sum()
+        best = int(posterior.argmax())
+        return self.category_ids[best], float(posterior[best])
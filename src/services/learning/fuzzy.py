@@ -0,0 +1,88 @@
+"""Character-trigram index for near-miss descriptions ("ubereats", "spotfy").
+
+Trigrams and similarity follow ``pg_trgm``. Each word is padded with two
+spaces in front and one behind. Similarity is ``shared / (|a| + |b| - shared)``.
+So ``similarity("spotfy", "spotify")`` is 0.5 here, as it is in Postgres.
+
+``TrigramIndex`` keeps an inverted index (trigram -> description ids).
+``search`` only scores descriptions that share a trigram with the query and
+are long enough to reach the threshold. A lookup therefore grows with the
+posting lists it touches, not with the number of descriptions.
+"""
+
+from __future__ import annotations
+
+import re
+from collections import defaultdict
+
+_WORD_RE = re.compile(r"[^\W_]+")
+
+
+def trigrams(text: str) -> frozenset[str]:
+    """``pg_trgm`` trigrams of ``text`` (expects normalized, lowercase text)."""
+    grams: set[str] = set()
+    for word in _WORD_RE.findall(text):
+        padded = f"  {word} "
+        grams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return frozenset(grams)
+
+
+def similarity(a: str, b: str) -> float:
+    """``pg_trgm`` similarity of two strings (0.0 - 1.0)."""
+    grams_a, grams_b = trigrams(a), trigrams(b)
+    if not grams_a or not grams_b:
+        return 0.0
+    shared = len(grams_a & grams_b)
+    return shared / (len(grams_a) + len(grams_b) - shared)
+
+
+class TrigramIndex:
+    """Inverted trigram index over a growing set of descriptions."""
+
+    __slots__ = ("_ids", "_descriptions", "_sizes", "_postings")
+
+    def __init__(self) -> None:
+        self._ids: dict[str, int] = {}
+        self._descriptions: list[str] = []
+        self._sizes: list[int] = []
+        self._postings: defaultdict[str, list[int]] = defaultdict(list)
+
+    def __len__(self) -> int:
+        return len(self._descriptions)
+
+    def add(self, description: str) -> None:
+        """Index ``description`` (no-op if already indexed or without trigrams)."""
+        if description in self._ids:
+            return
+        grams = trigrams(description)
+        if not grams:
+            return
+        doc_id = len(self._descriptions)
+        self._ids[description] = doc_id
+        self._descriptions.append(description)
+        self._sizes.append(len(grams))
+        for gram in grams:
+            self._postings[gram].append(doc_id)
+
+    def search(self, query: str, threshold: float) -> list[tuple[float, str]]:
+        """Return ``(similarity, description)`` pairs >= ``threshold``, best first."""
+        grams = trigrams(query)
+        if not grams or threshold <= 0:
+            return []
+        shared: dict[int, int] = defaultdict(int)
+        for gram in grams:
+            for doc_id in self._postings.get(gram, ()):
+                shared[doc_id] += 1
+        size = len(grams)
+        # similarity >= t needs t*|q| <= |d| <= |q|/t and shared >= t*(|q|+|d|)/(1+t)
+        min_size, max_size = threshold * size, size / threshold
+        matches = []
+        for doc_id, count in shared.items():
+            doc_size = self._sizes[doc_id]
+            if not min_size <= doc_size <= max_size:
+                continue
+            score = count / (size + doc_size - count)
+            if score >= threshold:
+                matches.append((score, self._descriptions[doc_id]))
+        matches.sort(key=lambda match: (-match[0], match[1]))
+        return matches
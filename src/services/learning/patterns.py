@@ -0,0 +1,455 @@
+"""Per-user in-memory index of learned category patterns (FEAT-004, RULE-003).
+
+Each voice note asks "has this user confirmed a category for this
+description at least 3 times?". If yes, the learned category is used and
+Gemini is skipped. ``CategoryPatternIndex`` answers that with a dict lookup:
+
+- a user's patterns are loaded from ``category_patterns`` with one query on
+  first use (lazy warm), then served from memory;
+- ``record_confirmation`` updates the loaded index in place, so it never
+  has to be reloaded, and buffers the counter increment (write-behind);
+- buffered increments are written as one multi-row upsert every
+  ``LEARNING_FLUSH_INTERVAL_SECONDS`` (the loss window on a crash), when
+  ``LEARNING_FLUSH_MAX_PENDING`` rows are pending, and on shutdown. A user
+  warmed before the flush has the pending increments added to the loaded
+  counts, so the 3-confirmation rule (RULE-003) sees every confirmation
+  right away;
+- indexes are evicted LRU across users (``LEARNING_INDEX_MAX_USERS``), and
+  an evicted user is warmed again on the next lookup;
+- a description never seen before falls back to the most similar confirmed
+  one (``LEARNING_FUZZY_THRESHOLD``, see ``fuzzy.TrigramIndex``), so typos
+  and spacing variants ("spotfy", "ubereats") are still categorized locally;
+- otherwise a per-user Naive Bayes over the confirmed descriptions
+  (``classifier.NaiveBayesClassifier``) answers when its posterior reaches
+  ``LEARNING_CLASSIFIER_MIN_PROBABILITY``. Only then does Gemini decide.
+
+Confirmations also come from background audio jobs, which run outside
+``UserOrderedUpdateProcessor``, so a user's warm, confirmations and flushes
+can interleave. The flush lock keeps them consistent. A warm reads the table
+and the pending increments while holding it, and a flush moves a batch from
+the buffer to the table under it. ``record_confirmation`` buffers an increment
+and applies it to a loaded index without awaiting in between. So every
+confirmation is counted once: either in the warm or in the loaded index.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any, Literal
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlmodel import col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.core.config import settings
+from src.db.dialect import dialect_insert
+from src.db.normalization import normalize_description
+from src.db.session import get_async_session
+from src.models import Category, CategoryPattern
+from src.services.learning.classifier import NaiveBayesClassifier
+from src.services.learning.fuzzy import TrigramIndex
+
+logger = logging.getLogger(__name__)
+
+# Rows per INSERT statement of a flush (6 bound parameters per row)
+FLUSH_CHUNK_ROWS = 1000
+
+# (user_id, description_normalized, category_id) -> (increments, last_used_at)
+PendingIncrements = dict[tuple[int, str, int], tuple[int, datetime]]
+
+
+@dataclass(frozen=True, slots=True)
+class PatternSuggestion:
+    """The learned category for a description and how it was found.
+
+    ``score`` is 1.0 for an exact match, the trigram similarity for a
+    near-miss match and the posterior probability for the classifier.
+    ``confirmation_count`` is the confirmations of the matched description,
+    or of the category overall for the classifier.
+    """
+
+    category_id: int
+    confirmation_count: int
+    score: float = 1.0
+    source: Literal["exact", "fuzzy", "classifier"] = "exact"
+
+
+@dataclass(frozen=True, slots=True)
+class PatternIndexStats:
+    """Counters exposed for monitoring the pattern index."""
+
+    users: int
+    lookups: int
+    hits: int
+    fuzzy_hits: int
+    classifier_hits: int
+    llm_comparisons: int
+    llm_agreements: int
+    warms: int
+    evictions: int
+    confirmations: int
+    pending: int
+    flushes: int
+    flushed_rows: int
+
+    @property
+    def hit_ratio(self) -> float:
+        """Lookups answered with a suggestion (0.0 when there were none)."""
+        return self.hits / self.lookups if self.lookups else 0.0
+
+    @property
+    def classifier_coverage(self) -> float:
+        """Lookups answered by the classifier (0.0 when there were none)."""
+        return self.classifier_hits / self.lookups if self.lookups else 0.0
+
+    @property
+    def classifier_accuracy(self) -> float:
+        """Classifier predictions that matched Gemini's category (0.0 when none)."""
+        return self.llm_agreements / self.llm_comparisons if self.llm_comparisons else 0.0
+
+    @property
+    def rows_per_confirmation(self) -> float:
+        """Rows upserted per recorded confirmation (1.0 would be write-through)."""
+        return self.flushed_rows / self.confirmations if self.confirmations else 0.0
+
+
+class UserPatterns:
+    """One user's patterns: counts per category and the current best per description."""
+
+    __slots__ = ("counts", "best", "trigrams", "classifier")
+
+    def __init__(self, classifier: NaiveBayesClassifier | None = None) -> None:
+        self.counts: dict[str, dict[int, int]] = {}
+        self.best: dict[str, PatternSuggestion] = {}
+        self.trigrams = TrigramIndex()
+        self.classifier = classifier
+
+    def add(self, description: str, category_id: int, confirmations: int = 1) -> None:
+        """Add ``confirmations`` to (description, category) and refresh the best one."""
+        per_category = self.counts.get(description)
+        if per_category is None:
+            per_category = self.counts[description] = {}
+            self.trigrams.add(description)
+        if self.classifier is not None:
+            self.classifier.learn(description, category_id, confirmations)
+        count = per_category.get(category_id, 0) + confirmations
+        per_category[category_id] = count
+        best = self.best.get(description)
+        if best is None or best.category_id == category_id or count > best.confirmation_count:
+            self.best[description] = PatternSuggestion(category_id, count)
+
+    def remove_category(self, category_id: int) -> None:
+        """Forget a (deleted) category and re-elect the best for affected descriptions."""
+        if self.classifier is not None:
+            self.classifier.forget(category_id)
+        for description, per_category in list(self.counts.items()):
+            if per_category.pop(category_id, None) is None:
+                continue
+            if not per_category:
+                del self.counts[description]
+                del self.best[description]
+                continue
+            best_id = max(per_category, key=per_category.__getitem__)
+            self.best[description] = PatternSuggestion(best_id, per_category[best_id])
+
+    def nearest(
+        self, description: str, threshold: float, min_confirmations: int
+    ) -> PatternSuggestion | None:
+        """Best suggestion of the most similar description confirmed often enough."""
+        for score, match in self.trigrams.search(description, threshold):
+            best = self.best.get(match)  # None once its categories were all deleted
+            if best is not None and best.confirmation_count >= min_confirmations:
+                return PatternSuggestion(best.category_id, best.confirmation_count, score, "fuzzy")
+        return None
+
+    def classify(self, description: str, min_documents: int) -> PatternSuggestion | None:
+        """Classifier prediction once it was trained on ``min_documents`` confirmations."""
+        classifier = self.classifier
+        if classifier is None or classifier.documents < min_documents:
+            return None
+        prediction = classifier.predict(description)
+        if prediction is None:
+            return None
+        category_id, probability = prediction
+        confirmations = classifier.category_documents(category_id)
+        return PatternSuggestion(category_id, confirmations, probability, "classifier")
+
+
+class CategoryPatternIndex:
+    """LRU of per-user pattern indexes in front of ``category_patterns``."""
+
+    def __init__(
+        self,
+        max_users: int = 1024,
+        min_confirmations: int = 3,
+        fuzzy_threshold: float = 0.5,
+        classifier_enabled: bool = True,
+        classifier_min_probability: float = 0.9,
+        classifier_min_documents: int = 20,
+        flush_interval: float = 5.0,
+        flush_max_pending: int = 500,
+    ) -> None:
+        self.max_users = max_users
+        self.min_confirmations = min_confirmations
+        self.fuzzy_threshold = fuzzy_threshold
+        self.classifier_enabled = classifier_enabled
+        self.classifier_min_probability = classifier_min_probability
+        self.classifier_min_documents = classifier_min_documents
+        self.flush_interval = flush_interval
+        self.flush_max_pending = flush_max_pending
+        self._users: OrderedDict[int, UserPatterns] = OrderedDict()
+        self._pending: PendingIncrements = {}
+        self._flush_lock = asyncio.Lock()
+        self._flusher: asyncio.Task[None] | None = None
+        self._lookups = 0
+        self._hits = 0
+        self._fuzzy_hits = 0
+        self._classifier_hits = 0
+        self._llm_comparisons = 0
+        self._llm_agreements = 0
+        self._warms = 0
+        self._evictions = 0
+        self._confirmations = 0
+        self._flushes = 0
+        self._flushed_rows = 0
+
+    async def suggest(
+        self, session: AsyncSession, user_id: int, description: str
+    ) -> PatternSuggestion | None:
+        """Return the learned category if confirmed ``min_confirmations``+ times (RULE-003).
+
+        A description the user never confirmed is matched against the most
+        similar confirmed one. Failing that, the classifier answers if it is
+        confident enough. Queries the database only when the user's index is
+        not in memory.
+        """
+        patterns = await self._patterns(session, user_id)
+        self._lookups += 1
+        normalized = normalize_description(description)
+        best = patterns.best.get(normalized)
+        if best is None:
+            best = patterns.nearest(normalized, self.fuzzy_threshold, self.min_confirmations)
+            if best is not None:
+                self._fuzzy_hits += 1
+        if best is not None and best.confirmation_count >= self.min_confirmations:
+            self._hits += 1
+            return best
+
+        predicted = patterns.classify(normalized, self.classifier_min_documents)
+        if predicted is None or predicted.score < self.classifier_min_probability:
+            return None
+        self._hits += 1
+        self._classifier_hits += 1
+        return predicted
+
+    async def compare_with_llm(
+        self, session: AsyncSession, user_id: int, description: str, category_id: int
+    ) -> bool | None:
+        """Score the classifier against the category Gemini chose for ``description``.
+
+        Call it whenever Gemini categorized an expense; the result feeds
+        ``classifier_accuracy``. The classifier's top category counts even
+        below the confidence threshold. Returns None when it had no prediction.
+        """
+        patterns = await self._patterns(session, user_id)
+        predicted = patterns.classify(normalize_description(description), 1)
+        if predicted is None:
+            return None
+        self._llm_comparisons += 1
+        agreed = predicted.category_id == category_id
+        self._llm_agreements += agreed
+        return agreed
+
+    async def record_confirmation(
+        self,
+        user_id: int,
+        description: str,
+        category_id: int,
+        now: datetime | None = None,
+    ) -> None:
+        """Count one confirmation of ``category_id`` for ``description``.
+
+        Call it after the confirmed expense is committed. The increment is
+        buffered and written by the next ``flush``. A user whose index is
+        loaded sees the new count right away.
+        """
+        normalized = normalize_description(description)
+        if not normalized:
+            return
+        key = (user_id, normalized, category_id)
+        count, _ = self._pending.get(key, (0, None))
+        self._pending[key] = (count + 1, now or datetime.now(UTC))
+        self._confirmations += 1
+        patterns = self._users.get(user_id)
+        if patterns is not None:
+            patterns.add(normalized, category_id)
+        if len(self._pending) >= self.flush_max_pending:
+            await self.flush()
+
+    async def flush(self) -> int:
+        """Write buffered increments as multi-row upserts; return the rows written.
+
+        On a database error the increments go back to the buffer and the next
+        flush retries them.
+        """
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+            batch, self._pending = self._pending, {}
+            rows = [
+                {
+                    "user_id": user_id,
+                    "description_normalized": description,
+                    "category_id": category_id,
+                    "confirmation_count": count,
+                    "last_used_at": last_used_at,
+                    "created_at": last_used_at,
+                }
+                for (user_id, description, category_id), (count, last_used_at) in batch.items()
+            ]
+            try:
+                async with get_async_session() as session:
+                    for start in range(0, len(rows), FLUSH_CHUNK_ROWS):
+                        await session.exec(_upsert(session, rows[start : start + FLUSH_CHUNK_ROWS]))
+                    await session.commit()
+            except SQLAlchemyError:
+                logger.exception("Pattern flush failed; %d rows kept for the next flush", len(rows))
+                for key, (count, last_used_at) in batch.items():
+                    newer_count, newer_used_at = self._pending.get(key, (0, last_used_at))
+                    self._pending[key] = (count + newer_count, max(last_used_at, newer_used_at))
+                return 0
+            self._flushes += 1
+            self._flushed_rows += len(rows)
+            return len(rows)
+
+    def start(self) -> None:
+        """Start the periodic flush (call inside the running loop; no-op if running)."""
+        if self.flush_interval > 0 and (self._flusher is None or self._flusher.done()):
+            self._flusher = asyncio.create_task(self._run(), name="pattern-flusher")
+
+    async def stop(self) -> None:
+        """Cancel the periodic flush and write what is still buffered."""
+        if self._flusher is not None:
+            self._flusher.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._flusher
+            self._flusher = None
+        await self.flush()
+
+    def forget_category(self, user_id: int, category_id: int) -> None:
+        """Stop suggesting a category the user deleted.
+
+        Its rows are kept; its increments not yet flushed are dropped, so a
+        later warm does not bring the category back.
+        """
+        for key in [key for key in self._pending if key[0] == user_id and key[2] == category_id]:
+            del self._pending[key]
+        patterns = self._users.get(user_id)
+        if patterns is not None:
+            patterns.remove_category(category_id)
+
+    def invalidate(self, user_id: int) -> None:
+        """Drop a user's index; the next lookup reloads it."""
+        self._users.pop(user_id, None)
+
+    def clear(self) -> None:
+        """Drop every index, unflushed increments and counters."""
+        self._users.clear()
+        self._pending.clear()
+        self._flush_lock = asyncio.Lock()
+        self._confirmations = self._flushes = self._flushed_rows = 0
+        self._lookups = self._hits = self._fuzzy_hits = self._classifier_hits = 0
+        self._llm_comparisons = self._llm_agreements = self._warms = self._evictions = 0
+
+    def stats(self) -> PatternIndexStats:
+        """Return lookup/warm counters and how many users are loaded."""
+        return PatternIndexStats(
+            users=len(self._users),
+            lookups=self._lookups,
+            hits=self._hits,
+            fuzzy_hits=self._fuzzy_hits,
+            classifier_hits=self._classifier_hits,
+            llm_comparisons=self._llm_comparisons,
+            llm_agreements=self._llm_agreements,
+            warms=self._warms,
+            evictions=self._evictions,
+            confirmations=self._confirmations,
+            pending=len(self._pending),
+            flushes=self._flushes,
+            flushed_rows=self._flushed_rows,
+        )
+
+    async def _patterns(self, session: AsyncSession, user_id: int) -> UserPatterns:
+        patterns = self._users.get(user_id)
+        if patterns is not None:
+            self._users.move_to_end(user_id)
+            return patterns
+
+        stmt = (
+            select(
+                CategoryPattern.description_normalized,
+                CategoryPattern.category_id,
+                CategoryPattern.confirmation_count,
+            )
+            .join(Category, col(Category.id) == col(CategoryPattern.category_id))
+            .where(CategoryPattern.user_id == user_id)
+            .where(col(Category.deleted_at).is_(None))
+        )
+        patterns = UserPatterns(self._new_classifier())
+        async with self._flush_lock:  # a batch is either in the table or still pending
+            for description, category_id, count in (await session.exec(stmt)).all():
+                patterns.add(description, category_id, count)
+            for (pending_user, description, category_id), (count, _) in self._pending.items():
+                if pending_user == user_id:
+                    patterns.add(description, category_id, count)
+        self._warms += 1
+        logger.debug("Loaded %d patterns for user_id=%s", len(patterns.counts), user_id)
+
+        if self.max_users > 0:
+            self._users[user_id] = patterns
+            while len(self._users) > self.max_users:
+                self._users.popitem(last=False)
+                self._evictions += 1
+        return patterns
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    def _new_classifier(self) -> NaiveBayesClassifier | None:
+        return NaiveBayesClassifier() if self.classifier_enabled else None
+
+
+def _upsert(session: AsyncSession, rows: list[dict[str, object]]) -> Any:
+    """``INSERT ... ON CONFLICT`` adding each row's increments to the stored count."""
+    stmt = dialect_insert(session, CategoryPattern).values(rows)
+    return stmt.on_conflict_do_update(
+        index_elements=[
+            col(CategoryPattern.user_id),
+            col(CategoryPattern.description_normalized),
+            col(CategoryPattern.category_id),
+        ],
+        set_={
+            "confirmation_count": col(CategoryPattern.confirmation_count)
+            + stmt.excluded.confirmation_count,
+            "last_used_at": stmt.excluded.last_used_at,
+        },
+    )
+
+
+category_pattern_index = CategoryPatternIndex(
+    max_users=settings.LEARNING_INDEX_MAX_USERS,
+    min_confirmations=settings.LEARNING_MIN_CONFIRMATIONS,
+    fuzzy_threshold=settings.LEARNING_FUZZY_THRESHOLD,
+    classifier_enabled=settings.LEARNING_CLASSIFIER_ENABLED,
+    classifier_min_probability=settings.LEARNING_CLASSIFIER_MIN_PROBABILITY,
+    classifier_min_documents=settings.LEARNING_CLASSIFIER_MIN_DOCUMENTS,
+    flush_interval=settings.LEARNING_FLUSH_INTERVAL_SECONDS,
+    flush_max_pending=settings.LEARNING_FLUSH_MAX_PENDING,
+)
@@ -3,12 +3,62 @@
 Centraliza a interface pública para serviços de transcrição.
 """
 
-from pathlib import Path
-
-from .groq_whisper import TranscriptionError, transcribe_audio
+from .audio_store import (
+    AudioStore,
+    AudioStoreStats,
+    AudioSweeper,
+    SweepResult,
+    get_audio_store,
+    shutdown_audio_sweeper,
+    start_audio_sweeper,
+)
+from .backends import GroqWhisperBackend, LocalWhisperBackend, Transcript, TranscriptionBackend
+from .cache import (
+    TranscriptionCache,
+    TranscriptionCacheStats,
+    TranscriptionKey,
+    transcription_cache,
+)
+from .chunking import ProgressCallback, merge_transcripts, plan_chunks, transcribe_chunked
+from .groq_whisper import GROQ_WHISPER_MODEL, TranscriptionError, groq_transport, transcribe_audio
+from .hedging import HedgedTranscriber, HedgeStats, get_transcriber, transcribe
+from .preprocessing import PreprocessedAudio, PreprocessStats, preprocess_audio, trim_silence
+from .transport import CircuitOpenError, CircuitState, ResilientTransport, TransportStats
 
 __all__ = [
+    "GROQ_WHISPER_MODEL",
     "TranscriptionError",
     "transcribe_audio",
-    "Path",
+    "TranscriptionCache",
+    "TranscriptionCacheStats",
+    "TranscriptionKey",
+    "transcription_cache",
+    "groq_transport",
+    "CircuitOpenError",
+    "CircuitState",
+    "ResilientTransport",
+    "TransportStats",
+    "TranscriptionBackend",
+    "GroqWhisperBackend",
+    "LocalWhisperBackend",
+    "HedgedTranscriber",
+    "HedgeStats",
+    "Transcript",
+    "get_transcriber",
+    "transcribe",
+    "PreprocessedAudio",
+    "PreprocessStats",
+    "preprocess_audio",
+    "trim_silence",
+    "plan_chunks",
+    "merge_transcripts",
+    "transcribe_chunked",
+    "ProgressCallback",
+    "AudioStore",
+    "AudioStoreStats",
+    "AudioSweeper",
+    "SweepResult",
+    "get_audio_store",
+    "start_audio_sweeper",
+    "shutdown_audio_sweeper",
 ]
@@ -0,0 +1,258 @@
+"""On-disk retention of voice-note audio (RULE-009, ADR-007).
+
+Audio is kept for ``AUDIO_RETENTION_DAYS`` after download so a voice note can
+be re-transcribed (other model, failed job, re-run) without downloading it
+from Telegram again. Files are addressed by a hash of ``file_unique_id``.
+They sit in two levels of sharded directories (``ab/cd/abcd….ogg``), which
+keeps any single directory small.
+
+Each file has a ``stored_audio`` row whose ``expires_at`` column is indexed.
+``sweep`` reads expired rows from that index in batches, so its cost grows
+with the number of expired files rather than with the size of the tree.
+``AudioSweeper`` runs it periodically in the background.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import hashlib
+import logging
+import os
+import tempfile
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import delete, func
+from sqlalchemy.exc import SQLAlchemyError
+from sqlmodel import col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.core.config import settings
+from src.db.dialect import dialect_insert
+from src.db.session import get_async_session
+from src.models import StoredAudio
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class SweepResult:
+    """Files and bytes removed by one ``sweep`` call."""
+
+    files: int
+    bytes_reclaimed: int
+
+
+@dataclass(frozen=True, slots=True)
+class AudioStoreStats:
+    """Storage held now and totals reclaimed by sweeps since start."""
+
+    files: int
+    bytes_held: int
+    files_swept: int
+    bytes_reclaimed: int
+
+
+class AudioStore:
+    """Content-addressed audio files under ``root`` with a DB expiry index."""
+
+    def __init__(self, root: Path, retention: timedelta = timedelta(days=7)) -> None:
+        self.root = root
+        self.retention = retention
+        self._files_swept = 0
+        self._bytes_reclaimed = 0
+
+    def path_for(self, file_unique_id: str) -> Path:
+        """Return the sharded path for ``file_unique_id`` (exists or not)."""
+        digest = hashlib.sha256(file_unique_id.encode()).hexdigest()
+        return self.root / digest[:2] / digest[2:4] / f"{digest}.ogg"
+
+    async def get(self, file_unique_id: str) -> bytes | None:
+        """Return the stored audio, or None if it was never stored or already swept."""
+        try:
+            return await asyncio.to_thread(self.path_for(file_unique_id).read_bytes)
+        except FileNotFoundError:
+            return None
+
+    async def put(
+        self,
+        session: AsyncSession,
+        file_unique_id: str,
+        audio: bytes,
+        now: datetime | None = None,
+    ) -> Path:
+        """Write ``audio`` and (re)start its retention period. Does not commit.
+
+        The file is written to a temporary name and renamed, so readers never
+        see a partial file. Storing the same id again refreshes ``expires_at``.
+        """
+        path = self.path_for(file_unique_id)
+        await asyncio.to_thread(_write_atomic, path, audio)
+        now = now or datetime.now(UTC)
+        stmt = (
+            dialect_insert(session, StoredAudio)
+            .values(
+                file_unique_id=file_unique_id,
+                size_bytes=len(audio),
+                created_at=now,
+                expires_at=now + self.retention,
+            )
+            .on_conflict_do_update(
+                index_elements=[col(StoredAudio.file_unique_id)],
+                set_={"size_bytes": len(audio), "expires_at": now + self.retention},
+            )
+        )
+        await session.exec(stmt)
+        return path
+
+    async def sweep(
+        self, session: AsyncSession, now: datetime | None = None, batch_size: int = 500
+    ) -> SweepResult:
+        """Delete files whose retention expired, ``batch_size`` rows per commit.
+
+        Rows are deleted first and only the files of rows actually deleted are
+        unlinked, so a ``put`` that refreshed a row in between keeps its file.
+        """
+        now = now or datetime.now(UTC)
+        files = reclaimed = 0
+        while True:
+            stmt = (
+                select(StoredAudio.id)
+                .where(col(StoredAudio.expires_at) <= now)
+                .order_by(col(StoredAudio.expires_at))
+                .limit(batch_size)
+            )
+            ids = (await session.exec(stmt)).all()
+            if not ids:
+                break
+            deleted = (
+                await session.exec(  # type: ignore[call-overload]
+                    delete(StoredAudio)
+                    .where(
+                        col(StoredAudio.id).in_(ids),
+                        col(StoredAudio.expires_at) <= now,  # skip rows refreshed meanwhile
+                    )
+                    .returning(col(StoredAudio.file_unique_id), col(StoredAudio.size_bytes))
+                )
+            ).all()
+            await session.commit()
+            paths = [self.path_for(file_unique_id) for file_unique_id, _size in deleted]
+            await asyncio.to_thread(_unlink_all, paths)
+            files += len(deleted)
+            reclaimed += sum(size for _unique_id, size in deleted)
+            if len(ids) < batch_size:
+                break
+        self._files_swept += files
+        self._bytes_reclaimed += reclaimed
+        if files:
+            logger.info("Audio sweep removed %d files (%d bytes)", files, reclaimed)
+        return SweepResult(files=files, bytes_reclaimed=reclaimed)
+
+    async def stats(self, session: AsyncSession) -> AudioStoreStats:
+        """Return bytes currently held (from the index) and sweep totals."""
+        stmt = select(func.count(), func.coalesce(func.sum(StoredAudio.size_bytes), 0))
+        files, bytes_held = (await session.exec(stmt)).one()
+        return AudioStoreStats(
+            files=files,
+            bytes_held=bytes_held,
+            files_swept=self._files_swept,
+            bytes_reclaimed=self._bytes_reclaimed,
+        )
+
+
+class AudioSweeper:
+    """Background task calling ``store.sweep`` every ``interval`` seconds."""
+
+    def __init__(self, store: AudioStore, interval: float = 3600.0, batch_size: int = 500):
+        self.store = store
+        self.interval = interval
+        self.batch_size = batch_size
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        """Start the periodic sweep (no-op if already running)."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="audio-sweeper")
+
+    async def stop(self) -> None:
+        """Cancel the periodic sweep and wait for it to exit."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                async with get_async_session() as session:
+                    await self.store.sweep(session, batch_size=self.batch_size)
+                    stats = await self.store.stats(session)
+                logger.info(
+                    "Audio store holds %d files (%d bytes); %d bytes reclaimed since start",
+                    stats.files,
+                    stats.bytes_held,
+                    stats.bytes_reclaimed,
+                )
+            except (OSError, SQLAlchemyError):
+                logger.exception("Audio sweep failed; retrying next interval")
+            await asyncio.sleep(self.interval)
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(tmp)
+        raise
+
+
+def _unlink_all(paths: list[Path]) -> None:
+    for path in paths:
+        path.unlink(missing_ok=True)
+
+
+_audio_store: AudioStore | None = None
+_audio_sweeper: AudioSweeper | None = None
+
+
+def get_audio_store() -> AudioStore | None:
+    """Return the process-wide audio store, or None when retention is disabled."""
+    global _audio_store
+    if not settings.AUDIO_RETENTION_ENABLED:
+        return None
+    if _audio_store is None:
+        _audio_store = AudioStore(
+            Path(settings.AUDIO_STORE_DIR),
+            retention=timedelta(days=settings.AUDIO_RETENTION_DAYS),
+        )
+    return _audio_store
+
+
+def start_audio_sweeper() -> None:
+    """Start the periodic sweeper if retention is enabled (call inside the running loop)."""
+    global _audio_sweeper
+    store = get_audio_store()
+    if store is None or _audio_sweeper is not None:
+        return
+    _audio_sweeper = AudioSweeper(
+        store,
+        interval=settings.AUDIO_SWEEP_INTERVAL_SECONDS,
+        batch_size=settings.AUDIO_SWEEP_BATCH_SIZE,
+    )
+    _audio_sweeper.start()
+
+
+async def shutdown_audio_sweeper() -> None:
+    """Stop the periodic sweeper, if running."""
+    global _audio_sweeper
+    if _audio_sweeper is not None:
+        await _audio_sweeper.stop()
+        _audio_sweeper = None
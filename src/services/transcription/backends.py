@@ -0,0 +1,115 @@
+"""Pluggable transcription backends (ADR-005, RULE-010).
+
+A backend turns audio bytes into text and names the model it uses (part of
+the transcription cache key). ``GroqWhisperBackend`` is the primary;
+``LocalWhisperBackend`` runs a quantized Whisper model on the CPU via
+faster-whisper (optional extra ``local-stt``) so the bot keeps working when
+Groq is slow, failing or unreachable.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import io
+import threading
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Protocol
+
+from src.services.transcription.groq_whisper import (
+    GROQ_WHISPER_MODEL,
+    TranscriptionError,
+    transcribe_audio,
+)
+
+if TYPE_CHECKING:
+    from faster_whisper import WhisperModel
+
+
+@dataclass(frozen=True, slots=True)
+class Transcript:
+    """Transcribed text and the model that produced it."""
+
+    text: str
+    model: str
+
+
+class TranscriptionBackend(Protocol):
+    """Interface implemented by every transcription engine."""
+
+    @property
+    def model(self) -> str:
+        """Model identifier (stored in the transcription cache key)."""
+        ...
+
+    async def transcribe(self, audio: bytes, filename: str, language: str) -> str:
+        """Return the transcribed text or raise ``TranscriptionError``."""
+        ...
+
+
+class GroqWhisperBackend:
+    """Groq-hosted Whisper (primary backend)."""
+
+    model = GROQ_WHISPER_MODEL
+
+    async def transcribe(self, audio: bytes, filename: str, language: str) -> str:
+        """Transcribe through ``transcribe_audio`` (resilient Groq transport)."""
+        return await transcribe_audio(audio, filename=filename, language=language)
+
+
+class LocalWhisperBackend:
+    """CPU Whisper via faster-whisper (CTranslate2, int8 by default).
+
+    The model is loaded on first use (or by ``warm_up``) and calls are
+    serialized: one CPU transcription at a time already uses every core
+    given by ``cpu_threads``.
+    """
+
+    def __init__(
+        self, model_size: str = "small", compute_type: str = "int8", cpu_threads: int = 0
+    ) -> None:
+        self.model_size = model_size
+        self.compute_type = compute_type
+        self.cpu_threads = cpu_threads
+        self.model = f"faster-whisper-{model_size}"
+        self._whisper: WhisperModel | None = None
+        self._lock = threading.Lock()
+
+    async def warm_up(self) -> None:
+        """Load the model ahead of the first fallback (avoids a cold start)."""
+        await asyncio.to_thread(self._load)
+
+    async def transcribe(self, audio: bytes, filename: str, language: str) -> str:
+        """Transcribe on a worker thread so the event loop stays responsive."""
+        return await asyncio.to_thread(self._transcribe_sync, audio, language)
+
+    def _load(self) -> WhisperModel:
+        with self._lock:
+            if self._whisper is None:
+                try:
+                    from faster_whisper import WhisperModel
+                except ImportError as exc:
+                    raise TranscriptionError(
+                        "faster-whisper não instalado. Use `uv sync --extra local-stt`."
+                    ) from exc
+                self._whisper = WhisperModel(
+                    self.model_size,
+                    device="cpu",
+                    compute_type=self.compute_type,
+                    cpu_threads=self.cpu_threads,
+                )
+            return self._whisper
+
+    def _transcribe_sync(self, audio: bytes, language: str) -> str:
+        whisper = self._load()
+        with self._lock:
+            try:
+                segments, _info = whisper.transcribe(
+                    io.BytesIO(audio), language=language, beam_size=1, vad_filter=True
+                )
+                # segments is a lazy generator: decoding happens while joining
+                text = " ".join(segment.text.strip() for segment in segments).strip()
+            except Exception as exc:
+                raise TranscriptionError("Falha na transcrição local (faster-whisper).") from exc
+        if not text:
+            raise TranscriptionError("Transcrição local vazia.")
+        return text
@@ -0,0 +1,160 @@
+"""Two-tier transcription cache: in-process LRU backed by ``transcription_cache``.
+
+Forwarded or re-sent voice notes keep their ``file_unique_id``; looking the
+transcription up before ``get_file`` skips the download and the Groq call.
+The memory tier answers without touching the database; the table makes hits
+survive restarts and shares them across bot processes.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+from sqlmodel import col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.core.config import settings
+from src.db.dialect import dialect_insert
+from src.models import TranscriptionCacheEntry
+
+
+@dataclass(frozen=True, slots=True)
+class TranscriptionKey:
+    """Cache key: the same audio transcribed with the same language and model."""
+
+    file_unique_id: str
+    language: str
+    model: str
+
+
+@dataclass(frozen=True, slots=True)
+class TranscriptionCacheStats:
+    """Counters exposed for monitoring the transcription cache."""
+
+    memory_hits: int
+    db_hits: int
+    misses: int
+    bytes_saved: int
+    size: int
+
+    @property
+    def hits(self) -> int:
+        """Hits on either tier."""
+        return self.memory_hits + self.db_hits
+
+    @property
+    def hit_ratio(self) -> float:
+        """Hits over lookups (0.0 when there were no lookups)."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class TranscriptionCache:
+    """LRU of ``(text, audio_bytes)`` in front of the ``transcription_cache`` table."""
+
+    def __init__(self, max_size: int = 1024) -> None:
+        self.max_size = max_size
+        self._entries: OrderedDict[TranscriptionKey, tuple[str, int]] = OrderedDict()
+        self._memory_hits = 0
+        self._db_hits = 0
+        self._misses = 0
+        self._bytes_saved = 0
+
+    async def get(self, session: AsyncSession, key: TranscriptionKey) -> str | None:
+        """Return the cached text for ``key`` (memory first, then the table)."""
+        return await self.lookup(session, key.file_unique_id, key.language, [key.model])
+
+    async def lookup(
+        self,
+        session: AsyncSession,
+        file_unique_id: str,
+        language: str,
+        models: Sequence[str],
+    ) -> str | None:
+        """Return text cached for any of ``models`` (earlier models preferred).
+
+        Checks the memory tier for each model, then issues a single query.
+        """
+        for model in models:
+            key = TranscriptionKey(file_unique_id, language, model)
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._memory_hits += 1
+                self._bytes_saved += entry[1]
+                return entry[0]
+
+        stmt = select(TranscriptionCacheEntry).where(
+            TranscriptionCacheEntry.file_unique_id == file_unique_id,
+            TranscriptionCacheEntry.language == language,
+            col(TranscriptionCacheEntry.model).in_(models),
+        )
+        rows = {row.model: row for row in (await session.exec(stmt)).all()}
+        row = next((rows[model] for model in models if model in rows), None)
+        if row is None:
+            self._misses += 1
+            return None
+
+        self._db_hits += 1
+        self._bytes_saved += row.audio_bytes
+        self._remember(
+            TranscriptionKey(file_unique_id, language, row.model), row.text, row.audio_bytes
+        )
+        return row.text
+
+    async def put(
+        self, session: AsyncSession, key: TranscriptionKey, text: str, audio_bytes: int
+    ) -> None:
+        """Store a transcription in both tiers. Does not commit.
+
+        Concurrent jobs for the same audio may race to insert; the unique key
+        turns the loser into a no-op.
+        """
+        self._remember(key, text, audio_bytes)
+        entry = TranscriptionCacheEntry(
+            file_unique_id=key.file_unique_id,
+            language=key.language,
+            model=key.model,
+            text=text,
+            audio_bytes=audio_bytes,
+        )
+        stmt = (
+            dialect_insert(session, TranscriptionCacheEntry)
+            .values(**entry.model_dump(exclude={"id"}))
+            .on_conflict_do_nothing(
+                index_elements=[
+                    col(TranscriptionCacheEntry.file_unique_id),
+                    col(TranscriptionCacheEntry.language),
+                    col(TranscriptionCacheEntry.model),
+                ]
+            )
+        )
+        await session.exec(stmt)
+
+    def clear(self) -> None:
+        """Drop the memory tier and reset counters (the table is untouched)."""
+        self._entries.clear()
+        self._memory_hits = self._db_hits = self._misses = self._bytes_saved = 0
+
+    def stats(self) -> TranscriptionCacheStats:
+        """Return hit/miss counters and the audio bytes not re-downloaded."""
+        return TranscriptionCacheStats(
+            memory_hits=self._memory_hits,
+            db_hits=self._db_hits,
+            misses=self._misses,
+            bytes_saved=self._bytes_saved,
+            size=len(self._entries),
+        )
+
+    def _remember(self, key: TranscriptionKey, text: str, audio_bytes: int) -> None:
+        if self.max_size <= 0:
+            return
+        self._entries[key] = (text, audio_bytes)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+
+transcription_cache = TranscriptionCache(max_size=settings.TRANSCRIPTION_CACHE_MAX_SIZE)
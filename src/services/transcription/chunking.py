@@ -0,0 +1,231 @@
+"""Parallel transcription of long voice notes.
+
+Audio longer than ``chunk_seconds`` is decoded once, cut near the quietest
+20 ms frame before each chunk boundary (so cuts land between words), and
+encoded as overlapping 16 kHz mono Opus segments. The segments are
+transcribed concurrently, with at most ``max_parallel`` in flight per
+message. They are then stitched back in order, dropping the words that the
+overlap transcribed twice. Wall time is close to that of the slowest chunk
+instead of the sum of all chunks.
+
+Needs the ``audio`` extra (PyAV), like ``preprocessing``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import string
+import time
+from collections.abc import Callable, Sequence
+from typing import TYPE_CHECKING
+
+from src.services.transcription.backends import Transcript
+from src.services.transcription.groq_whisper import TranscriptionError
+from src.services.transcription.preprocessing import (
+    TARGET_SAMPLE_RATE,
+    decode_mono,
+    encode_opus,
+    frame_length,
+    frame_rms,
+    trim_silence,
+)
+
+if TYPE_CHECKING:
+    import numpy as np
+    import numpy.typing as npt
+
+    from src.services.transcription.hedging import HedgedTranscriber
+
+logger = logging.getLogger(__name__)
+
+# Fraction of a chunk, before its hard end, searched for a quiet cut point
+CUT_SEARCH_FRACTION = 0.25
+MAX_OVERLAP_WORDS = 12
+
+# Called with (text of the contiguous finished prefix, chunks in it, total chunks)
+ProgressCallback = Callable[[str, int, int], None]
+
+
+def plan_chunks(
+    samples: npt.NDArray[np.float32],
+    sample_rate: int,
+    *,
+    chunk_seconds: float,
+    overlap_seconds: float,
+) -> list[tuple[int, int]]:
+    """Return ``(start, end)`` sample spans covering ``samples``.
+
+    No span is longer than ``chunk_seconds``. Each cut is placed at the
+    quietest frame in the last quarter of the chunk, and the next span starts
+    ``overlap_seconds`` before that cut.
+    """
+    import numpy as np
+
+    total = samples.size
+    chunk = int(chunk_seconds * sample_rate)
+    overlap = int(overlap_seconds * sample_rate)
+    if chunk <= overlap:
+        raise ValueError("chunk_seconds must be greater than overlap_seconds.")
+    if total <= chunk:
+        return [(0, total)]
+
+    frame = frame_length(sample_rate)
+    rms = frame_rms(samples, sample_rate)
+    search = max(int(chunk * CUT_SEARCH_FRACTION), frame)
+    spans: list[tuple[int, int]] = []
+    start = 0
+    while total - start > chunk:
+        hard_end = start + chunk
+        lo = max(hard_end - search, start + overlap + frame) // frame
+        hi = min(hard_end // frame, rms.size)
+        cut = hard_end if lo >= hi else (lo + int(np.argmin(rms[lo:hi]))) * frame + frame // 2
+        spans.append((start, cut))
+        start = cut - overlap
+    spans.append((start, total))
+    return spans
+
+
+def merge_transcripts(parts: Sequence[str], max_overlap_words: int = MAX_OVERLAP_WORDS) -> str:
+    """Join chunk transcripts in order, removing words repeated across the overlap.
+
+    For each chunk, the longest prefix (up to ``max_overlap_words``) that
+    equals the tail of the text so far is dropped. Case and surrounding
+    punctuation are ignored when comparing.
+    """
+    words: list[str] = []
+    for part in parts:
+        new = part.split()
+        if words:
+            new = new[_overlap_length(words, new, max_overlap_words) :]
+        words.extend(new)
+    return " ".join(words)
+
+
+def split_audio(
+    audio: bytes,
+    *,
+    chunk_seconds: float,
+    overlap_seconds: float,
+    trim: bool = False,
+    silence_threshold_db: float = -40.0,
+    bitrate: int = 24_000,
+) -> list[bytes]:
+    """Decode ``audio`` and return it as overlapping Opus chunks (CPU-bound).
+
+    Raises:
+        TranscriptionError: The audio extra is missing or the audio cannot be decoded.
+    """
+    try:
+        import av
+        import numpy  # noqa: F401
+    except ImportError as exc:
+        raise TranscriptionError(
+            "Transcrição de áudios longos requer o extra 'audio' (PyAV)."
+        ) from exc
+
+    try:
+        samples, _seconds = decode_mono(audio)
+    except (av.FFmpegError, ValueError) as exc:
+        raise TranscriptionError("Não foi possível decodificar o áudio.") from exc
+    if trim:
+        samples = trim_silence(samples, TARGET_SAMPLE_RATE, threshold_db=silence_threshold_db)
+        if samples.size == 0:
+            raise TranscriptionError("Áudio sem fala detectada.")
+    spans = plan_chunks(
+        samples,
+        TARGET_SAMPLE_RATE,
+        chunk_seconds=chunk_seconds,
+        overlap_seconds=overlap_seconds,
+    )
+    try:
+        return [encode_opus(samples[start:end], bitrate) for start, end in spans]
+    except (av.FFmpegError, ValueError) as exc:
+        raise TranscriptionError("Não foi possível preparar o áudio.") from exc
+
+
+async def transcribe_chunked(
+    transcriber: HedgedTranscriber,
+    audio: bytes,
+    filename: str,
+    language: str,
+    *,
+    chunk_seconds: float = 30.0,
+    overlap_seconds: float = 1.0,
+    max_parallel: int = 4,
+    trim: bool = False,
+    silence_threshold_db: float = -40.0,
+    bitrate: int = 24_000,
+    on_progress: ProgressCallback | None = None,
+) -> Transcript:
+    """Split ``audio`` and transcribe the chunks concurrently through ``transcriber``.
+
+    ``on_progress`` is called whenever the finished prefix grows, so callers
+    can show a partial transcript. Chunks may complete out of order, and
+    text is only reported once everything before it is known.
+
+    If any chunk fails, the remaining ones are cancelled and the
+    ``TranscriptionError`` propagates. When the fallback answered some
+    chunks, the result is attributed to the least preferred model that
+    contributed, so the cache never labels mixed output as the primary model.
+    """
+    started = time.perf_counter()
+    chunks = await asyncio.to_thread(
+        split_audio,
+        audio,
+        chunk_seconds=chunk_seconds,
+        overlap_seconds=overlap_seconds,
+        trim=trim,
+        silence_threshold_db=silence_threshold_db,
+        bitrate=bitrate,
+    )
+    stem = filename.rsplit(".", 1)[0]
+    semaphore = asyncio.Semaphore(max_parallel)
+    finished: list[Transcript | None] = [None] * len(chunks)
+    prefix = 0
+
+    async def run(index: int, chunk: bytes) -> Transcript:
+        nonlocal prefix
+        async with semaphore:
+            result = await transcriber.transcribe(chunk, f"{stem}-{index}.ogg", language)
+        finished[index] = result
+        start = prefix
+        while prefix < len(finished) and finished[prefix] is not None:
+            prefix += 1
+        if on_progress is not None and prefix > start and prefix < len(finished):
+            texts = [done.text for done in finished[:prefix] if done is not None]
+            on_progress(merge_transcripts(texts), prefix, len(finished))
+        return result
+
+    tasks = [asyncio.create_task(run(n, chunk)) for n, chunk in enumerate(chunks)]
+    try:
+        results = await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+    preference = transcriber.models
+    model = max(
+        (result.model for result in results),
+        key=lambda m: preference.index(m) if m in preference else len(preference),
+    )
+    logger.info(
+        "Long audio transcribed in %d chunks (%.2fs wall)",
+        len(chunks),
+        time.perf_counter() - started,
+    )
+    return Transcript(merge_transcripts([result.text for result in results]), model)
+
+
+def _overlap_length(previous: list[str], following: list[str], max_words: int) -> int:
+    """Length of the longest tail of ``previous`` that prefixes ``following``."""
+    for k in range(min(max_words, len(previous), len(following)), 0, -1):
+        if [_normalize(w) for w in previous[-k:]] == [_normalize(w) for w in following[:k]]:
+            return k
+    return 0
+
+
+def _normalize(word: str) -> str:
+    return word.strip(string.punctuation + "…«»“”").casefold()
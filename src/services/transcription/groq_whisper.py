@@ -5,16 +5,24 @@ para transcrever áudios utilizando o modelo Whisper.
 
 Este módulo NÃO deve ser responsável por lógica de Telegram ou de
 persistência, apenas por transformar um arquivo de áudio em texto.
+
+As chamadas passam por ``groq_transport`` (limite de concorrência, retry com
+backoff e circuit breaker); o retry interno do SDK fica desabilitado.
 """
 
 from __future__ import annotations
 
-from pathlib import Path
-
 import groq
 from groq import AsyncGroq
 
 from src.core.config import settings
+from src.services.transcription.transport import (
+    CircuitBreaker,
+    CircuitOpenError,
+    ResilientTransport,
+)
+
+GROQ_WHISPER_MODEL = "whisper-large-v3-turbo"
 
 
 class TranscriptionError(Exception):
@@ -23,6 +31,17 @@ class TranscriptionError(Exception):
 
 _async_client: AsyncGroq | None = None
 
+groq_transport = ResilientTransport(
+    max_concurrency=settings.GROQ_MAX_CONCURRENCY,
+    max_attempts=settings.GROQ_MAX_ATTEMPTS,
+    base_delay=settings.GROQ_RETRY_BASE_DELAY_SECONDS,
+    max_delay=settings.GROQ_RETRY_MAX_DELAY_SECONDS,
+    breaker=CircuitBreaker(
+        failure_threshold=settings.GROQ_BREAKER_FAILURE_THRESHOLD,
+        reset_timeout=settings.GROQ_BREAKER_RESET_SECONDS,
+    ),
+)
+
 
 def _get_async_client() -> AsyncGroq:
     """Return a cached AsyncGroq client configured with the API key.
@@ -42,17 +61,20 @@ def _get_async_client() -> AsyncGroq:
             "serviço de transcrição."
         )
 
-    _async_client = AsyncGroq(api_key=api_key)
+    # Retries are owned by groq_transport (jitter, Retry-After, circuit breaker)
+    _async_client = AsyncGroq(api_key=api_key, max_retries=0)
     return _async_client
 
 
-async def transcribe_audio(path: Path, language: str = "pt") -> str:
-    """Transcribe an audio file into text using Groq Whisper.
+async def transcribe_audio(audio: bytes, filename: str = "voice.ogg", language: str = "pt") -> str:
+    """Transcribe in-memory audio into text using Groq Whisper.
 
     Parameters
     ----------
-    path:
-        Caminho para o arquivo de áudio já salvo em disco.
+    audio:
+        Conteúdo do arquivo de áudio (ex.: OGG/Opus baixado do Telegram).
+    filename:
+        Nome enviado no upload; a API usa a extensão para detectar o formato.
     language:
         Código da língua em ISO-639-1. Default: \"pt\".
 
@@ -70,15 +92,20 @@ async def transcribe_audio(path: Path, language: str = "pt") -> str:
 
     try:
         # Quando response_format=\"text\", a API retorna uma string simples.
-        result = await client.audio.transcriptions.create(
-            file=path,
-            model="whisper-large-v3-turbo",
-            language=language,
-            response_format="text",
+        result = await groq_transport.call(
+            lambda: client.audio.transcriptions.create(
+                file=(filename, audio),
+                model=GROQ_WHISPER_MODEL,
+                language=language,
+                response_format="text",
+                timeout=settings.GROQ_TIMEOUT_SECONDS,
+            )
         )
-    except (groq.APIError, OSError) as exc:
-        # APIError cobre erros de conexão, timeouts, rate limit e respostas 4xx/5xx.
-        # OSError cobre problemas locais de arquivo (ex.: permissão ou inexistente).
+    except CircuitOpenError as exc:
+        raise TranscriptionError("Groq indisponível (circuit breaker aberto).") from exc
+    except groq.APIError as exc:
+        # APIError cobre erros de conexão, timeouts, rate limit e respostas 4xx/5xx
+        # (os retentáveis já foram re-tentados pelo groq_transport).
         raise TranscriptionError("Falha ao transcrever áudio via Groq.") from exc
 
     if isinstance(result, str):
@@ -0,0 +1,203 @@
+"""Hedged transcription: primary backend with a delayed fallback (RULE-010).
+
+The fallback only runs when the primary errors or times out. The "timeout"
+here is the hedge delay, a soft budget set near Groq's p95 latency. When the
+primary is still running after it, the fallback starts in parallel and the
+first successful result wins; the loser is cancelled. The hedge delay bounds
+tail latency without paying for the fallback on typical requests.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass
+
+from src.core.config import settings
+from src.services.transcription.backends import (
+    GroqWhisperBackend,
+    LocalWhisperBackend,
+    Transcript,
+    TranscriptionBackend,
+)
+from src.services.transcription.chunking import ProgressCallback, transcribe_chunked
+from src.services.transcription.groq_whisper import TranscriptionError
+from src.services.transcription.preprocessing import preprocess_audio
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class HedgeStats:
+    """Counters exposed for monitoring the hedging policy."""
+
+    primary_wins: int
+    fallback_wins: int
+    hedged: int
+    fallback_on_error: int
+    failures: int
+
+
+class HedgedTranscriber:
+    """Run ``primary``; start ``fallback`` on error or after ``hedge_delay`` seconds."""
+
+    def __init__(
+        self,
+        primary: TranscriptionBackend,
+        fallback: TranscriptionBackend | None = None,
+        hedge_delay: float = 3.0,
+    ) -> None:
+        self.primary = primary
+        self.fallback = fallback
+        self.hedge_delay = hedge_delay
+        self._primary_wins = 0
+        self._fallback_wins = 0
+        self._hedged = 0
+        self._fallback_on_error = 0
+        self._failures = 0
+
+    @property
+    def models(self) -> list[str]:
+        """Models that may answer, in order of preference (for cache lookups)."""
+        models = [self.primary.model]
+        if self.fallback is not None:
+            models.append(self.fallback.model)
+        return models
+
+    async def transcribe(self, audio: bytes, filename: str, language: str) -> Transcript:
+        """Return the first successful transcript; raise ``TranscriptionError`` if all fail."""
+        primary = asyncio.create_task(self._run(self.primary, audio, filename, language))
+        if self.fallback is None:
+            return await self._finish([primary])
+
+        done, _pending = await asyncio.wait({primary}, timeout=self.hedge_delay)
+        if done and primary.exception() is None:
+            self._primary_wins += 1
+            return primary.result()
+        if done:
+            self._fallback_on_error += 1
+            logger.warning("Primary transcription failed; using fallback %s", self.fallback.model)
+        else:
+            self._hedged += 1
+            logger.info(
+                "Primary transcription slower than %.1fs; hedging with %s",
+                self.hedge_delay,
+                self.fallback.model,
+            )
+        fallback = asyncio.create_task(self._run(self.fallback, audio, filename, language))
+        return await self._finish([primary, fallback])
+
+    def stats(self) -> HedgeStats:
+        """Return which backend answered and how often the hedge fired."""
+        return HedgeStats(
+            primary_wins=self._primary_wins,
+            fallback_wins=self._fallback_wins,
+            hedged=self._hedged,
+            fallback_on_error=self._fallback_on_error,
+            failures=self._failures,
+        )
+
+    async def _finish(self, tasks: list[asyncio.Task[Transcript]]) -> Transcript:
+        """Wait for the first success among ``tasks`` (earlier tasks win ties)."""
+        pending = set(tasks)
+        error: BaseException | None = None
+        try:
+            while pending:
+                _done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in tasks:
+                    if task.done() and not task.cancelled() and task.exception() is None:
+                        if task is tasks[0]:
+                            self._primary_wins += 1
+                        else:
+                            self._fallback_wins += 1
+                        return task.result()
+                    if task.done() and not task.cancelled():
+                        error = task.exception()
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                # Let the losers unwind (e.g. free the Groq breaker's probe) before returning
+                await asyncio.wait(pending)
+        self._failures += 1
+        if isinstance(error, TranscriptionError):
+            raise error
+        raise TranscriptionError("Falha em todos os backends de transcrição.") from error
+
+    @staticmethod
+    async def _run(
+        backend: TranscriptionBackend, audio: bytes, filename: str, language: str
+    ) -> Transcript:
+        text = await backend.transcribe(audio, filename, language)
+        return Transcript(text=text, model=backend.model)
+
+
+_transcriber: HedgedTranscriber | None = None
+
+
+def get_transcriber() -> HedgedTranscriber:
+    """Return the process-wide transcriber built from settings."""
+    global _transcriber
+    if _transcriber is None:
+        fallback = (
+            LocalWhisperBackend(
+                model_size=settings.LOCAL_WHISPER_MODEL,
+                compute_type=settings.LOCAL_WHISPER_COMPUTE_TYPE,
+                cpu_threads=settings.LOCAL_WHISPER_CPU_THREADS,
+            )
+            if settings.LOCAL_WHISPER_ENABLED
+            else None
+        )
+        _transcriber = HedgedTranscriber(
+            GroqWhisperBackend(),
+            fallback,
+            hedge_delay=settings.TRANSCRIPTION_HEDGE_DELAY_SECONDS,
+        )
+    return _transcriber
+
+
+async def transcribe(
+    audio: bytes,
+    filename: str = "voice.ogg",
+    language: str = "pt",
+    duration: float | None = None,
+    on_progress: ProgressCallback | None = None,
+) -> Transcript:
+    """Transcribe with the configured backends (Groq, plus local fallback if enabled).
+
+    With ``AUDIO_CHUNKING_ENABLED`` and a ``duration`` above
+    ``AUDIO_CHUNK_SECONDS``, the audio is split and transcribed in parallel
+    (see ``chunking``) and partial text is reported through ``on_progress``.
+    Otherwise, with ``AUDIO_PREPROCESS_ENABLED``, it is first trimmed and
+    downmixed (see ``preprocessing``) on a worker thread.
+    """
+    transcriber = get_transcriber()
+    if (
+        settings.AUDIO_CHUNKING_ENABLED
+        and duration is not None
+        and duration > settings.AUDIO_CHUNK_SECONDS
+    ):
+        return await transcribe_chunked(
+            transcriber,
+            audio,
+            filename,
+            language,
+            chunk_seconds=settings.AUDIO_CHUNK_SECONDS,
+            overlap_seconds=settings.AUDIO_CHUNK_OVERLAP_SECONDS,
+            max_parallel=settings.AUDIO_CHUNK_MAX_PARALLEL,
+            trim=settings.AUDIO_PREPROCESS_ENABLED,
+            silence_threshold_db=settings.AUDIO_SILENCE_THRESHOLD_DB,
+            bitrate=settings.AUDIO_PREPROCESS_BITRATE,
+            on_progress=on_progress,
+        )
+    if settings.AUDIO_PREPROCESS_ENABLED:
+        processed = await asyncio.to_thread(
+            preprocess_audio,
+            audio,
+            filename,
+            silence_threshold_db=settings.AUDIO_SILENCE_THRESHOLD_DB,
+            padding_seconds=settings.AUDIO_SILENCE_PADDING_SECONDS,
+            bitrate=settings.AUDIO_PREPROCESS_BITRATE,
+        )
+        audio, filename = processed.audio, processed.filename
+    return await transcriber.transcribe(audio, filename, language)
@@ -0,0 +1,204 @@
+"""Optional audio preprocessing before transcription.
+
+Telegram voice notes are 48 kHz Opus, often with a second or two of silence
+around the speech. Whisper works at 16 kHz mono, so the stage:
+
+1. decodes the audio and downmixes/resamples it to 16 kHz mono (PyAV);
+2. trims leading and trailing silence using per-frame RMS computed over the
+   whole signal at once (NumPy, no Python loop over samples);
+3. re-encodes it as low-bitrate Opus.
+
+Fewer bytes are uploaded and Groq decodes a shorter clip. Each call returns
+``PreprocessStats`` with the before/after size and duration. PyAV comes
+from the optional ``audio`` extra. If it (or NumPy) cannot be imported or the
+audio cannot be decoded or encoded, the original bytes are used unchanged.
+"""
+
+from __future__ import annotations
+
+import io
+import logging
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import numpy as np
+    import numpy.typing as npt
+
+logger = logging.getLogger(__name__)
+
+TARGET_SAMPLE_RATE = 16_000
+FRAME_SECONDS = 0.02
+
+
+@dataclass(frozen=True, slots=True)
+class PreprocessStats:
+    """Before/after size and duration of one preprocessed clip."""
+
+    input_bytes: int
+    output_bytes: int
+    input_seconds: float
+    output_seconds: float
+    elapsed_seconds: float
+
+    @property
+    def bytes_saved(self) -> int:
+        """Upload bytes avoided (negative if the output grew)."""
+        return self.input_bytes - self.output_bytes
+
+    @property
+    def seconds_trimmed(self) -> float:
+        """Audio duration removed as silence."""
+        return self.input_seconds - self.output_seconds
+
+
+@dataclass(frozen=True, slots=True)
+class PreprocessedAudio:
+    """Audio ready for upload plus the stats of the stage (None if skipped)."""
+
+    audio: bytes
+    filename: str
+    stats: PreprocessStats | None = None
+
+
+def preprocess_audio(
+    audio: bytes,
+    filename: str = "voice.ogg",
+    *,
+    silence_threshold_db: float = -40.0,
+    padding_seconds: float = 0.25,
+    bitrate: int = 24_000,
+) -> PreprocessedAudio:
+    """Trim silence and re-encode ``audio`` as 16 kHz mono Opus.
+
+    CPU-bound: call it through ``asyncio.to_thread`` from async code. Falls
+    back to the original bytes when the extra is missing, decoding fails, the
+    clip is all silence or the result would not be smaller.
+    """
+    unchanged = PreprocessedAudio(audio, filename)
+    try:
+        # decode_mono needs both: a broken NumPy install must not escape either
+        import av
+        import numpy  # noqa: F401
+    except ImportError:
+        logger.warning("Audio preprocessing disabled: install the 'audio' extra (PyAV)")
+        return unchanged
+
+    started = time.perf_counter()
+    try:
+        samples, input_seconds = decode_mono(audio)
+    except (av.FFmpegError, ValueError):
+        logger.warning("Audio preprocessing skipped: could not decode %s", filename)
+        return unchanged
+
+    trimmed = trim_silence(
+        samples,
+        TARGET_SAMPLE_RATE,
+        threshold_db=silence_threshold_db,
+        padding_seconds=padding_seconds,
+    )
+    if trimmed.size == 0:
+        return unchanged
+    try:
+        output = encode_opus(trimmed, bitrate)
+    except (av.FFmpegError, ValueError):
+        logger.warning("Audio preprocessing skipped: could not encode %s", filename)
+        return unchanged
+    if len(output) >= len(audio) and trimmed.size == samples.size:
+        return unchanged
+
+    stats = PreprocessStats(
+        input_bytes=len(audio),
+        output_bytes=len(output),
+        input_seconds=input_seconds,
+        output_seconds=trimmed.size / TARGET_SAMPLE_RATE,
+        elapsed_seconds=time.perf_counter() - started,
+    )
+    logger.info(
+        "Audio preprocessed: %d -> %d bytes, %.2fs -> %.2fs (%.0f ms)",
+        stats.input_bytes,
+        stats.output_bytes,
+        stats.input_seconds,
+        stats.output_seconds,
+        stats.elapsed_seconds * 1000,
+    )
+    return PreprocessedAudio(output, f"{filename.rsplit('.', 1)[0]}.ogg", stats)
+
+
+def trim_silence(
+    samples: npt.NDArray[np.float32],
+    sample_rate: int,
+    *,
+    threshold_db: float = -40.0,
+    padding_seconds: float = 0.25,
+) -> npt.NDArray[np.float32]:
+    """Return ``samples`` without leading/trailing frames quieter than ``threshold_db``.
+
+    RMS is computed for 20 ms frames in one vectorized pass; ``padding_seconds``
+    of context is kept around the first and last voiced frames so word onsets
+    are not clipped. An all-silent input yields an empty array.
+    """
+    import numpy as np
+
+    frame = frame_length(sample_rate)
+    rms = frame_rms(samples, sample_rate)
+    if rms.size == 0:
+        return samples
+    voiced = np.flatnonzero(rms > 10 ** (threshold_db / 20))
+    if voiced.size == 0:
+        return samples[:0]
+    pad = int(sample_rate * padding_seconds)
+    start = max(int(voiced[0]) * frame - pad, 0)
+    end = min((int(voiced[-1]) + 1) * frame + pad, samples.size)
+    return samples[start:end]
+
+
+def frame_length(sample_rate: int) -> int:
+    """Samples per analysis frame (20 ms)."""
+    return max(int(sample_rate * FRAME_SECONDS), 1)
+
+
+def frame_rms(samples: npt.NDArray[np.float32], sample_rate: int) -> npt.NDArray[np.float64]:
+    """RMS of each full 20 ms frame, computed in a single vectorized pass."""
+    import numpy as np
+
+    frame = frame_length(sample_rate)
+    n_frames = samples.size // frame
+    frames = samples[: n_frames * frame].reshape(n_frames, frame)
+    return np.sqrt(np.mean(np.square(frames, dtype=np.float64), axis=1))
+
+
+def decode_mono(audio: bytes) -> tuple[npt.NDArray[np.float32], float]:
+    """Decode to float32 mono at ``TARGET_SAMPLE_RATE``; also return the source duration."""
+    import av
+    import numpy as np
+
+    resampler = av.AudioResampler(format="flt", layout="mono", rate=TARGET_SAMPLE_RATE)
+    chunks: list[npt.NDArray[np.float32]] = []
+    input_seconds = 0.0
+    with av.open(io.BytesIO(audio), mode="r") as container:
+        for frame in container.decode(audio=0):
+            input_seconds += frame.samples / frame.sample_rate
+            chunks.extend(out.to_ndarray()[0] for out in resampler.resample(frame))
+    chunks.extend(out.to_ndarray()[0] for out in resampler.resample(None))
+    if not chunks:
+        raise ValueError("No audio frames decoded.")
+    return np.concatenate(chunks).astype(np.float32, copy=False), input_seconds
+
+
+def encode_opus(samples: npt.NDArray[np.float32], bitrate: int) -> bytes:
+    """Encode mono float32 samples as OGG/Opus at ``TARGET_SAMPLE_RATE``."""
+    import av
+
+    buffer = io.BytesIO()
+    with av.open(buffer, mode="w", format="ogg") as container:
+        stream = container.add_stream("libopus", rate=TARGET_SAMPLE_RATE, layout="mono")
+        stream.bit_rate = bitrate
+        frame = av.AudioFrame.from_ndarray(samples.reshape(1, -1), format="flt", layout="mono")
+        frame.sample_rate = TARGET_SAMPLE_RATE
+        for packet in stream.encode(frame):
+            container.mux(packet)
+        for packet in stream.encode(None):
+            container.mux(packet)
+    return buffer.getvalue()
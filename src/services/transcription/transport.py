@@ -0,0 +1,251 @@
+"""Resilient transport for transcription API calls (Groq).
+
+Wraps each request with:
+
+- a semaphore capping concurrent calls to the provider;
+- jittered exponential retry for retryable errors (429, 408/409, 5xx,
+  connection errors and timeouts), honoring ``Retry-After``;
+- a per-call timeout (passed by the caller to the SDK);
+- a circuit breaker that fails fast while the provider keeps failing.
+
+``stats()`` exposes the breaker state and counters for monitoring.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import email.utils
+import logging
+import random
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from enum import StrEnum
+
+import groq
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS_CODES = frozenset({408, 409, 429})
+
+
+class CircuitState(StrEnum):
+    """Circuit breaker states."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised without calling the provider while the circuit is open."""
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker: open after ``failure_threshold``, probe after ``reset_timeout``.
+
+    In the half-open state a single probe call is let through; its outcome
+    closes the circuit again or re-opens it for another ``reset_timeout``.
+    A probe that ends without an outcome (cancelled, client error, unexpected
+    error) must call ``release_probe`` so the next call can probe instead.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> CircuitState:
+        """Current state (an expired open circuit reports half-open)."""
+        if (
+            self._state is CircuitState.OPEN
+            and time.monotonic() - self._opened_at >= self.reset_timeout
+        ):
+            return CircuitState.HALF_OPEN
+        return self._state
+
+    def allow(self) -> bool:
+        """Return True if a call may go to the provider now."""
+        state = self.state
+        if state is CircuitState.CLOSED:
+            return True
+        if state is CircuitState.HALF_OPEN and not self._probe_in_flight:
+            self._state = CircuitState.HALF_OPEN
+            self._probe_in_flight = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        """Close the circuit and reset the failure count."""
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._probe_in_flight = False
+
+    def release_probe(self) -> None:
+        """End the probe without an outcome; the next call is admitted as a new probe."""
+        if self._probe_in_flight:
+            self._probe_in_flight = False
+            self._state = CircuitState.OPEN  # still expired: reports half-open
+
+    def record_failure(self) -> None:
+        """Count a provider failure; open the circuit on threshold or failed probe."""
+        self._failures += 1
+        if self._state is CircuitState.HALF_OPEN or self._failures >= self.failure_threshold:
+            if self._state is not CircuitState.OPEN:
+                logger.warning("Circuit opened after %s consecutive failures", self._failures)
+            self._state = CircuitState.OPEN
+            self._opened_at = time.monotonic()
+        self._probe_in_flight = False
+
+
+@dataclass(frozen=True, slots=True)
+class TransportStats:
+    """Snapshot of the transport state and counters."""
+
+    state: CircuitState
+    in_flight: int
+    calls: int
+    successes: int
+    failures: int
+    retries: int
+    short_circuited: int
+
+
+class ResilientTransport:
+    """Run provider requests with a concurrency cap, retries and a circuit breaker."""
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        max_attempts: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 10.0,
+        breaker: CircuitBreaker | None = None,
+    ) -> None:
+        self.max_concurrency = max_concurrency
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.breaker = breaker or CircuitBreaker()
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._in_flight = 0
+        self._calls = 0
+        self._successes = 0
+        self._failures = 0
+        self._retries = 0
+        self._short_circuited = 0
+
+    async def call[T](self, request: Callable[[], Awaitable[T]]) -> T:
+        """Run ``request`` (a fresh awaitable per attempt) with the resilience policy.
+
+        Raises:
+            CircuitOpenError: The circuit is open; the provider was not called.
+            groq.APIError: Non-retryable error, or retries exhausted.
+        """
+        self._calls += 1
+        attempt = 1
+        while True:
+            probing = self.breaker.state is CircuitState.HALF_OPEN
+            if not self.breaker.allow():
+                self._short_circuited += 1
+                raise CircuitOpenError("Transcription provider unavailable (circuit open).")
+            try:
+                async with self._semaphore:
+                    self._in_flight += 1
+                    try:
+                        result = await request()
+                    finally:
+                        self._in_flight -= 1
+            except groq.APIError as exc:
+                retryable = is_retryable(exc)
+                if retryable:
+                    self.breaker.record_failure()
+                elif probing:
+                    # Client errors (400, 401, 413...) say nothing about provider
+                    # health: neither close the circuit nor reset the failure count
+                    self.breaker.release_probe()
+                delay = self._retry_delay(exc, attempt) if retryable else None
+                if delay is None:
+                    self._failures += 1
+                    raise
+                self._retries += 1
+                logger.warning(
+                    "Transcription call failed (%s); retry %s/%s in %.2fs",
+                    type(exc).__name__,
+                    attempt,
+                    self.max_attempts - 1,
+                    delay,
+                )
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            except BaseException:
+                # Cancelled (e.g. the hedged fallback won) or an unexpected error:
+                # no verdict on the provider, but the probe slot must be freed
+                if probing:
+                    self.breaker.release_probe()
+                raise
+            self.breaker.record_success()
+            self._successes += 1
+            return result
+
+    def stats(self) -> TransportStats:
+        """Return breaker state and call counters."""
+        return TransportStats(
+            state=self.breaker.state,
+            in_flight=self._in_flight,
+            calls=self._calls,
+            successes=self._successes,
+            failures=self._failures,
+            retries=self._retries,
+            short_circuited=self._short_circuited,
+        )
+
+    def _retry_delay(self, exc: groq.APIError, attempt: int) -> float | None:
+        """Seconds to wait before the next attempt, or None to give up."""
+        if attempt >= self.max_attempts:
+            return None
+        retry_after = _retry_after_seconds(exc)
+        if retry_after is not None:
+            # Waiting longer than max_delay would hold the user's job too long
+            return retry_after if retry_after <= self.max_delay else None
+        # Full jitter: spread retries of concurrent callers over the backoff window
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+
+def is_retryable(exc: groq.APIError) -> bool:
+    """Return True for rate limits, timeouts, connection errors and 5xx responses."""
+    if isinstance(exc, groq.APIConnectionError):  # includes APITimeoutError
+        return True
+    if isinstance(exc, groq.APIStatusError):
+        return exc.status_code in RETRYABLE_STATUS_CODES or exc.status_code >= 500
+    return False
+
+
+def _retry_after_seconds(exc: groq.APIError) -> float | None:
+    """Parse ``retry-after-ms`` / ``Retry-After`` (seconds or HTTP date) from the response."""
+    if not isinstance(exc, groq.APIStatusError):
+        return None
+    headers = exc.response.headers
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms is not None:
+        try:
+            return max(float(retry_after_ms) / 1000, 0.0)
+        except ValueError:
+            pass
+    retry_after = headers.get("retry-after")
+    if retry_after is None:
+        return None
+    try:
+        return max(float(retry_after), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(retry_after)
+    except (TypeError, ValueError):
+        return None
+    return max(retry_at.timestamp() - time.time(), 0.0)
@@ -1,10 +1,51 @@
 """Pytest configuration and fixtures."""
 
+from pathlib import Path
+from unittest.mock import patch
+
 import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
 from sqlmodel import Session, SQLModel, create_engine
 
 from src.bot.app import create_app
-from src.models import Card, Category, User  # noqa: F401 - register models for metadata
+from src.db.unit_of_work import UnitOfWork
+from src.models import (  # noqa: F401 - register models for metadata
+    Card,
+    Category,
+    CategoryPattern,
+    Expense,
+    ExtractionCacheEntry,
+    StoredAudio,
+    TranscriptionCacheEntry,
+    User,
+)
+from src.services.auth.cache import auth_user_cache
+from src.services.extraction.cache import extraction_cache
+from src.services.learning import category_pattern_index
+from src.services.transcription import audio_store
+from src.services.transcription.cache import transcription_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_process_caches():
+    """Reset process-wide caches so telegram/file ids and phrases do not leak across tests."""
+    auth_user_cache.clear()
+    transcription_cache.clear()
+    extraction_cache.clear()
+    category_pattern_index.clear()
+    yield
+    auth_user_cache.clear()
+    transcription_cache.clear()
+    extraction_cache.clear()
+    category_pattern_index.clear()
+
+
+@pytest.fixture(autouse=True)
+def isolated_audio_store(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """Point the retained-audio store at a per-test directory."""
+    monkeypatch.setattr(audio_store.settings, "AUDIO_STORE_DIR", str(tmp_path / "audio"))
+    monkeypatch.setattr(audio_store, "_audio_store", None)
+    yield
 
 
 @pytest.fixture(scope="function")
@@ -33,6 +74,41 @@ def db_session():
     SQLModel.metadata.drop_all(engine)
 
 
+@pytest.fixture(scope="function")
+async def test_engine(tmp_path: Path):
+    """Create a file-backed SQLite database shared by a sync and an async engine.
+
+    The async engine (aiosqlite) is patched into ``src.db.session`` so handlers
+    using ``get_async_session`` hit the test database. The sync engine is
+    yielded for arranging data and asserting results.
+
+    Yields:
+        Engine: sync SQLModel engine bound to the same database file
+    """
+    db_path = tmp_path / "test.db"
+    engine = create_engine(f"sqlite:///{db_path}", echo=False)
+    SQLModel.metadata.create_all(engine)
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}", echo=False)
+
+    with patch("src.db.session.async_engine", async_engine):
+        yield engine
+
+    await async_engine.dispose()
+    engine.dispose()
+
+
+@pytest.fixture(scope="function")
+async def uow(test_engine):
+    """Open a unit of work on the test database (what ``context.uow`` returns).
+
+    Yields:
+        UnitOfWork: unit of work to attach to mocked handler contexts
+    """
+    current = UnitOfWork()
+    yield current
+    await current.close()
+
+
 @pytest.fixture(scope="function")
 def bot_app():
     """Create a test Telegram bot application.
@@ -57,3 +133,18 @@ async def bot_app_async():
     await app.initialize()
     yield app
     await app.shutdown()
+
+
+def pytest_terminal_summary(terminalreporter):
+    """List what benchmarks recorded with ``record_property`` (run them with ``-m slow``)."""
+    reports = [
+        report
+        for report in terminalreporter.getreports("passed")
+        if report.when == "call" and report.user_properties
+    ]
+    if not reports:
+        return
+    terminalreporter.section("benchmarks")
+    for report in reports:
+        values = ", ".join(f"{name}={value}" for name, value in report.user_properties)
+        terminalreporter.write_line(f"{report.nodeid}: {values}")
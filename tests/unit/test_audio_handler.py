@@ -2,25 +2,43 @@
 
 from __future__ import annotations
 
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import ANY, AsyncMock, MagicMock, patch
 
 import pytest
+from sqlalchemy import Engine
+from sqlmodel import Session, select
 
-from src.bot.handlers.audio import audio_message_handler
-from src.services.transcription import TranscriptionError
+from src.bot.audio_jobs import AudioJobQueue
+from src.bot.handlers.audio import audio_message_handler, process_voice_job
+from src.db.unit_of_work import UnitOfWork
+from src.models import TranscriptionCacheEntry
+from src.services.transcription import (
+    GROQ_WHISPER_MODEL,
+    Transcript,
+    TranscriptionError,
+    transcription_cache,
+)
 
 
-@pytest.mark.asyncio
-async def test_audio_handler_rejects_audio_too_long() -> None:
-    """TEST-023: áudio > 60s deve responder com AUDIO.TOO_LONG e não transcrever."""
+def _voice_update(duration: int, file_unique_id: str, file_id: str = "file-id") -> MagicMock:
     update = MagicMock()
     message = MagicMock()
-    message.reply_text = AsyncMock()
+    message.reply_text = AsyncMock(return_value=MagicMock(edit_text=AsyncMock()))
     voice = MagicMock()
-    voice.duration = 61
-    voice.file_unique_id = "unique"
+    voice.duration = duration
+    voice.file_unique_id = file_unique_id
+    voice.file_id = file_id
+    voice.file_size = 3
     message.voice = voice
     update.message = message
+    return update
+
+
+@pytest.mark.asyncio
+async def test_audio_handler_rejects_audio_too_long() -> None:
+    """TEST-023: áudio > 60s deve responder com AUDIO.TOO_LONG e não transcrever."""
+    update = _voice_update(61, "unique")
+    message = update.message
 
     context = MagicMock()
 
@@ -30,7 +48,7 @@ async def test_audio_handler_rejects_audio_too_long() -> None:
             new=AsyncMock(return_value=MagicMock(id=1)),
         ),
         patch(
-            "src.bot.handlers.audio.transcribe_audio",
+            "src.bot.handlers.audio.transcribe",
             new=AsyncMock(),
         ) as transcribe_mock,
     ):
@@ -43,22 +61,18 @@ async def test_audio_handler_rejects_audio_too_long() -> None:
 
 
 @pytest.mark.asyncio
-async def test_audio_handler_success_calls_transcription_and_replies_preview() -> None:
-    """Happy path: áudio dentro do limite → transcrição chamada e preview enviado."""
-    update = MagicMock()
-    message = MagicMock()
-    message.reply_text = AsyncMock()
-    voice = MagicMock()
-    voice.duration = 10
-    voice.file_unique_id = "unique2"
-    voice.file_id = "file-id"
-    message.voice = voice
-    update.message = message
+async def test_audio_handler_success_calls_transcription_and_edits_preview(
+    test_engine: Engine, uow: UnitOfWork
+) -> None:
+    """Happy path: ack "processando…" imediato, job transcreve e edita com a prévia."""
+    update = _voice_update(10, "unique2")
+    message = update.message
 
-    context = MagicMock()
-    fake_file = MagicMock()
-    fake_file.download_to_drive = AsyncMock()
+    context = MagicMock(uow=uow)
+    fake_file = MagicMock(file_size=3)
+    fake_file.download_as_bytearray = AsyncMock(return_value=bytearray(b"ogg"))
     context.bot.get_file = AsyncMock(return_value=fake_file)
+    queue = AudioJobQueue(workers=1, max_size=4)
 
     with (
         patch(
@@ -69,38 +83,95 @@ async def test_audio_handler_success_calls_transcription_and_replies_preview() -
             "src.bot.handlers.audio.get_authenticated_user",
             new=AsyncMock(return_value=MagicMock(id=1)),
         ),
+        patch("src.bot.handlers.audio.get_audio_job_queue", return_value=queue),
         patch(
-            "src.bot.handlers.audio.transcribe_audio",
-            new=AsyncMock(return_value="gastei trinta reais no uber hoje"),
+            "src.bot.handlers.audio.transcribe",
+            new=AsyncMock(
+                return_value=Transcript("gastei trinta reais no uber hoje", GROQ_WHISPER_MODEL)
+            ),
         ) as transcribe_mock,
     ):
         await audio_message_handler(update, context)
+        message.reply_text.assert_awaited_once()
+        assert "Processando" in message.reply_text.await_args.args[0]
+        await queue.join()
+        await queue.stop()
 
     context.bot.get_file.assert_awaited_once_with("file-id")
-    fake_file.download_to_drive.assert_awaited()
-    transcribe_mock.assert_awaited()
-    message.reply_text.assert_awaited()
-    text = message.reply_text.await_args.args[0]
-    assert "Prévia da transcrição" in text
+    fake_file.download_as_bytearray.assert_awaited_once()
+    transcribe_mock.assert_awaited_once_with(
+        b"ogg", filename="unique2.ogg", language="pt", duration=10, on_progress=ANY
+    )
+    status_message = message.reply_text.return_value
+    status_message.edit_text.assert_awaited_once()
+    assert "Prévia da transcrição" in status_message.edit_text.await_args.args[0]
+
+    with Session(test_engine) as session:
+        entry = session.exec(select(TranscriptionCacheEntry)).one()
+    assert (entry.file_unique_id, entry.text, entry.audio_bytes) == (
+        "unique2",
+        "gastei trinta reais no uber hoje",
+        3,
+    )
 
 
 @pytest.mark.asyncio
-async def test_audio_handler_transcription_error_returns_audio_transcription_failed() -> None:
-    """Quando o serviço de transcrição falha, deve responder AUDIO.TRANSCRIPTION_FAILED."""
-    update = MagicMock()
-    message = MagicMock()
-    message.reply_text = AsyncMock()
-    voice = MagicMock()
-    voice.duration = 10
-    voice.file_unique_id = "unique3"
-    voice.file_id = "file-id-3"
-    message.voice = voice
-    update.message = message
+async def test_audio_handler_cache_hit_replies_without_download(
+    test_engine: Engine, uow: UnitOfWork
+) -> None:
+    """Áudio reenviado (mesmo file_unique_id) responde do cache, sem get_file/Groq."""
+    with Session(test_engine) as session:
+        session.add(
+            TranscriptionCacheEntry(
+                file_unique_id="forwarded",
+                language="pt",
+                model=GROQ_WHISPER_MODEL,
+                text="paguei cinquenta no mercado",
+                audio_bytes=4096,
+            )
+        )
+        session.commit()
 
-    context = MagicMock()
-    fake_file = MagicMock()
-    fake_file.download_to_drive = AsyncMock()
+    update = _voice_update(10, "forwarded")
+    in_transaction_on_reply: list[bool] = []
+    update.message.reply_text.side_effect = lambda *_: in_transaction_on_reply.append(
+        uow.session.in_transaction()
+    )
+    context = MagicMock(uow=uow)
+    context.bot.get_file = AsyncMock()
+    queue = MagicMock(full=MagicMock(return_value=False))
+
+    with (
+        patch(
+            "src.bot.handlers.audio.get_authenticated_user",
+            new=AsyncMock(return_value=MagicMock(id=1)),
+        ),
+        patch("src.bot.handlers.audio.get_audio_job_queue", return_value=queue),
+    ):
+        await audio_message_handler(update, context)
+
+    context.bot.get_file.assert_not_awaited()
+    queue.submit.assert_not_called()
+    text = update.message.reply_text.await_args.args[0]
+    assert "paguei cinquenta no mercado" in text
+    assert in_transaction_on_reply == [False]  # connection released before the reply
+    stats = transcription_cache.stats()
+    assert (stats.db_hits, stats.bytes_saved) == (1, 4096)
+
+
+@pytest.mark.asyncio
+async def test_audio_handler_transcription_error_returns_audio_transcription_failed(
+    test_engine: Engine, uow: UnitOfWork
+) -> None:
+    """Quando o serviço de transcrição falha, a mensagem vira AUDIO.TRANSCRIPTION_FAILED."""
+    update = _voice_update(10, "unique3", "file-id-3")
+    message = update.message
+
+    context = MagicMock(uow=uow)
+    fake_file = MagicMock(file_size=3)
+    fake_file.download_as_bytearray = AsyncMock(return_value=bytearray(b"ogg"))
     context.bot.get_file = AsyncMock(return_value=fake_file)
+    queue = AudioJobQueue(workers=1, max_size=4)
 
     with (
         patch(
@@ -111,13 +182,77 @@ async def test_audio_handler_transcription_error_returns_audio_transcription_fai
             "src.bot.handlers.audio.get_authenticated_user",
             new=AsyncMock(return_value=MagicMock(id=1)),
         ),
+        patch("src.bot.handlers.audio.get_audio_job_queue", return_value=queue),
         patch(
-            "src.bot.handlers.audio.transcribe_audio",
+            "src.bot.handlers.audio.transcribe",
             new=AsyncMock(side_effect=TranscriptionError("boom")),
         ),
     ):
         await audio_message_handler(update, context)
+        await queue.join()
+        await queue.stop()
 
-    message.reply_text.assert_awaited()
-    text = message.reply_text.await_args.args[0]
+    status_message = message.reply_text.return_value
+    text = status_message.edit_text.await_args.args[0]
     assert "AUDIO.TRANSCRIPTION_FAILED" in text
+
+
+@pytest.mark.asyncio
+async def test_audio_handler_full_queue_sheds_with_audio_queue_full(
+    test_engine: Engine, uow: UnitOfWork
+) -> None:
+    """Com a fila cheia, responde AUDIO.QUEUE_FULL sem enfileirar nem transcrever."""
+    update = _voice_update(10, "unique4")
+    message = update.message
+    queue = MagicMock(full=MagicMock(return_value=True))
+
+    with (
+        patch(
+            "src.bot.handlers.audio.get_authenticated_user",
+            new=AsyncMock(return_value=MagicMock(id=1)),
+        ),
+        patch("src.bot.handlers.audio.get_audio_job_queue", return_value=queue),
+    ):
+        await audio_message_handler(update, MagicMock(uow=uow))
+
+    message.reply_text.assert_awaited_once()
+    assert "AUDIO.QUEUE_FULL" in message.reply_text.await_args.args[0]
+    queue.submit.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_audio_handler_rejects_file_too_large() -> None:
+    """Arquivo acima do limite em memória responde AUDIO.TOO_LARGE sem enfileirar."""
+    update = _voice_update(10, "unique5")
+    update.message.voice.file_size = 10 * 1024 * 1024
+    queue = MagicMock(full=MagicMock(return_value=False))
+
+    with (
+        patch(
+            "src.bot.handlers.audio.get_authenticated_user",
+            new=AsyncMock(return_value=MagicMock(id=1)),
+        ),
+        patch("src.bot.handlers.audio.get_audio_job_queue", return_value=queue),
+    ):
+        await audio_message_handler(update, MagicMock())
+
+    assert "AUDIO.TOO_LARGE" in update.message.reply_text.await_args.args[0]
+    queue.submit.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_process_voice_job_rejects_oversized_download() -> None:
+    """Quando getFile não informa o tamanho, o limite vale para os bytes recebidos."""
+    status_message = MagicMock(edit_text=AsyncMock())
+    fake_file = MagicMock(file_size=None)
+    fake_file.download_as_bytearray = AsyncMock(return_value=bytearray(b"x" * 11))
+    bot = MagicMock(get_file=AsyncMock(return_value=fake_file))
+
+    with (
+        patch("src.bot.handlers.audio.MAX_AUDIO_FILE_SIZE_BYTES", 10),
+        patch("src.bot.handlers.audio.transcribe", new=AsyncMock()) as transcribe_mock,
+    ):
+        await process_voice_job(bot, status_message, "file-id", "unique6", 1)
+
+    assert "AUDIO.TOO_LARGE" in status_message.edit_text.await_args.args[0]
+    transcribe_mock.assert_not_awaited()
@@ -0,0 +1,80 @@
+"""Unit tests for the background audio job queue."""
+
+import asyncio
+
+import pytest
+
+from src.bot.audio_jobs import AudioJobQueue, AudioQueueFullError
+from src.db.unit_of_work import current_unit_of_work, unit_of_work
+
+
+async def test_workers_run_jobs_concurrently_up_to_worker_count() -> None:
+    queue = AudioJobQueue(workers=2, max_size=10)
+    peak = 0
+
+    async def job() -> None:
+        nonlocal peak
+        peak = max(peak, queue.stats().running)
+        await asyncio.sleep(0.01)
+
+    for _ in range(5):
+        queue.submit(job)
+    await queue.join()
+
+    stats = queue.stats()
+    assert peak == 2
+    assert (stats.processed, stats.failed, stats.queued) == (5, 0, 0)
+    await queue.stop()
+
+
+async def test_submit_sheds_load_when_queue_is_full() -> None:
+    queue = AudioJobQueue(workers=1, max_size=1)
+    release = asyncio.Event()
+
+    async def job() -> None:
+        await release.wait()
+
+    queue.submit(job)
+    await asyncio.sleep(0)  # worker takes the first job
+    queue.submit(job)
+    assert queue.full()
+    with pytest.raises(AudioQueueFullError):
+        queue.submit(job)
+    assert queue.stats().rejected == 1
+
+    release.set()
+    await queue.stop(timeout=1)
+
+
+async def test_failing_job_is_counted_and_worker_keeps_running() -> None:
+    queue = AudioJobQueue(workers=1, max_size=10)
+    done: list[int] = []
+
+    async def failing() -> None:
+        raise RuntimeError("boom")
+
+    async def ok() -> None:
+        done.append(1)
+
+    queue.submit(failing)
+    queue.submit(ok)
+    await queue.join()
+
+    assert done == [1]
+    assert queue.stats().failed == 1
+    await queue.stop()
+
+
+async def test_jobs_do_not_inherit_the_submitting_unit_of_work() -> None:
+    queue = AudioJobQueue(workers=1, max_size=10)
+    seen: list[object] = []
+
+    async def job() -> None:
+        seen.append(current_unit_of_work())
+
+    async with unit_of_work():
+        queue.submit(job)
+    await queue.join()
+
+    assert seen == [None]
+    await queue.stop()
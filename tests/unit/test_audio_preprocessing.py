@@ -0,0 +1,96 @@
+"""Unit tests for audio preprocessing before transcription."""
+
+from __future__ import annotations
+
+import io
+import sys
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.services.transcription import preprocess_audio, transcribe, trim_silence
+
+np = pytest.importorskip("numpy")
+av = pytest.importorskip("av")
+
+
+def _voice_note(silence: float = 1.0, speech: float = 1.0, rate: int = 48_000) -> bytes:
+    """Build a stereo 48 kHz OGG/Opus clip: silence, a tone, silence."""
+    n_silence, n_speech = int(rate * silence), int(rate * speech)
+    t = np.arange(n_speech) / rate
+    tone = (0.3 * np.sin(2 * np.pi * 440 * t)).astype(np.float32)
+    mono = np.concatenate([np.zeros(n_silence, np.float32), tone, np.zeros(n_silence, np.float32)])
+    buffer = io.BytesIO()
+    with av.open(buffer, mode="w", format="ogg") as container:
+        stream = container.add_stream("libopus", rate=rate, layout="stereo")
+        frame = av.AudioFrame.from_ndarray(np.stack([mono, mono]), format="fltp", layout="stereo")
+        frame.sample_rate = rate
+        for packet in stream.encode(frame):
+            container.mux(packet)
+        for packet in stream.encode(None):
+            container.mux(packet)
+    return buffer.getvalue()
+
+
+def test_trim_silence_keeps_voiced_span_with_padding() -> None:
+    rate = 16_000
+    samples = np.zeros(rate * 3, np.float32)
+    samples[rate : 2 * rate] = 0.5
+
+    trimmed = trim_silence(samples, rate, padding_seconds=0.1)
+
+    assert trimmed.size == rate + 2 * int(rate * 0.1)
+    assert trim_silence(np.zeros(rate, np.float32), rate).size == 0
+
+
+def test_preprocess_audio_trims_and_downmixes() -> None:
+    audio = _voice_note(silence=1.0, speech=1.0)
+
+    result = preprocess_audio(audio, "abc.oga", padding_seconds=0.1)
+
+    assert result.filename == "abc.ogg"
+    assert result.stats is not None
+    assert result.stats.input_seconds == pytest.approx(3.0, abs=0.05)
+    assert result.stats.output_seconds == pytest.approx(1.2, abs=0.05)
+    assert result.stats.bytes_saved > 0
+    with av.open(io.BytesIO(result.audio), mode="r") as container:
+        # Opus always decodes at 48 kHz; the encoder ran at 16 kHz mono
+        assert container.streams.audio[0].channels == 1
+
+
+def test_preprocess_audio_returns_original_when_undecodable() -> None:
+    result = preprocess_audio(b"not audio", "abc.ogg")
+
+    assert (result.audio, result.filename, result.stats) == (b"not audio", "abc.ogg", None)
+
+
+@pytest.mark.asyncio
+async def test_transcribe_uploads_original_audio_without_numpy() -> None:
+    audio = _voice_note()
+    backend = AsyncMock(return_value="texto")
+
+    with (
+        patch.dict(sys.modules, {"numpy": None}),  # NumPy cannot be imported
+        patch("src.services.transcription.hedging.settings.AUDIO_PREPROCESS_ENABLED", True),
+        patch("src.services.transcription.backends.transcribe_audio", new=backend),
+    ):
+        await transcribe(audio, filename="abc.ogg")
+
+    assert backend.await_args is not None
+    assert backend.await_args.args[0] == audio
+
+
+@pytest.mark.asyncio
+async def test_transcribe_uploads_preprocessed_audio_when_enabled() -> None:
+    audio = _voice_note()
+    backend = AsyncMock(return_value="texto")
+
+    with (
+        patch("src.services.transcription.hedging.settings.AUDIO_PREPROCESS_ENABLED", True),
+        patch("src.services.transcription.backends.transcribe_audio", new=backend),
+    ):
+        await transcribe(audio, filename="abc.ogg")
+
+    assert backend.await_args is not None
+    uploaded = backend.await_args.args[0]
+    assert len(uploaded) < len(audio)
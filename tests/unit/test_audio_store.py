@@ -0,0 +1,108 @@
+"""Unit tests for audio retention and the batched sweeper (RULE-009)."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy import Engine, event, update
+from sqlalchemy.orm import ORMExecuteState
+from sqlmodel import Session, select
+
+from src.bot.handlers.audio import process_voice_job
+from src.db.unit_of_work import UnitOfWork
+from src.models import StoredAudio
+from src.services.transcription import AudioStore, Transcript, get_audio_store
+
+NOW = datetime(2026, 10, 18, 12, 0, tzinfo=UTC)
+
+
+def test_path_for_is_sharded_and_stable(tmp_path: Path) -> None:
+    store = AudioStore(tmp_path)
+
+    path = store.path_for("AgADBAADr6cxG")
+
+    assert path == store.path_for("AgADBAADr6cxG")
+    assert path.parent.parent.parent == tmp_path
+    assert path.name.startswith(path.parent.parent.name + path.parent.name)
+
+
+@pytest.mark.asyncio
+async def test_put_then_get_round_trips_and_refreshes_expiry(
+    tmp_path: Path, test_engine: Engine, uow: UnitOfWork
+) -> None:
+    store = AudioStore(tmp_path, retention=timedelta(days=7))
+
+    await store.put(uow.session, "u1", b"ogg", now=NOW)
+    await store.put(uow.session, "u1", b"ogg2", now=NOW + timedelta(days=1))
+    await uow.session.commit()
+
+    assert await store.get("u1") == b"ogg2"
+    assert await store.get("missing") is None
+    with Session(test_engine) as session:
+        row = session.exec(select(StoredAudio)).one()
+    assert row.size_bytes == 4
+    assert row.expires_at == NOW + timedelta(days=8)
+
+
+@pytest.mark.asyncio
+async def test_sweep_removes_only_expired_files_in_batches(
+    tmp_path: Path, test_engine: Engine, uow: UnitOfWork
+) -> None:
+    store = AudioStore(tmp_path, retention=timedelta(days=7))
+    for n in range(5):
+        await store.put(uow.session, f"old{n}", b"x" * 10, now=NOW - timedelta(days=8))
+    await store.put(uow.session, "fresh", b"y" * 7, now=NOW)
+    await uow.session.commit()
+
+    result = await store.sweep(uow.session, now=NOW, batch_size=2)
+
+    assert (result.files, result.bytes_reclaimed) == (5, 50)
+    assert not store.path_for("old0").exists()
+    assert await store.get("fresh") == b"y" * 7
+    stats = await store.stats(uow.session)
+    assert (stats.files, stats.bytes_held, stats.bytes_reclaimed) == (1, 7, 50)
+
+
+@pytest.mark.asyncio
+async def test_sweep_keeps_file_of_row_refreshed_during_sweep(
+    tmp_path: Path, test_engine: Engine, uow: UnitOfWork
+) -> None:
+    store = AudioStore(tmp_path, retention=timedelta(days=7))
+    await store.put(uow.session, "resent", b"x" * 10, now=NOW - timedelta(days=8))
+    await uow.session.commit()
+
+    def put_before_delete(state: ORMExecuteState) -> None:
+        # A concurrent put refreshes the row after the sweep selected it
+        if state.is_delete:
+            state.session.execute(update(StoredAudio).values(expires_at=NOW + timedelta(days=7)))
+
+    event.listen(uow.session.sync_session, "do_orm_execute", put_before_delete)
+    result = await store.sweep(uow.session, now=NOW)
+
+    assert (result.files, result.bytes_reclaimed) == (0, 0)
+    assert await store.get("resent") == b"x" * 10
+
+
+@pytest.mark.asyncio
+async def test_voice_job_reuses_retained_audio_without_download(
+    test_engine: Engine, uow: UnitOfWork
+) -> None:
+    store = get_audio_store()
+    assert store is not None
+    await store.put(uow.session, "unique7", b"ogg")
+    await uow.session.commit()
+    bot = MagicMock(get_file=AsyncMock())
+    status_message = MagicMock(edit_text=AsyncMock())
+
+    with patch(
+        "src.bot.handlers.audio.transcribe",
+        new=AsyncMock(return_value=Transcript("texto", "groq")),
+    ) as transcribe_mock:
+        await process_voice_job(bot, status_message, "file-id", "unique7", 1)
+
+    bot.get_file.assert_not_awaited()
+    assert transcribe_mock.await_args is not None
+    assert transcribe_mock.await_args.args[0] == b"ogg"
@@ -0,0 +1,104 @@
+"""Unit tests for the authenticated-user cache (RULE-007, RULE-008)."""
+
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from sqlalchemy import Engine
+from sqlmodel import Session
+
+from src.bot.handlers.auth_helpers import get_authenticated_user
+from src.bot.handlers.login import login_ask_pin
+from src.db.unit_of_work import UnitOfWork
+from src.models import User
+from src.services.auth import hash_pin
+from src.services.auth.cache import AuthUserCache, CachedAuthUser, auth_user_cache
+
+
+def _snapshot(telegram_id: int) -> CachedAuthUser:
+    return CachedAuthUser(
+        id=telegram_id, telegram_id=telegram_id, locked_until=None, last_login=None
+    )
+
+
+def _update(telegram_id: int, text: str = "") -> MagicMock:
+    update = MagicMock()
+    update.effective_user = MagicMock(id=telegram_id)
+    update.message = MagicMock(text=text, reply_text=AsyncMock())
+    return update
+
+
+def test_cache_counts_hits_and_misses() -> None:
+    cache = AuthUserCache(max_size=10, ttl_seconds=60)
+    assert cache.get(1) is None
+    cache.put(_snapshot(1))
+    assert cache.get(1) == _snapshot(1)
+
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.size) == (1, 1, 1)
+    assert stats.hit_ratio == 0.5
+
+
+def test_cache_evicts_least_recently_used() -> None:
+    cache = AuthUserCache(max_size=2, ttl_seconds=60)
+    cache.put(_snapshot(1))
+    cache.put(_snapshot(2))
+    cache.get(1)
+    cache.put(_snapshot(3))
+
+    assert cache.get(2) is None
+    assert cache.get(1) is not None
+    assert cache.get(3) is not None
+    assert cache.stats().evictions == 1
+
+
+def test_cache_entries_expire_after_ttl() -> None:
+    cache = AuthUserCache(max_size=10, ttl_seconds=60)
+    with patch("src.services.auth.cache.time.monotonic", return_value=1000.0):
+        cache.put(_snapshot(1))
+    with patch("src.services.auth.cache.time.monotonic", return_value=1059.0):
+        assert cache.get(1) is not None
+    with patch("src.services.auth.cache.time.monotonic", return_value=1060.0):
+        assert cache.get(1) is None
+    assert cache.stats().size == 0
+
+
+def test_cache_invalidate_drops_entry() -> None:
+    cache = AuthUserCache(max_size=10, ttl_seconds=60)
+    cache.put(_snapshot(1))
+    cache.invalidate(1)
+    cache.invalidate(2)  # unknown ids are ignored
+    assert cache.get(1) is None
+
+
+async def test_get_authenticated_user_cached_check_skips_database(test_engine: Engine) -> None:
+    """Second auth check for the same telegram_id never opens a session."""
+    with Session(test_engine) as session:
+        session.add(User(telegram_id=3001, pin_hash=hash_pin("1234"), last_login=datetime.now(UTC)))
+        session.commit()
+
+    first_uow = UnitOfWork()
+    first = await get_authenticated_user(_update(3001), MagicMock(uow=first_uow))
+    await first_uow.close()
+    assert first is not None
+
+    second_uow = UnitOfWork()
+    second = await get_authenticated_user(_update(3001), MagicMock(uow=second_uow))
+    assert second == first
+    assert second_uow._session is None
+    assert auth_user_cache.stats().hits == 1
+
+
+async def test_login_invalidates_cached_user(test_engine: Engine, uow: UnitOfWork) -> None:
+    """After a successful /login the stale expired-session entry is dropped."""
+    with Session(test_engine) as session:
+        session.add(User(telegram_id=3002, pin_hash=hash_pin("1234")))
+        session.commit()
+
+    expired = await get_authenticated_user(_update(3002), MagicMock(uow=uow))
+    assert expired is None
+    assert auth_user_cache.stats().size == 1
+
+    await login_ask_pin(_update(3002, "1234"), MagicMock(uow=uow))
+    assert auth_user_cache.stats().size == 0
+
+    assert await get_authenticated_user(_update(3002), MagicMock(uow=uow)) is not None
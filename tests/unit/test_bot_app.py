@@ -0,0 +1,67 @@
+"""Unit tests for bot application wiring and run modes."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.bot import app as bot_app_module
+from src.bot.app import create_app, main, run_webhook
+from src.bot.update_processor import UserOrderedUpdateProcessor
+
+
+def test_create_app_uses_user_ordered_update_processor() -> None:
+    with patch.object(bot_app_module.settings, "BOT_CONCURRENT_UPDATES", 8):
+        application = create_app()
+    processor = application.update_processor
+    assert isinstance(processor, UserOrderedUpdateProcessor)
+    assert processor.max_running == 8
+    assert processor.max_concurrent_updates > 1
+
+
+def test_main_uses_polling_by_default() -> None:
+    application = MagicMock()
+    with (
+        patch.object(bot_app_module, "create_app", return_value=application),
+        patch.object(bot_app_module.settings, "BOT_MODE", "polling"),
+    ):
+        main()
+    application.run_polling.assert_called_once()
+    application.run_webhook.assert_not_called()
+
+
+def test_main_webhook_mode_passes_listen_path_and_secret() -> None:
+    application = MagicMock()
+    settings = bot_app_module.settings
+    with (
+        patch.object(bot_app_module, "create_app", return_value=application),
+        patch.object(settings, "BOT_MODE", "webhook"),
+        patch.object(settings, "WEBHOOK_URL", "https://bot.example.com/"),
+        patch.object(settings, "WEBHOOK_PATH", "/tg-hook"),
+        patch.object(settings, "WEBHOOK_LISTEN", "127.0.0.1"),
+        patch.object(settings, "WEBHOOK_PORT", 9000),
+        patch.object(settings, "WEBHOOK_SECRET_TOKEN", "s3cret"),
+    ):
+        main()
+    application.run_polling.assert_not_called()
+    application.run_webhook.assert_called_once_with(
+        listen="127.0.0.1",
+        port=9000,
+        url_path="tg-hook",
+        webhook_url="https://bot.example.com/tg-hook",
+        secret_token="s3cret",
+    )
+
+
+def test_run_webhook_requires_url_and_secret() -> None:
+    settings = bot_app_module.settings
+    with (
+        patch.object(settings, "WEBHOOK_URL", None),
+        pytest.raises(ValueError, match="WEBHOOK_URL"),
+    ):
+        run_webhook(MagicMock())
+    with (
+        patch.object(settings, "WEBHOOK_URL", "https://bot.example.com"),
+        patch.object(settings, "WEBHOOK_SECRET_TOKEN", None),
+        pytest.raises(ValueError, match="WEBHOOK_SECRET_TOKEN"),
+    ):
+        run_webhook(MagicMock())
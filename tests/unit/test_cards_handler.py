@@ -1,30 +1,28 @@
 """Unit tests for card CRUD handlers (FEAT-010): add_cartao, list_cartoes, delete_cartao."""
 
 from datetime import UTC, datetime, timedelta
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
+from sqlalchemy import Engine
 from sqlmodel import Session, select
 
 from src.bot.handlers.auth_helpers import get_authenticated_user
+from src.db.unit_of_work import UnitOfWork
 from src.models import Card, User
 from src.services.auth import hash_pin
 
 
 @pytest.mark.asyncio
-async def test_get_authenticated_user_no_user_replies_start() -> None:
+async def test_get_authenticated_user_no_user_replies_start(
+    test_engine: Engine, uow: UnitOfWork
+) -> None:
     """When telegram user is not in DB, reply to use /start."""
-    from sqlmodel import SQLModel, create_engine
-
-    test_engine = create_engine("sqlite:///:memory:")
-    SQLModel.metadata.create_all(test_engine)
-
     update = MagicMock()
     update.effective_user = MagicMock(id=99999)
     update.message = MagicMock(reply_text=AsyncMock())
 
-    with patch("src.bot.handlers.auth_helpers.engine", test_engine):
-        result = await get_authenticated_user(update)
+    result = await get_authenticated_user(update, MagicMock(uow=uow))
     assert result is None
     update.message.reply_text.assert_called_once()
     text = update.message.reply_text.call_args[0][0]
@@ -32,12 +30,10 @@ async def test_get_authenticated_user_no_user_replies_start() -> None:
 
 
 @pytest.mark.asyncio
-async def test_get_authenticated_user_session_expired_replies_code() -> None:
+async def test_get_authenticated_user_session_expired_replies_code(
+    test_engine: Engine, uow: UnitOfWork
+) -> None:
     """When last_login is older than 24h, reply AUTH.SESSION_EXPIRED."""
-    from sqlmodel import SQLModel, create_engine
-
-    test_engine = create_engine("sqlite:///:memory:")
-    SQLModel.metadata.create_all(test_engine)
     with Session(test_engine) as session:
         user = User(
             telegram_id=11111,
@@ -51,8 +47,7 @@ async def test_get_authenticated_user_session_expired_replies_code() -> None:
     update.effective_user = MagicMock(id=11111)
     update.message = MagicMock(reply_text=AsyncMock())
 
-    with patch("src.bot.handlers.auth_helpers.engine", test_engine):
-        result = await get_authenticated_user(update)
+    result = await get_authenticated_user(update, MagicMock(uow=uow))
     assert result is None
     update.message.reply_text.assert_called_once()
     text = update.message.reply_text.call_args[0][0]
@@ -113,31 +108,23 @@ async def test_add_cartao_closing_day_rejects_invalid() -> None:
 
 
 @pytest.mark.asyncio
-async def test_add_cartao_start_requires_auth() -> None:
+async def test_add_cartao_start_requires_auth(test_engine: Engine, uow: UnitOfWork) -> None:
     """add_cartao_start: when not authenticated, replies and END."""
-    from sqlmodel import SQLModel, create_engine
-
     from src.bot.handlers.cards import add_cartao_start
 
-    test_engine = create_engine("sqlite:///:memory:")
-    SQLModel.metadata.create_all(test_engine)
-
     update = MagicMock()
     update.effective_user = MagicMock(id=99999)
     update.message = MagicMock(reply_text=AsyncMock())
-    context = MagicMock(user_data={})
+    context = MagicMock(user_data={}, uow=uow)
 
-    with patch("src.bot.handlers.auth_helpers.engine", test_engine):
-        result = await add_cartao_start(update, context)
+    result = await add_cartao_start(update, context)
     assert result == -1  # ConversationHandler.END
     update.message.reply_text.assert_called_once()
 
 
 @pytest.mark.asyncio
-async def test_add_cartao_full_flow_saves_card() -> None:
+async def test_add_cartao_full_flow_saves_card(test_engine: Engine, uow: UnitOfWork) -> None:
     """TEST-010 (happy path): add_cartao flow creates card and replies with summary."""
-    from sqlmodel import SQLModel, create_engine
-
     from src.bot.handlers.cards import (
         add_cartao_closing_day,
         add_cartao_due_day,
@@ -146,8 +133,6 @@ async def test_add_cartao_full_flow_saves_card() -> None:
         add_cartao_start,
     )
 
-    test_engine = create_engine("sqlite:///:memory:")
-    SQLModel.metadata.create_all(test_engine)
     with Session(test_engine) as session:
         user = User(
             telegram_id=55555,
@@ -163,34 +148,30 @@ async def test_add_cartao_full_flow_saves_card() -> None:
     update = MagicMock()
     update.effective_user = MagicMock(id=55555)
     update.message = MagicMock(reply_text=AsyncMock())
-    context = MagicMock(user_data={})
+    context = MagicMock(user_data={}, uow=uow)
 
-    with (
-        patch("src.bot.handlers.auth_helpers.engine", test_engine),
-        patch("src.bot.handlers.cards.engine", test_engine),
-    ):
-        res = await add_cartao_start(update, context)
-        assert res == 0
-        update.message.reply_text.reset_mock()
-
-        update.message.text = "Nubank"
-        res = await add_cartao_name(update, context)
-        assert res == 1
-        update.message.reply_text.reset_mock()
-
-        update.message.text = "1234"
-        res = await add_cartao_last_digits(update, context)
-        assert res == 2
-        update.message.reply_text.reset_mock()
-
-        update.message.text = "10"
-        res = await add_cartao_closing_day(update, context)
-        assert res == 3
-        update.message.reply_text.reset_mock()
-
-        update.message.text = "18"
-        res = await add_cartao_due_day(update, context)
-        assert res == -1  # END
+    res = await add_cartao_start(update, context)
+    assert res == 0
+    update.message.reply_text.reset_mock()
+
+    update.message.text = "Nubank"
+    res = await add_cartao_name(update, context)
+    assert res == 1
+    update.message.reply_text.reset_mock()
+
+    update.message.text = "1234"
+    res = await add_cartao_last_digits(update, context)
+    assert res == 2
+    update.message.reply_text.reset_mock()
+
+    update.message.text = "10"
+    res = await add_cartao_closing_day(update, context)
+    assert res == 3
+    update.message.reply_text.reset_mock()
+
+    update.message.text = "18"
+    res = await add_cartao_due_day(update, context)
+    assert res == -1  # END
 
     # Check DB
     with Session(test_engine) as session:
@@ -212,3 +193,40 @@ async def test_add_cartao_full_flow_saves_card() -> None:
     assert "✅ Cartão cadastrado!" in text
     assert "Nubank" in text and "1234" in text
     assert "Fechamento: dia 10" in text and "Vencimento: dia 18" in text
+
+
+@pytest.mark.asyncio
+async def test_add_cartao_due_day_duplicate_name_returns_card_duplicate(
+    test_engine: Engine, uow: UnitOfWork
+) -> None:
+    """Saving a card whose name already exists (case-insensitive) -> CARD.DUPLICATE."""
+    from src.bot.handlers.cards import add_cartao_due_day
+
+    with Session(test_engine) as session:
+        user = User(telegram_id=44444, pin_hash=hash_pin("1234"), last_login=datetime.now(UTC))
+        session.add(user)
+        session.commit()
+        session.refresh(user)
+        user_id = user.id
+        assert user_id is not None
+        session.add(
+            Card(user_id=user_id, name="Nubank", last_digits="1111", closing_day=1, due_day=10)
+        )
+        session.commit()
+
+    update = MagicMock()
+    update.effective_user = MagicMock(id=44444)
+    update.message = MagicMock(text="18", reply_text=AsyncMock())
+    context = MagicMock(
+        user_data={"card_name": "NUBANK", "card_last_digits": "2222", "card_closing_day": 10},
+        uow=uow,
+    )
+
+    result = await add_cartao_due_day(update, context)
+
+    assert result == 3  # CARD_DUE_DAY state
+    text = update.message.reply_text.call_args[0][0]
+    assert "CARD.DUPLICATE" in text
+    with Session(test_engine) as session:
+        stmt = select(Card).where(Card.user_id == user_id)
+        assert len(list(session.exec(stmt).all())) == 1
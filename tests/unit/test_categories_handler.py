@@ -4,47 +4,41 @@ Includes add_categoria, list_categorias and delete_categoria handlers.
 """
 
 from datetime import UTC, datetime
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
-from sqlmodel import Session, SQLModel, create_engine, select
+from sqlalchemy import Engine
+from sqlmodel import Session, select
 
 from src.bot.handlers.auth_helpers import get_authenticated_user
 from src.db.seed import DEFAULT_CATEGORY_NAMES, seed_default_categories
+from src.db.unit_of_work import UnitOfWork
 from src.models import Category, User
 from src.services.auth import hash_pin
 
 
 @pytest.mark.asyncio
-async def test_add_categoria_requires_auth() -> None:
+async def test_add_categoria_requires_auth(test_engine: Engine, uow: UnitOfWork) -> None:
     """add_categoria_handler: when not authenticated, replies and returns."""
     from src.bot.handlers.categories import add_categoria_handler
 
-    test_engine = create_engine("sqlite:///:memory:")
-    SQLModel.metadata.create_all(test_engine)
-
     update = MagicMock()
     update.effective_user = MagicMock(id=99999)
     update.message = MagicMock(text="/add_categoria Mercado", reply_text=AsyncMock())
-    context = MagicMock()
+    context = MagicMock(uow=uow)
 
-    with patch("src.bot.handlers.auth_helpers.engine", test_engine):
-        result = await get_authenticated_user(update)
+    result = await get_authenticated_user(update, context)
     assert result is None
 
     # If not authenticated, handler should early-return without raising
-    with patch("src.bot.handlers.auth_helpers.engine", test_engine):
-        await add_categoria_handler(update, context)
+    await add_categoria_handler(update, context)
 
 
 @pytest.mark.asyncio
-async def test_add_categoria_creates_custom_category() -> None:
+async def test_add_categoria_creates_custom_category(test_engine: Engine, uow: UnitOfWork) -> None:
     """Happy path: /add_categoria Mercado creates a new custom category."""
     from src.bot.handlers.categories import add_categoria_handler
 
-    test_engine = create_engine("sqlite:///:memory:")
-    SQLModel.metadata.create_all(test_engine)
-
     # Create authenticated user
     with Session(test_engine) as session:
         user = User(
@@ -61,13 +55,9 @@ async def test_add_categoria_creates_custom_category() -> None:
     update = MagicMock()
     update.effective_user = MagicMock(id=55555)
     update.message = MagicMock(text="/add_categoria Mercado", reply_text=AsyncMock())
-    context = MagicMock()
+    context = MagicMock(uow=uow)
 
-    with (
-        patch("src.bot.handlers.auth_helpers.engine", test_engine),
-        patch("src.bot.handlers.categories.engine", test_engine),
-    ):
-        await add_categoria_handler(update, context)
+    await add_categoria_handler(update, context)
 
     # Check DB: one custom category plus no defaults (seed not called here)
     with Session(test_engine) as session:
@@ -83,13 +73,12 @@ async def test_add_categoria_creates_custom_category() -> None:
 
 
 @pytest.mark.asyncio
-async def test_list_categorias_includes_default_and_custom() -> None:
+async def test_list_categorias_includes_default_and_custom(
+    test_engine: Engine, uow: UnitOfWork
+) -> None:
     """list_categorias_handler: lists default + custom categories."""
     from src.bot.handlers.categories import list_categorias_handler
 
-    test_engine = create_engine("sqlite:///:memory:")
-    SQLModel.metadata.create_all(test_engine)
-
     # Create user and seed defaults + one custom category
     with Session(test_engine) as session:
         user = User(
@@ -116,13 +105,9 @@ async def test_list_categorias_includes_default_and_custom() -> None:
     update = MagicMock()
     update.effective_user = MagicMock(id=77777)
     update.message = MagicMock(text="/list_categorias", reply_text=AsyncMock())
-    context = MagicMock()
+    context = MagicMock(uow=uow)
 
-    with (
-        patch("src.bot.handlers.auth_helpers.engine", test_engine),
-        patch("src.bot.handlers.categories.engine", test_engine),
-    ):
-        await list_categorias_handler(update, context)
+    await list_categorias_handler(update, context)
 
     update.message.reply_text.assert_called_once()
     text = update.message.reply_text.call_args[0][0]
@@ -133,13 +118,10 @@ async def test_list_categorias_includes_default_and_custom() -> None:
 
 
 @pytest.mark.asyncio
-async def test_delete_categoria_cannot_delete_default() -> None:
+async def test_delete_categoria_cannot_delete_default(test_engine: Engine, uow: UnitOfWork) -> None:
     """/delete_categoria on default category -> CATEGORY.CANNOT_DELETE_DEFAULT."""
     from src.bot.handlers.categories import delete_categoria_handler
 
-    test_engine = create_engine("sqlite:///:memory:")
-    SQLModel.metadata.create_all(test_engine)
-
     # Create user and seed default categories
     with Session(test_engine) as session:
         user = User(
@@ -165,13 +147,9 @@ async def test_delete_categoria_cannot_delete_default() -> None:
     update = MagicMock()
     update.effective_user = MagicMock(id=88888)
     update.message = MagicMock(text=f"/delete_categoria {default_id}", reply_text=AsyncMock())
-    context = MagicMock()
+    context = MagicMock(uow=uow)
 
-    with (
-        patch("src.bot.handlers.auth_helpers.engine", test_engine),
-        patch("src.bot.handlers.categories.engine", test_engine),
-    ):
-        await delete_categoria_handler(update, context)
+    await delete_categoria_handler(update, context)
 
     update.message.reply_text.assert_called_once()
     text = update.message.reply_text.call_args[0][0]
@@ -179,13 +157,10 @@ async def test_delete_categoria_cannot_delete_default() -> None:
 
 
 @pytest.mark.asyncio
-async def test_delete_categoria_soft_deletes_custom() -> None:
+async def test_delete_categoria_soft_deletes_custom(test_engine: Engine, uow: UnitOfWork) -> None:
     """/delete_categoria on custom category marks deleted_at."""
     from src.bot.handlers.categories import delete_categoria_handler
 
-    test_engine = create_engine("sqlite:///:memory:")
-    SQLModel.metadata.create_all(test_engine)
-
     # Create user and one custom category
     with Session(test_engine) as session:
         user = User(
@@ -209,13 +184,9 @@ async def test_delete_categoria_soft_deletes_custom() -> None:
     update = MagicMock()
     update.effective_user = MagicMock(id=99999)
     update.message = MagicMock(text=f"/delete_categoria {category_id}", reply_text=AsyncMock())
-    context = MagicMock()
+    context = MagicMock(uow=uow)
 
-    with (
-        patch("src.bot.handlers.auth_helpers.engine", test_engine),
-        patch("src.bot.handlers.categories.engine", test_engine),
-    ):
-        await delete_categoria_handler(update, context)
+    await delete_categoria_handler(update, context)
 
     update.message.reply_text.assert_called_once()
     text = update.message.reply_text.call_args[0][0]
@@ -226,3 +197,62 @@ async def test_delete_categoria_soft_deletes_custom() -> None:
         category = session.exec(stmt).first()
         assert category is not None
         assert category.deleted_at is not None
+
+
+@pytest.mark.asyncio
+async def test_add_categoria_duplicate_name_is_case_insensitive(
+    test_engine: Engine, uow: UnitOfWork
+) -> None:
+    """/add_categoria with an existing active name (any case) -> CATEGORY.DUPLICATE."""
+    from src.bot.handlers.categories import add_categoria_handler
+
+    with Session(test_engine) as session:
+        user = User(telegram_id=66666, pin_hash=hash_pin("1234"), last_login=datetime.now(UTC))
+        session.add(user)
+        session.commit()
+        session.refresh(user)
+        user_id = user.id
+        assert user_id is not None
+        session.add(Category(user_id=user_id, name="Mercado", is_default=False))
+        session.commit()
+
+    update = MagicMock()
+    update.effective_user = MagicMock(id=66666)
+    update.message = MagicMock(text="/add_categoria MERCADO", reply_text=AsyncMock())
+
+    await add_categoria_handler(update, MagicMock(uow=uow))
+
+    text = update.message.reply_text.call_args[0][0]
+    assert "CATEGORY.DUPLICATE" in text
+    with Session(test_engine) as session:
+        stmt = select(Category).where(Category.user_id == user_id)
+        assert len(list(session.exec(stmt).all())) == 1
+
+
+@pytest.mark.asyncio
+async def test_add_categoria_reuses_name_of_deleted_category(
+    test_engine: Engine, uow: UnitOfWork
+) -> None:
+    """The unique index only covers active rows: a soft-deleted name can be reused."""
+    from src.bot.handlers.categories import add_categoria_handler
+
+    with Session(test_engine) as session:
+        user = User(telegram_id=66667, pin_hash=hash_pin("1234"), last_login=datetime.now(UTC))
+        session.add(user)
+        session.commit()
+        session.refresh(user)
+        user_id = user.id
+        assert user_id is not None
+        session.add(
+            Category(user_id=user_id, name="Uber", is_default=False, deleted_at=datetime.now(UTC))
+        )
+        session.commit()
+
+    update = MagicMock()
+    update.effective_user = MagicMock(id=66667)
+    update.message = MagicMock(text="/add_categoria uber", reply_text=AsyncMock())
+
+    await add_categoria_handler(update, MagicMock(uow=uow))
+
+    text = update.message.reply_text.call_args[0][0]
+    assert "✅ Categoria cadastrada: uber" in text
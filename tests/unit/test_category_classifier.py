@@ -0,0 +1,103 @@
+"""Unit tests for the per-user Naive Bayes category classifier (FEAT-004)."""
+
+from __future__ import annotations
+
+import time
+
+import pytest
+from sqlalchemy import Engine
+from sqlmodel import Session
+
+from src.db.unit_of_work import UnitOfWork
+from src.models import Category, User
+from src.services.learning import CategoryPatternIndex, NaiveBayesClassifier
+
+TRAINING = {
+    "Transporte": ["uber", "uber centro", "taxi aeroporto", "onibus", "metro", "uber trabalho"],
+    "Mercado": ["mercado", "feira", "supermercado extra", "padaria", "acougue", "mercado dia"],
+}
+
+
+def _seed(test_engine: Engine) -> tuple[int, dict[str, int]]:
+    """Create a user with the TRAINING categories; return (user_id, ids by name)."""
+    with Session(test_engine) as session:
+        user = User(telegram_id=515151, pin_hash="x")
+        session.add(user)
+        session.commit()
+        assert user.id is not None
+        categories = [Category(user_id=user.id, name=name) for name in TRAINING]
+        session.add_all(categories)
+        session.commit()
+        return user.id, {c.name: c.id for c in categories if c.id is not None}
+
+
+def test_predicts_from_known_words_only() -> None:
+    classifier = NaiveBayesClassifier()
+    for description in TRAINING["Transporte"]:
+        classifier.learn(description, 1)
+    for description in TRAINING["Mercado"]:
+        classifier.learn(description, 2, weight=2)
+
+    prediction = classifier.predict("uber aeroporto")
+    assert prediction is not None
+    assert prediction[0] == 1 and prediction[1] > 0.9
+    assert classifier.predict("cinema") is None  # only the prior: no prediction
+    assert (classifier.documents, classifier.category_documents(2)) == (18, 12)
+
+    classifier.forget(1)
+    assert classifier.category_ids == [2]
+    assert classifier.predict("uber aeroporto") is None
+
+
+@pytest.mark.asyncio
+async def test_classifier_sits_between_patterns_and_llm(
+    test_engine: Engine, uow: UnitOfWork
+) -> None:
+    user_id, ids = _seed(test_engine)
+    index = CategoryPatternIndex(classifier_min_documents=12, classifier_min_probability=0.9)
+    assert await index.suggest(uow.session, user_id, "uber aeroporto") is None  # warm, empty
+    for name, descriptions in TRAINING.items():
+        for description in descriptions:
+            await index.record_confirmation(user_id, description, ids[name])
+    await index.flush()
+
+    learned = await index.suggest(uow.session, user_id, "Uber Aeroporto")  # trained in place
+    index.invalidate(user_id)
+    suggestion = await index.suggest(uow.session, user_id, "Uber Aeroporto")  # from the table
+    assert suggestion is not None and learned == suggestion
+    assert (suggestion.category_id, suggestion.source) == (ids["Transporte"], "classifier")
+    assert suggestion.score >= 0.9
+    assert await index.suggest(uow.session, user_id, "cinema") is None
+
+    assert await index.compare_with_llm(uow.session, user_id, "feira dia", ids["Mercado"])
+    assert not await index.compare_with_llm(uow.session, user_id, "metro", ids["Mercado"])
+    assert await index.compare_with_llm(uow.session, user_id, "cinema", ids["Mercado"]) is None
+    stats = index.stats()
+    assert (stats.classifier_hits, stats.lookups) == (2, 4)
+    assert stats.classifier_accuracy == 0.5
+
+
+@pytest.mark.asyncio
+async def test_classifier_waits_for_min_documents(test_engine: Engine, uow: UnitOfWork) -> None:
+    user_id, ids = _seed(test_engine)
+    index = CategoryPatternIndex(classifier_min_documents=20)
+    for description in TRAINING["Transporte"]:
+        await index.record_confirmation(user_id, description, ids["Transporte"])
+    await index.flush()
+
+    assert await index.suggest(uow.session, user_id, "uber aeroporto") is None
+
+
+@pytest.mark.slow
+def test_prediction_costs_microseconds() -> None:
+    classifier = NaiveBayesClassifier()
+    for category_id in range(20):
+        for n in range(50):
+            classifier.learn(f"loja{category_id} item{n} compra", category_id)
+
+    start = time.perf_counter()
+    for _ in range(1000):
+        classifier.predict("loja7 item3 compra")
+    per_prediction_ms = (time.perf_counter() - start) / 1000 * 1000
+
+    assert per_prediction_ms < 0.5
@@ -0,0 +1,275 @@
+"""Unit tests for the in-memory category pattern index (FEAT-004, RULE-003)."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime
+
+import pytest
+from sqlalchemy import Engine, event
+from sqlalchemy.exc import OperationalError
+from sqlmodel import Session, select
+
+from src.db import session as db_session
+from src.db.unit_of_work import UnitOfWork
+from src.models import Category, CategoryPattern, User
+from src.services.learning import (
+    CategoryPatternIndex,
+    TrigramIndex,
+    normalize_description,
+    similarity,
+)
+from src.services.learning import patterns as patterns_module
+
+
+def _seed(test_engine: Engine) -> tuple[int, int, int]:
+    """Create a user with two categories; return (user_id, transporte_id, lazer_id)."""
+    with Session(test_engine) as session:
+        user = User(telegram_id=424242, pin_hash="x")
+        session.add(user)
+        session.commit()
+        assert user.id is not None
+        transporte = Category(user_id=user.id, name="Transporte")
+        lazer = Category(user_id=user.id, name="Lazer")
+        session.add_all([transporte, lazer])
+        session.commit()
+        assert transporte.id is not None and lazer.id is not None
+        return user.id, transporte.id, lazer.id
+
+
+def test_normalize_description_matches_rule_005() -> None:
+    assert normalize_description("  Açaí da Esquina ") == "acai da esquina"
+    assert normalize_description("UBER") == "uber"
+
+
+@pytest.mark.asyncio
+async def test_suggests_only_after_three_confirmations(
+    test_engine: Engine, uow: UnitOfWork
+) -> None:
+    user_id, transporte_id, _ = _seed(test_engine)
+    index = CategoryPatternIndex(min_confirmations=3)
+
+    for _ in range(3):
+        assert await index.suggest(uow.session, user_id, "Uber") is None
+        await index.record_confirmation(user_id, " uber ", transporte_id)
+        await index.flush()
+
+    suggestion = await index.suggest(uow.session, user_id, "UBER")
+    assert suggestion is not None
+    assert (suggestion.category_id, suggestion.confirmation_count) == (transporte_id, 3)
+    with Session(test_engine) as session:
+        row = session.exec(select(CategoryPattern)).one()
+    assert (row.description_normalized, row.confirmation_count) == ("uber", 3)
+
+
+@pytest.mark.asyncio
+async def test_lookups_after_warm_do_not_query(test_engine: Engine, uow: UnitOfWork) -> None:
+    user_id, transporte_id, _ = _seed(test_engine)
+    with Session(test_engine) as session:
+        session.add(
+            CategoryPattern(
+                user_id=user_id,
+                description_normalized="uber",
+                category_id=transporte_id,
+                confirmation_count=5,
+                last_used_at=datetime.now(UTC),
+            )
+        )
+        session.commit()
+    index = CategoryPatternIndex()
+    statements: list[str] = []
+
+    def count(*args: object) -> None:
+        statements.append(str(args[2]))
+
+    await index.suggest(uow.session, user_id, "uber")  # warm
+    engine = db_session.async_engine.sync_engine  # the test database (patched)
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        for _ in range(100):
+            assert await index.suggest(uow.session, user_id, "Uber") is not None
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+
+    assert statements == []
+    assert (index.stats().warms, index.stats().hits) == (1, 101)
+
+
+@pytest.mark.asyncio
+async def test_best_category_and_deleted_category(test_engine: Engine, uow: UnitOfWork) -> None:
+    user_id, transporte_id, lazer_id = _seed(test_engine)
+    index = CategoryPatternIndex(min_confirmations=3)
+    await index.suggest(uow.session, user_id, "uber")  # warm: updates are applied in place
+    for category_id in [transporte_id] * 3 + [lazer_id] * 4:
+        await index.record_confirmation(user_id, "uber", category_id)
+    await index.flush()
+
+    suggestion = await index.suggest(uow.session, user_id, "uber")
+    assert suggestion is not None and suggestion.category_id == lazer_id
+
+    index.forget_category(user_id, lazer_id)
+    suggestion = await index.suggest(uow.session, user_id, "uber")
+    assert suggestion is not None and suggestion.category_id == transporte_id
+
+
+@pytest.mark.asyncio
+async def test_lru_evicts_users_and_rewarms(test_engine: Engine, uow: UnitOfWork) -> None:
+    user_id, transporte_id, _ = _seed(test_engine)
+    index = CategoryPatternIndex(max_users=2, min_confirmations=1)
+    await index.record_confirmation(user_id, "uber", transporte_id)
+    await index.flush()
+
+    for other in (1001, 1002):
+        await index.suggest(uow.session, other, "uber")
+    assert await index.suggest(uow.session, user_id, "uber") is not None
+    await index.suggest(uow.session, 1003, "uber")
+
+    stats = index.stats()
+    assert (stats.users, stats.evictions, stats.warms) == (2, 2, 4)
+
+
+def test_trigram_similarity_matches_pg_trgm() -> None:
+    assert similarity("spotfy", "spotify") == 0.5
+    assert similarity("ubereats", "uber eats") == pytest.approx(7 / 12)
+    assert similarity("padaria", "") == 0.0
+
+    index = TrigramIndex()
+    for description in ("uber", "uber eats", "spotify", "padaria"):
+        index.add(description)
+    assert [match for _, match in index.search("ubereats", 0.5)] == ["uber eats"]
+    assert index.search("farmacia", 0.5) == []
+
+
+@pytest.mark.asyncio
+async def test_near_miss_descriptions_use_confirmed_pattern(
+    test_engine: Engine, uow: UnitOfWork
+) -> None:
+    user_id, transporte_id, lazer_id = _seed(test_engine)
+    index = CategoryPatternIndex(min_confirmations=3, fuzzy_threshold=0.5)
+    for description, category_id in [("spotify", lazer_id)] * 3 + [("uber", transporte_id)]:
+        await index.record_confirmation(user_id, description, category_id)
+    await index.flush()
+
+    suggestion = await index.suggest(uow.session, user_id, "Spotfy")
+    assert suggestion is not None
+    assert (suggestion.category_id, suggestion.score, suggestion.source) == (lazer_id, 0.5, "fuzzy")
+    assert await index.suggest(uow.session, user_id, "ubr") is None  # "uber" unconfirmed
+    assert await index.suggest(uow.session, user_id, "netflix") is None
+    assert index.stats().fuzzy_hits == 1
+
+    index.forget_category(user_id, lazer_id)
+    assert await index.suggest(uow.session, user_id, "Spotfy") is None
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("size", [100, 1_000, 10_000], ids=lambda size: f"{size}-descriptions")
+def test_fuzzy_lookup_latency_by_index_size(
+    size: int, record_property: Callable[[str, object], None]
+) -> None:
+    """Typos of indexed descriptions; latency is recorded per size (``--junitxml``)."""
+    rng = random.Random(size)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    # Shared words, as in real descriptions, so queries score many candidates
+    vocabulary = ["".join(rng.choices(letters, k=rng.randint(3, 9))) for _ in range(300)]
+    descriptions = [" ".join(rng.sample(vocabulary, 2)) for _ in range(size)]
+    index = TrigramIndex()
+    for description in descriptions:
+        index.add(description)
+    queries = []
+    for description in rng.choices(descriptions, k=200):
+        typo = rng.randrange(len(description))
+        queries.append((description, description[:typo] + description[typo + 1 :]))
+
+    start = time.perf_counter()
+    results = [index.search(query, 0.5) for _, query in queries]
+    per_lookup_ms = (time.perf_counter() - start) / len(queries) * 1000
+
+    record_property("per_lookup_ms", round(per_lookup_ms, 3))
+    found = sum(
+        original in {match for _, match in result}
+        for (original, _), result in zip(queries, results, strict=True)
+    )
+    assert found >= 0.9 * len(queries)
+    assert per_lookup_ms < 5.0
+
+
+def _stored_counts(test_engine: Engine) -> dict[str, int]:
+    with Session(test_engine) as session:
+        rows = session.exec(select(CategoryPattern)).all()
+    return {row.description_normalized: row.confirmation_count for row in rows}
+
+
+@pytest.mark.asyncio
+async def test_confirmations_are_written_behind_in_one_upsert(
+    test_engine: Engine, uow: UnitOfWork
+) -> None:
+    user_id, transporte_id, lazer_id = _seed(test_engine)
+    index = CategoryPatternIndex(min_confirmations=3)
+    await index.record_confirmation(user_id, "uber", transporte_id)
+    await index.flush()
+    for description, category_id in [("uber", transporte_id), ("cinema", lazer_id)] * 10:
+        await index.record_confirmation(user_id, description, category_id)
+    assert _stored_counts(test_engine) == {"uber": 1}
+
+    # A warm before the flush still counts the buffered confirmations (RULE-003)
+    suggestion = await index.suggest(uow.session, user_id, "cinema")
+    assert suggestion is not None and suggestion.confirmation_count == 10
+
+    statements: list[str] = []
+
+    def count(*args: object) -> None:
+        statements.append(str(args[2]))
+
+    engine = db_session.async_engine.sync_engine
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        assert await index.flush() == 2
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+
+    assert [s.split()[0] for s in statements] == ["INSERT"]
+    assert _stored_counts(test_engine) == {"uber": 11, "cinema": 10}
+    stats = index.stats()
+    assert (stats.confirmations, stats.flushed_rows, stats.pending) == (21, 3, 0)
+
+
+@pytest.mark.asyncio
+async def test_flush_on_size_interval_and_stop(test_engine: Engine) -> None:
+    user_id, transporte_id, lazer_id = _seed(test_engine)
+    index = CategoryPatternIndex(flush_max_pending=2, flush_interval=0.02)
+
+    await index.record_confirmation(user_id, "uber", transporte_id)
+    await index.record_confirmation(user_id, "cinema", lazer_id)  # size threshold
+    assert _stored_counts(test_engine) == {"uber": 1, "cinema": 1}
+
+    index.start()
+    await index.record_confirmation(user_id, "uber", transporte_id)
+    await asyncio.sleep(0.1)  # periodic flush
+    assert _stored_counts(test_engine)["uber"] == 2
+
+    await index.record_confirmation(user_id, "teatro", lazer_id)
+    await index.stop()  # graceful shutdown
+    assert _stored_counts(test_engine) == {"uber": 2, "cinema": 1, "teatro": 1}
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_keeps_increments(
+    test_engine: Engine, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    user_id, transporte_id, _ = _seed(test_engine)
+    index = CategoryPatternIndex()
+    await index.record_confirmation(user_id, "uber", transporte_id)
+
+    def unavailable() -> object:
+        raise OperationalError("INSERT", {}, Exception("database is down"))
+
+    monkeypatch.setattr(patterns_module, "get_async_session", unavailable)
+    assert await index.flush() == 0
+    await index.record_confirmation(user_id, "uber", transporte_id)
+    monkeypatch.undo()
+
+    assert await index.flush() == 1
+    assert _stored_counts(test_engine) == {"uber": 2}
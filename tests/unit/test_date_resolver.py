@@ -0,0 +1,106 @@
+"""Unit tests for PT-BR relative date resolution (FEAT-005, TEST-024..026)."""
+
+from __future__ import annotations
+
+import itertools
+import time
+from datetime import date, timedelta
+
+import pytest
+
+from src.services.extraction import (
+    EXPENSE_FUTURE_DATE,
+    FastPathExtractor,
+    day_table,
+    resolve_date,
+    tokenize,
+    validate_expense_date,
+)
+
+TUESDAY = date(2026, 2, 3)
+
+
+def _resolve(text: str, today: date = TUESDAY):
+    return resolve_date(tokenize(text)[1], today)
+
+
+@pytest.mark.parametrize(
+    ("text", "expected", "label"),
+    [
+        ("gastei 50 reais ontem no mercado", date(2026, 2, 2), "ontem"),
+        ("anteontem paguei a farmácia", date(2026, 2, 1), "anteontem"),
+        ("gastei 100 reais no sábado", date(2026, 1, 31), "sábado"),
+        ("foi na terça", TUESDAY, "terça"),
+        ("foi na terça passada", date(2026, 1, 27), "terça passada"),
+        ("na sexta-feira retrasada", date(2026, 1, 23), "sexta retrasada"),
+        ("gastei no dia 5", date(2026, 1, 5), "dia 5"),
+        ("dia primeiro", date(2026, 2, 1), "dia 1"),
+        ("dia vinte e cinco de janeiro", date(2026, 1, 25), "dia 25/01"),
+        ("dia 3 de fevereiro", TUESDAY, "dia 3/02"),
+        ("dia 10 de fevereiro", date(2025, 2, 10), "dia 10/02/2025"),
+        ("dia 5 de dezembro", date(2025, 12, 5), "dia 5/12/2025"),
+    ],
+)
+def test_resolves_relative_expressions(text: str, expected: date, label: str) -> None:
+    resolved = _resolve(text)
+
+    assert resolved is not None
+    assert (resolved.value, resolved.label, resolved.error) == (expected, label, None)
+
+
+@pytest.mark.parametrize("text", ["vou gastar amanhã", "na próxima sexta", "sábado que vem"])
+def test_future_dates_are_flagged(text: str) -> None:
+    resolved = _resolve(text)
+
+    assert resolved is not None
+    assert resolved.value > TUESDAY
+    assert resolved.error == EXPENSE_FUTURE_DATE
+
+
+def test_day_of_month_skips_months_without_that_day() -> None:
+    resolved = _resolve("dia 31", today=date(2026, 3, 10))
+
+    assert resolved is not None
+    assert resolved.value == date(2026, 1, 31)
+
+
+def test_day_table_is_computed_once_per_day() -> None:
+    assert day_table(TUESDAY) is day_table(date(2026, 2, 3))
+    assert day_table(TUESDAY).weekday_days_back == (1, 0, 6, 5, 4, 3, 2)
+
+
+def test_validate_expense_date_rejects_future() -> None:
+    assert validate_expense_date(TUESDAY, TUESDAY) == (True, None)
+    assert validate_expense_date(date(2026, 2, 4), TUESDAY) == (False, EXPENSE_FUTURE_DATE)
+
+
+def test_fast_path_uses_the_resolved_date_span() -> None:
+    result = FastPathExtractor().extract("gastei R$ 40 no posto no sábado passado", TUESDAY)
+
+    assert result is not None
+    assert (result.description, result.date) == ("Posto", date(2026, 1, 31))
+
+
+@pytest.mark.slow
+def test_benchmark_resolves_large_corpus_quickly() -> None:
+    expressions = [
+        "hoje", "ontem", "anteontem", "amanhã", "no sábado", "domingo passado",
+        "segunda-feira retrasada", "na próxima quinta", "sexta que vem", "dia 5",
+        "dia vinte e três", "dia 12 de março", "dia trinta e um",
+    ]  # fmt: skip
+    templates = ["gastei {n} reais no mercado {e}", "{e} paguei R$ {n},90 na padaria"]
+    corpus = [
+        tokenize(template.format(n=n, e=expression))[1]
+        for template, expression, n in itertools.product(templates, expressions, range(2000))
+    ]
+    # Around midnight, users may still be on different days
+    days = [TUESDAY - timedelta(days=1), TUESDAY]
+
+    started = time.perf_counter()
+    resolved = sum(
+        resolve_date(tokens, days[i % len(days)]) is not None for i, tokens in enumerate(corpus)
+    )
+    per_phrase_us = (time.perf_counter() - started) / len(corpus) * 1e6
+
+    assert resolved == len(corpus)
+    assert per_phrase_us < 50
@@ -0,0 +1,135 @@
+"""Unit tests for the stored description_normalized columns (RULE-005)."""
+
+from __future__ import annotations
+
+from datetime import UTC, date, datetime
+from decimal import Decimal
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy import update
+from sqlmodel import Session, col, select
+
+from src.db.backfill import backfill_category_patterns, backfill_expenses
+from src.db.normalization import normalize_description
+from src.models import Category, CategoryPattern, Expense, User
+
+
+@pytest.mark.parametrize(
+    ("description", "expected"),
+    [
+        ("  Açaí da Esquina ", "acai da esquina"),
+        ("PÃO DE QUEIJO", "pao de queijo"),
+        ("Farmácia São João", "farmacia sao joao"),
+        ("Straße", "strasse"),
+        ("Œuvre Æsir Øl Łódź", "oeuvre aesir ol lodz"),
+        ("ﬁlé", "file"),
+        ("\tUber ", "\tuber"),  # only spaces are trimmed
+        ("1º andar", "1º andar"),  # compatibility forms are kept
+    ],
+)
+def test_normalizer_trims_unaccents_and_lowercases(description: str, expected: str) -> None:
+    assert normalize_description(description) == expected
+    assert normalize_description(expected) == expected
+
+
+def _seed(session: Session) -> tuple[int, int]:
+    user = User(telegram_id=616161, pin_hash="x")
+    session.add(user)
+    session.commit()
+    assert user.id is not None
+    category = Category(user_id=user.id, name="Alimentação")
+    session.add(category)
+    session.commit()
+    assert category.id is not None
+    return user.id, category.id
+
+
+def test_expense_keeps_description_normalized_in_sync(db_session: Session) -> None:
+    user_id, category_id = _seed(db_session)
+    expense = Expense(
+        user_id=user_id,
+        category_id=category_id,
+        description=" Açaí ",
+        total_amount=Decimal("18.50"),
+        expense_date=date(2026, 10, 18),
+    )
+    db_session.add(expense)
+    db_session.commit()
+    assert expense.description_normalized == "acai"
+
+    expense.description = "Pão de Açúcar"
+    db_session.commit()
+    assert expense.description_normalized == "pao de acucar"
+    table = sa.inspect(Expense).local_table
+    assert isinstance(table, sa.Table)
+    index = next(i for i in table.indexes if i.name == "ix_expenses_user_id_description_normalized")
+    assert [c.name for c in index.columns] == ["user_id", "description_normalized"]
+
+
+def test_backfill_rewrites_stale_rows_in_batches(db_session: Session) -> None:
+    user_id, category_id = _seed(db_session)
+    for n, description in enumerate(["Straße", "Café", "uber", "Padaria"]):
+        db_session.add(
+            Expense(
+                user_id=user_id,
+                category_id=category_id,
+                description=description,
+                total_amount=Decimal(n + 1),
+                expense_date=date(2026, 10, 18),
+            )
+        )
+    db_session.commit()
+    db_session.execute(update(Expense).values(description_normalized="stale"))
+    db_session.execute(
+        update(Expense)
+        .where(col(Expense.description) == "uber")
+        .values(description_normalized="uber")
+    )
+    db_session.commit()
+
+    stats = backfill_expenses(db_session, batch_size=3)
+
+    assert (stats.scanned, stats.updated) == (4, 3)
+    stored = db_session.exec(select(Expense.description_normalized).order_by(col(Expense.id))).all()
+    assert stored == ["strasse", "cafe", "uber", "padaria"]
+    assert backfill_expenses(db_session, batch_size=3).updated == 0
+
+
+def test_backfill_merges_patterns_that_become_equal(db_session: Session) -> None:
+    user_id, category_id = _seed(db_session)
+    old, new = datetime(2026, 1, 1, tzinfo=UTC), datetime(2026, 10, 1, tzinfo=UTC)
+    db_session.add_all(
+        [
+            CategoryPattern(
+                user_id=user_id,
+                description_normalized="strasse",
+                category_id=category_id,
+                confirmation_count=2,
+                last_used_at=old,
+            ),
+            CategoryPattern(
+                user_id=user_id,
+                description_normalized="straße",  # written by an older normalizer
+                category_id=category_id,
+                confirmation_count=3,
+                last_used_at=new,
+            ),
+            CategoryPattern(
+                user_id=user_id,
+                description_normalized="øl",
+                category_id=category_id,
+            ),
+        ]
+    )
+    db_session.commit()
+
+    stats = backfill_category_patterns(db_session, batch_size=2)
+
+    assert (stats.scanned, stats.updated, stats.merged) == (3, 1, 1)
+    rows = db_session.exec(select(CategoryPattern).order_by(col(CategoryPattern.id))).all()
+    assert [(r.description_normalized, r.confirmation_count) for r in rows] == [
+        ("strasse", 5),
+        ("ol", 1),
+    ]
+    assert rows[0].last_used_at == new
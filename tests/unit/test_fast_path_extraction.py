@@ -0,0 +1,120 @@
+"""Unit tests for the rule-based expense extractor and the LLM gate (RULE-006)."""
+
+from __future__ import annotations
+
+from datetime import date
+from decimal import Decimal
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.services.extraction import (
+    EXPENSE_FUTURE_DATE,
+    ExpenseExtractor,
+    ExtractedExpense,
+    FastPathExtractor,
+)
+
+TODAY = date(2026, 10, 18)
+
+
+@pytest.mark.parametrize(
+    ("text", "amount"),
+    [
+        ("Gastei trinta reais no Uber hoje", "30.00"),
+        ("paguei R$ 12,90 na padaria", "12.90"),
+        ("gastei 1.234,56 no mercado", "1234.56"),
+        ("gastei trinta e cinco e cinquenta na farmácia", "35.50"),
+        ("comprei um lanche de vinte e dois reais", "22.00"),
+        ("paguei mil e duzentos reais de aluguel", "1200.00"),
+        ("gastei cinquenta centavos de bala", "0.50"),
+    ],
+)
+def test_amounts_from_digits_and_words(text: str, amount: str) -> None:
+    result = FastPathExtractor().extract(text, TODAY)
+
+    assert result is not None
+    assert result.amount == Decimal(amount)
+
+
+def test_simple_utterance_is_confident() -> None:
+    result = FastPathExtractor().extract("Gastei trinta reais no Uber hoje", TODAY)
+
+    assert result is not None
+    assert result == ExtractedExpense("Uber", Decimal("30.00"), TODAY, result.confidence)
+    assert result.confidence >= 0.9
+
+
+def test_description_keeps_inner_connectors_and_relative_date() -> None:
+    result = FastPathExtractor().extract("paguei 150 reais da conta de luz ontem", TODAY)
+
+    assert result is not None
+    assert result.description == "Conta de luz"
+    assert result.date == date(2026, 10, 17)
+
+
+def test_day_number_is_not_an_amount() -> None:
+    result = FastPathExtractor().extract("gastei R$ 40 no posto dia 15", TODAY)
+
+    assert result is not None
+    assert result.amount == Decimal("40.00")
+    assert result.confidence >= 0.9
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "gastei 30 no Uber e 20 na padaria",  # two expenses
+        "vou gastar 50 reais amanhã no cinema",  # not spent yet
+        "gastei 30 reais",  # no description
+        "paguei quinze reais e dez reais de gorjeta",  # two amounts, not R$ 15,10
+        "gastei cinquenta reais e vinte reais no bar",  # two amounts, not R$ 50,20
+    ],
+)
+def test_ambiguous_utterances_have_low_confidence(text: str) -> None:
+    result = FastPathExtractor().extract(text, TODAY)
+
+    assert result is not None
+    assert result.confidence < 0.9
+
+
+def test_future_date_is_flagged() -> None:
+    result = FastPathExtractor().extract("vou gastar 50 reais amanhã no cinema", TODAY)
+
+    assert result is not None
+    assert result.error == EXPENSE_FUTURE_DATE
+
+
+def test_no_amount_returns_none() -> None:
+    assert FastPathExtractor().extract("comprei um lanche na padaria", TODAY) is None
+
+
+@pytest.mark.asyncio
+async def test_llm_called_only_when_confidence_is_low() -> None:
+    llm_result = ExtractedExpense("Uber", Decimal("30.00"), TODAY, 0.95, source="llm")
+    llm = AsyncMock()
+    llm.extract.return_value = llm_result
+    extractor = ExpenseExtractor(llm=llm, min_confidence=0.9)
+
+    local = await extractor.extract("gastei trinta reais no Uber hoje", TODAY)
+    slow = await extractor.extract("gastei 30 no Uber e 20 na padaria", TODAY)
+
+    assert local is not None and local.source == "rules"
+    assert slow is llm_result
+    llm.extract.assert_awaited_once_with("gastei 30 no Uber e 20 na padaria", TODAY, ())
+    stats = extractor.stats()
+    assert (stats.messages, stats.local, stats.llm_calls) == (2, 1, 1)
+    assert stats.local_ratio == 0.5
+
+
+@pytest.mark.slow
+@pytest.mark.asyncio
+async def test_local_latency_is_sub_millisecond() -> None:
+    extractor = ExpenseExtractor()
+
+    for _ in range(200):
+        await extractor.extract("paguei R$ 12,90 na padaria hoje", TODAY)
+
+    stats = extractor.stats()
+    assert stats.local == 200
+    assert stats.mean_local_latency_ms < 1.0
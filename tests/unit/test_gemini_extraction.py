@@ -0,0 +1,209 @@
+"""Unit tests for the Gemini extraction client, its cache and the stub server."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from datetime import date, timedelta
+from decimal import Decimal
+
+import httpx
+import pytest
+from sqlalchemy import Engine
+
+from src.services.extraction import (
+    EXPENSE_FUTURE_DATE,
+    ExpenseExtractor,
+    ExtractionError,
+    GeminiExtractor,
+    extraction_cache,
+)
+from src.services.extraction.gemini import build_prompt, estimate_tokens
+from src.services.extraction.stub_server import StubGeminiServer
+
+TODAY = date(2026, 10, 18)
+
+
+def _gemini_response(answer: dict[str, object], status: int = 200) -> httpx.Response:
+    text = json.dumps(answer)
+    return httpx.Response(
+        status,
+        json={
+            "candidates": [{"content": {"parts": [{"text": text}]}, "finishReason": "STOP"}],
+            "usageMetadata": {"promptTokenCount": 120, "candidatesTokenCount": 30},
+        },
+    )
+
+
+SPOTIFY = {
+    "detected": True,
+    "description": "Spotify",
+    "amount": 21.9,
+    "date": TODAY.isoformat(),
+    "category": "Assinaturas",
+    "confidence": 0.97,
+}
+
+
+def test_build_prompt_truncates_text_to_token_budget() -> None:
+    prompt, truncated = build_prompt("x" * 10_000, TODAY, ["Mercado"], max_tokens=300)
+
+    assert truncated
+    assert estimate_tokens(prompt) <= 300
+    with pytest.raises(ExtractionError):
+        build_prompt("gastei 10", TODAY, ["Categoria"] * 500, max_tokens=300)
+
+
+@pytest.mark.asyncio
+async def test_repeated_phrase_hits_the_api_once(test_engine: Engine) -> None:
+    requests: list[dict[str, object]] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(json.loads(request.content))
+        return _gemini_response(SPOTIFY)
+
+    gemini = GeminiExtractor(api_key="k", transport=httpx.MockTransport(handler))
+    categories = ["Assinaturas", "Mercado"]
+
+    first = await gemini.extract("Spotify 21,90", TODAY, categories)
+    second = await gemini.extract("  spotify   21,90 ", TODAY, list(reversed(categories)))
+    await gemini.aclose()
+
+    assert first == second
+    assert first is not None
+    assert (first.amount, first.category, first.source) == (Decimal("21.90"), "Assinaturas", "llm")
+    assert len(requests) == 1
+    config = requests[0]["generationConfig"]
+    assert isinstance(config, dict)
+    assert config["responseMimeType"] == "application/json"
+    assert config["maxOutputTokens"] == 256
+    assert gemini.stats().prompt_tokens == 120
+
+
+@pytest.mark.asyncio
+async def test_future_date_from_the_model_is_flagged(test_engine: Engine) -> None:
+    answer = {**SPOTIFY, "date": "2026-12-01"}
+    gemini = GeminiExtractor(
+        api_key="k", transport=httpx.MockTransport(lambda _: _gemini_response(answer))
+    )
+
+    result = await gemini.extract("Spotify 21,90", TODAY)
+    await gemini.aclose()
+
+    assert result is not None
+    assert result.date == date(2026, 12, 1)
+    assert result.error == EXPENSE_FUTURE_DATE
+    assert result.confidence <= 0.5
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_one_call(test_engine: Engine) -> None:
+    calls = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return _gemini_response(SPOTIFY)
+
+    gemini = GeminiExtractor(api_key="k", transport=httpx.MockTransport(handler))
+
+    results = await asyncio.gather(*(gemini.extract("Spotify 21,90", TODAY) for _ in range(10)))
+    await gemini.aclose()
+
+    assert calls == 1
+    assert len(set(results)) == 1
+    assert gemini.stats().coalesced == 9
+
+
+@pytest.mark.asyncio
+async def test_category_change_and_db_tier(test_engine: Engine) -> None:
+    calls = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        return _gemini_response(SPOTIFY)
+
+    gemini = GeminiExtractor(api_key="k", transport=httpx.MockTransport(handler))
+
+    await gemini.extract("Spotify 21,90", TODAY, ["Assinaturas"])
+    await gemini.extract("Spotify 21,90", TODAY, ["Assinaturas", "Lazer"])
+    extraction_cache.clear()  # restart: only the table remains
+    await gemini.extract("Spotify 21,90", TODAY, ["Assinaturas"])
+    await gemini.aclose()
+
+    assert calls == 2
+    assert extraction_cache.stats().db_hits == 1
+
+
+@pytest.mark.asyncio
+async def test_cached_answer_resolves_date_on_each_use(test_engine: Engine) -> None:
+    answer = {**SPOTIFY, "description": "Mercado", "date": (TODAY - timedelta(1)).isoformat()}
+    gemini = GeminiExtractor(
+        api_key="k", transport=httpx.MockTransport(lambda _: _gemini_response(answer))
+    )
+
+    today = await gemini.extract("mercado ontem 80", TODAY)
+    next_day = await gemini.extract("mercado ontem 80", TODAY + timedelta(days=1))
+    await gemini.aclose()
+
+    assert today is not None and next_day is not None
+    assert today.date == TODAY - timedelta(days=1)
+    assert next_day.date == TODAY
+
+
+@pytest.mark.asyncio
+async def test_retries_server_errors_then_fails(test_engine: Engine) -> None:
+    statuses = iter([503, 200])
+    gemini = GeminiExtractor(
+        api_key="k",
+        transport=httpx.MockTransport(lambda _: _gemini_response(SPOTIFY, next(statuses))),
+    )
+
+    assert await gemini.extract("Spotify 21,90", TODAY) is not None
+    assert gemini.stats().api_calls == 2
+
+    broken = GeminiExtractor(
+        api_key="k",
+        max_attempts=2,
+        transport=httpx.MockTransport(lambda _: httpx.Response(200, json={"candidates": []})),
+    )
+    with pytest.raises(ExtractionError):
+        await broken.extract("Uber 30", TODAY)
+    await gemini.aclose()
+    await broken.aclose()
+
+
+@pytest.mark.asyncio
+async def test_extractor_falls_back_to_local_result_on_llm_error(test_engine: Engine) -> None:
+    gemini = GeminiExtractor(
+        api_key="k", transport=httpx.MockTransport(lambda _: httpx.Response(400))
+    )
+    extractor = ExpenseExtractor(llm=gemini)
+
+    result = await extractor.extract("gastei 30 no Uber e 20 na padaria", TODAY)
+    await gemini.aclose()
+
+    assert result is not None
+    assert result.source == "rules"
+    assert extractor.stats().llm_calls == 1
+
+
+@pytest.mark.asyncio
+async def test_pipeline_against_stub_server(test_engine: Engine) -> None:
+    with StubGeminiServer(latency=0.01) as server:
+        gemini = GeminiExtractor(api_key="stub", base_url=server.base_url, max_connections=4)
+        extractor = ExpenseExtractor(llm=gemini)
+        phrases = [f"paguei {n} no Uber e 5 na padaria" for n in range(20)] * 2
+
+        results = await asyncio.gather(
+            *(extractor.extract(phrase, TODAY, ["Uber", "Mercado"]) for phrase in phrases)
+        )
+        await gemini.aclose()
+
+        assert server.requests == 20
+    assert all(result is not None and result.source == "llm" for result in results)
+    assert results[3] is not None
+    assert (results[3].amount, results[3].category) == (Decimal("3.00"), "Uber")
+    assert extractor.stats().llm_calls == 40
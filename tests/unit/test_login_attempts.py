@@ -0,0 +1,123 @@
+"""Unit tests for atomic login accounting (RULE-007, RULE-008)."""
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import Engine, Update, event, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import ORMExecuteState
+from sqlmodel import Session, select
+
+from src.db.session import new_async_session
+from src.db.types import UTCDateTime
+from src.models import User
+from src.services.auth import hash_pin
+from src.services.auth.login_attempts import record_failed_login, record_successful_login
+from src.services.auth.session import lock_duration
+
+
+def _add_user(engine: Engine, telegram_id: int, **fields: object) -> None:
+    with Session(engine) as session:
+        session.add(User(telegram_id=telegram_id, pin_hash=hash_pin("1234"), **fields))
+        session.commit()
+
+
+def _load_user(engine: Engine, telegram_id: int) -> User:
+    with Session(engine) as session:
+        return session.exec(select(User).where(User.telegram_id == telegram_id)).one()
+
+
+async def test_record_failed_login_locks_on_third_attempt(test_engine: Engine) -> None:
+    _add_user(test_engine, 4001)
+
+    results = []
+    for _ in range(3):
+        async with new_async_session() as session:
+            results.append(await record_failed_login(session, 4001))
+            await session.commit()
+
+    assert [r.failed_attempts for r in results if r] == [1, 2, 3]
+    assert [r.remaining_attempts for r in results if r] == [2, 1, 0]
+    assert results[1] is not None and not results[1].locked
+    assert results[2] is not None and results[2].locked
+    assert results[2].locked_until is not None
+    assert results[2].locked_until > datetime.now(UTC) + timedelta(minutes=14)
+
+    db_user = _load_user(test_engine, 4001)
+    assert db_user.failed_attempts == 3
+    assert db_user.locked_until is not None
+
+
+async def test_lock_expiry_is_stored_as_naive_utc(test_engine: Engine) -> None:
+    _add_user(test_engine, 4004, failed_attempts=2)
+    statements: list[ORMExecuteState] = []
+
+    async with new_async_session() as session:
+        event.listen(session.sync_session, "do_orm_execute", statements.append)
+        result = await record_failed_login(session, 4004)
+        await session.commit()
+
+    # Postgres binds an untyped aware datetime as timestamptz
+    statement = statements[0].statement
+    assert isinstance(statement, Update)
+    compiled = statement.compile(dialect=postgresql.asyncpg.dialect())
+    expiry_binds = [b for b in compiled.binds.values() if isinstance(b.value, datetime)]
+    assert expiry_binds
+    assert all(isinstance(b.type, UTCDateTime) for b in expiry_binds)
+    assert result is not None and result.locked_until is not None
+    with test_engine.connect() as conn:
+        stored = conn.execute(
+            text("SELECT locked_until FROM users WHERE telegram_id = 4004")
+        ).scalar_one()
+    assert "+" not in str(stored)  # no offset: the column is naive UTC
+    locked_until = _load_user(test_engine, 4004).locked_until
+    assert locked_until is not None
+    assert locked_until == result.locked_until
+    assert locked_until.tzinfo is UTC
+    expected = datetime.now(UTC) + lock_duration()
+    assert abs(locked_until - expected) < timedelta(minutes=1)
+
+
+async def test_record_failed_login_concurrent_attempts_are_not_lost(test_engine: Engine) -> None:
+    """Two devices submitting wrong PINs at once both count."""
+    _add_user(test_engine, 4002)
+
+    async def fail_once() -> None:
+        async with new_async_session() as session:
+            await record_failed_login(session, 4002)
+            await session.commit()
+
+    await asyncio.gather(fail_once(), fail_once())
+
+    assert _load_user(test_engine, 4002).failed_attempts == 2
+
+
+async def test_record_failed_login_unknown_user_returns_none(test_engine: Engine) -> None:
+    async with new_async_session() as session:
+        assert await record_failed_login(session, 4999) is None
+
+
+async def test_record_successful_login_resets_lock_and_sets_last_login(
+    test_engine: Engine,
+) -> None:
+    _add_user(
+        test_engine,
+        4003,
+        failed_attempts=2,
+        locked_until=datetime.now(UTC) - timedelta(minutes=1),
+    )
+
+    async with new_async_session() as session:
+        assert await record_successful_login(session, 4003) is True
+        await session.commit()
+
+    db_user = _load_user(test_engine, 4003)
+    assert db_user.failed_attempts == 0
+    assert db_user.locked_until is None
+    assert db_user.last_login is not None
+    assert db_user.last_login > datetime.now(UTC) - timedelta(minutes=1)
+
+
+async def test_record_successful_login_unknown_user_returns_false(test_engine: Engine) -> None:
+    async with new_async_session() as session:
+        assert await record_successful_login(session, 4999) is False
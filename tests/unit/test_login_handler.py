@@ -4,9 +4,11 @@ from datetime import UTC
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from sqlalchemy import Engine
 from sqlmodel import Session, select
 
 from src.bot.handlers.login import is_valid_pin, login_ask_pin, login_handler
+from src.db.unit_of_work import UnitOfWork
 from src.models import User
 from src.services.auth import hash_pin
 
@@ -28,37 +30,31 @@ def test_login_is_valid_pin_rejects_wrong_length() -> None:
 
 
 @pytest.mark.asyncio
-async def test_login_handler_no_user_ends_conversation() -> None:
+async def test_login_handler_no_user_ends_conversation(
+    test_engine: Engine, uow: UnitOfWork
+) -> None:
     """When telegram user is not in DB, reply to use /start and END."""
-    from sqlmodel import SQLModel, create_engine
-
-    test_engine = create_engine("sqlite:///:memory:")
-    SQLModel.metadata.create_all(test_engine)
-
     update = MagicMock()
     update.effective_user = MagicMock(id=99999)
     update.message = MagicMock(reply_text=AsyncMock())
-    context = MagicMock()
+    context = MagicMock(uow=uow)
 
-    with patch("src.bot.handlers.login.engine", test_engine):
-        result = await login_handler(update, context)
-        assert result == -1  # ConversationHandler.END
-        update.message.reply_text.assert_called_once()
-        text = update.message.reply_text.call_args[0][0]
-        assert "PIN" in text and "/start" in text
+    result = await login_handler(update, context)
+    assert result == -1  # ConversationHandler.END
+    update.message.reply_text.assert_called_once()
+    text = update.message.reply_text.call_args[0][0]
+    assert "PIN" in text and "/start" in text
 
 
 @pytest.mark.asyncio
-async def test_login_handler_user_locked_returns_account_locked() -> None:
+async def test_login_handler_user_locked_returns_account_locked(
+    test_engine: Engine, uow: UnitOfWork
+) -> None:
     """When user is locked, reply AUTH.ACCOUNT_LOCKED and END."""
     from datetime import datetime
 
-    from sqlmodel import SQLModel, create_engine
-
     from src.services.auth.session import lock_duration
 
-    test_engine = create_engine("sqlite:///:memory:")
-    SQLModel.metadata.create_all(test_engine)
     with Session(test_engine) as session:
         locked_until = datetime.now(UTC) + lock_duration()
         user = User(
@@ -73,24 +69,21 @@ async def test_login_handler_user_locked_returns_account_locked() -> None:
     update = MagicMock()
     update.effective_user = MagicMock(id=88888)
     update.message = MagicMock(reply_text=AsyncMock())
-    context = MagicMock()
+    context = MagicMock(uow=uow)
 
-    with patch("src.bot.handlers.login.engine", test_engine):
-        result = await login_handler(update, context)
-        assert result == -1
-        update.message.reply_text.assert_called_once()
-        text = update.message.reply_text.call_args[0][0]
-        assert "AUTH.ACCOUNT_LOCKED" in text
-        assert "bloqueada" in text
+    result = await login_handler(update, context)
+    assert result == -1
+    update.message.reply_text.assert_called_once()
+    text = update.message.reply_text.call_args[0][0]
+    assert "AUTH.ACCOUNT_LOCKED" in text
+    assert "bloqueada" in text
 
 
 @pytest.mark.asyncio
-async def test_login_ask_pin_three_wrong_pins_locks_account() -> None:
+async def test_login_ask_pin_three_wrong_pins_locks_account(
+    test_engine: Engine, uow: UnitOfWork
+) -> None:
     """TEST-003: After 3 wrong PINs, account is locked (AUTH.ACCOUNT_LOCKED)."""
-    from sqlmodel import SQLModel, create_engine
-
-    test_engine = create_engine("sqlite:///:memory:")
-    SQLModel.metadata.create_all(test_engine)
     with Session(test_engine) as session:
         user = User(
             telegram_id=77777,
@@ -103,25 +96,54 @@ async def test_login_ask_pin_three_wrong_pins_locks_account() -> None:
     update = MagicMock()
     update.effective_user = MagicMock(id=77777)
     update.message = MagicMock(text="000000", reply_text=AsyncMock())
-    context = MagicMock()
-
-    with patch("src.bot.handlers.login.engine", test_engine):
-        # First wrong PIN
-        await login_ask_pin(update, context)
-        # Second wrong PIN
-        await login_ask_pin(update, context)
-        # Third wrong PIN -> lock
+    context = MagicMock(uow=uow)
+
+    # First wrong PIN
+    await login_ask_pin(update, context)
+    # Second wrong PIN
+    await login_ask_pin(update, context)
+    # Third wrong PIN -> lock
+    result = await login_ask_pin(update, context)
+
+    assert result == -1
+    calls = update.message.reply_text.call_args_list
+    last_text = calls[-1][0][0]
+    assert "AUTH.ACCOUNT_LOCKED" in last_text
+    assert "bloqueada" in last_text
+
+    with Session(test_engine) as session:
+        stmt = select(User).where(User.telegram_id == 77777)
+        u = session.exec(stmt).first()
+        assert u is not None
+        assert u.failed_attempts == 3
+        assert u.locked_until is not None
+
+
+@pytest.mark.asyncio
+async def test_login_ask_pin_busy_pool_does_not_count_attempt(
+    test_engine: Engine, uow: UnitOfWork
+) -> None:
+    """When the bcrypt pool is saturated, reply AUTH.SERVICE_BUSY without a failed attempt."""
+    from src.services.auth import PinServiceBusyError
+
+    with Session(test_engine) as session:
+        session.add(User(telegram_id=66666, pin_hash=hash_pin("123456"), failed_attempts=0))
+        session.commit()
+
+    update = MagicMock()
+    update.effective_user = MagicMock(id=66666)
+    update.message = MagicMock(text="000000", reply_text=AsyncMock())
+    context = MagicMock(uow=uow)
+
+    with patch(
+        "src.bot.handlers.login.verify_pin_async",
+        new=AsyncMock(side_effect=PinServiceBusyError("full")),
+    ):
         result = await login_ask_pin(update, context)
 
-        assert result == -1
-        calls = update.message.reply_text.call_args_list
-        last_text = calls[-1][0][0]
-        assert "AUTH.ACCOUNT_LOCKED" in last_text
-        assert "bloqueada" in last_text
-
-        with Session(test_engine) as session:
-            stmt = select(User).where(User.telegram_id == 77777)
-            u = session.exec(stmt).first()
-            assert u is not None
-            assert u.failed_attempts == 3
-            assert u.locked_until is not None
+    assert result == 0  # ASK_LOGIN_PIN
+    assert "AUTH.SERVICE_BUSY" in update.message.reply_text.call_args[0][0]
+    with Session(test_engine) as session:
+        u = session.exec(select(User).where(User.telegram_id == 66666)).first()
+        assert u is not None
+        assert u.failed_attempts == 0
@@ -0,0 +1,69 @@
+"""Unit tests for coalesced progressive message edits."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from telegram.error import RetryAfter
+
+from src.bot.message_editor import CoalescingMessageEditor
+
+
+def _message() -> MagicMock:
+    return MagicMock(edit_text=AsyncMock())
+
+
+@pytest.mark.asyncio
+async def test_burst_of_updates_is_coalesced_into_latest_text() -> None:
+    message = _message()
+    editor = CoalescingMessageEditor(message, min_interval=0.05)
+
+    editor.update("parte 1")
+    await asyncio.sleep(0.01)  # first edit goes out immediately
+    for n in range(2, 6):
+        editor.update(f"parte {n}")
+    await asyncio.sleep(0.1)
+
+    texts = [call.args[0] for call in message.edit_text.await_args_list]
+    assert texts == ["parte 1", "parte 5"]
+    assert editor.coalesced == 3
+
+
+@pytest.mark.asyncio
+async def test_finish_replaces_pending_update_and_respects_interval() -> None:
+    message = _message()
+    editor = CoalescingMessageEditor(message, min_interval=0.05)
+
+    editor.update("parte 1")
+    await asyncio.sleep(0.01)
+    editor.update("parte 2")
+    await editor.finish("final")
+
+    texts = [call.args[0] for call in message.edit_text.await_args_list]
+    assert texts == ["parte 1", "final"]
+
+
+@pytest.mark.asyncio
+async def test_unchanged_text_is_not_edited_again() -> None:
+    message = _message()
+    editor = CoalescingMessageEditor(message, min_interval=0.0)
+
+    editor.update("mesmo texto")
+    await asyncio.sleep(0.01)
+    await editor.finish("mesmo texto")
+
+    message.edit_text.assert_awaited_once_with("mesmo texto")
+
+
+@pytest.mark.asyncio
+@pytest.mark.filterwarnings("ignore::telegram.warnings.PTBDeprecationWarning")
+async def test_final_edit_is_retried_after_flood_limit() -> None:
+    message = MagicMock(edit_text=AsyncMock(side_effect=[RetryAfter(0), None]))
+    editor = CoalescingMessageEditor(message, min_interval=0.0)
+
+    await editor.finish("final")
+
+    assert message.edit_text.await_count == 2
+    assert editor.edits == 1
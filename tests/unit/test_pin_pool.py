@@ -0,0 +1,38 @@
+"""Unit tests for the bcrypt process pool (async PIN hash/verify with admission control)."""
+
+import asyncio
+
+import pytest
+
+from src.services.auth import hash_pin
+from src.services.auth.pin_service import PinHasherPool, PinServiceBusyError
+
+
+@pytest.fixture
+def pin_pool():
+    pool = PinHasherPool(max_workers=2, max_pending=2)
+    yield pool
+    pool.shutdown()
+
+
+async def test_pool_hash_and_verify_roundtrip(pin_pool: PinHasherPool) -> None:
+    hashed = await pin_pool.hash_pin("1234")
+    assert hashed.startswith("$2b$")
+    assert await pin_pool.verify_pin("1234", hashed) is True
+    assert await pin_pool.verify_pin("0000", hashed) is False
+    assert pin_pool.pending == 0
+
+
+async def test_pool_rejects_work_beyond_max_pending(pin_pool: PinHasherPool) -> None:
+    """A third concurrent job is refused immediately instead of queueing."""
+    hashed = hash_pin("1234")
+    first = asyncio.create_task(pin_pool.verify_pin("1234", hashed))
+    second = asyncio.create_task(pin_pool.verify_pin("1234", hashed))
+    await asyncio.sleep(0)
+    assert pin_pool.pending == 2
+
+    with pytest.raises(PinServiceBusyError):
+        await pin_pool.verify_pin("1234", hashed)
+
+    assert await asyncio.gather(first, second) == [True, True]
+    assert pin_pool.pending == 0
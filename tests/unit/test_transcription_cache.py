@@ -0,0 +1,66 @@
+"""Unit tests for the two-tier transcription cache."""
+
+from sqlalchemy import Engine
+from sqlmodel import Session, select
+
+from src.db.session import new_async_session
+from src.models import TranscriptionCacheEntry
+from src.services.transcription.cache import TranscriptionCache, TranscriptionKey
+
+KEY = TranscriptionKey("file-1", "pt", "whisper-large-v3-turbo")
+
+
+async def test_put_then_get_hits_memory_and_counts_bytes_saved(test_engine: Engine) -> None:
+    cache = TranscriptionCache(max_size=10)
+    async with new_async_session() as session:
+        assert await cache.get(session, KEY) is None
+        await cache.put(session, KEY, "gastei dez reais", audio_bytes=2048)
+        await session.commit()
+        assert await cache.get(session, KEY) == "gastei dez reais"
+
+    stats = cache.stats()
+    assert (stats.memory_hits, stats.db_hits, stats.misses) == (1, 0, 1)
+    assert stats.bytes_saved == 2048
+    assert stats.hit_ratio == 0.5
+
+
+async def test_get_falls_back_to_table_and_warms_memory(test_engine: Engine) -> None:
+    async with new_async_session() as session:
+        await TranscriptionCache().put(session, KEY, "texto", audio_bytes=100)
+        await session.commit()
+
+    cache = TranscriptionCache(max_size=10)  # fresh process: empty memory tier
+    async with new_async_session() as session:
+        assert await cache.get(session, KEY) == "texto"
+        assert await cache.get(session, KEY) == "texto"
+
+    stats = cache.stats()
+    assert (stats.db_hits, stats.memory_hits, stats.size) == (1, 1, 1)
+
+
+async def test_key_includes_language_and_model(test_engine: Engine) -> None:
+    cache = TranscriptionCache(max_size=10)
+    async with new_async_session() as session:
+        await cache.put(session, KEY, "texto", audio_bytes=1)
+        await session.commit()
+        other_model = TranscriptionKey(KEY.file_unique_id, KEY.language, "whisper-large-v3")
+        assert await cache.get(session, other_model) is None
+
+
+async def test_duplicate_put_is_a_no_op(test_engine: Engine) -> None:
+    async with new_async_session() as session:
+        await TranscriptionCache().put(session, KEY, "primeiro", audio_bytes=1)
+        await TranscriptionCache().put(session, KEY, "segundo", audio_bytes=1)
+        await session.commit()
+
+    with Session(test_engine) as session:
+        rows = session.exec(select(TranscriptionCacheEntry)).all()
+    assert [row.text for row in rows] == ["primeiro"]
+
+
+async def test_memory_tier_is_lru_bounded(test_engine: Engine) -> None:
+    cache = TranscriptionCache(max_size=1)
+    async with new_async_session() as session:
+        await cache.put(session, KEY, "a", audio_bytes=1)
+        await cache.put(session, TranscriptionKey("file-2", "pt", KEY.model), "b", audio_bytes=1)
+    assert cache.stats().size == 1
@@ -0,0 +1,168 @@
+"""Unit tests for parallel chunked transcription of long voice notes."""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+from typing import TYPE_CHECKING
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.bot.handlers.audio import audio_message_handler
+from src.services.transcription import (
+    HedgedTranscriber,
+    TranscriptionError,
+    merge_transcripts,
+    plan_chunks,
+    transcribe_chunked,
+)
+from src.services.transcription.preprocessing import encode_opus
+
+if TYPE_CHECKING:
+    import numpy as np
+else:
+    np = pytest.importorskip("numpy")
+pytest.importorskip("av")
+
+RATE = 16_000
+
+
+def _speech_with_pauses(seconds: int, pause_every: float) -> np.ndarray:
+    """Tone with 0.3s pauses every ``pause_every`` seconds."""
+    t = np.arange(seconds * RATE) / RATE
+    samples = (0.3 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+    for start in np.arange(pause_every, seconds, pause_every):
+        samples[int(start * RATE) : int((start + 0.3) * RATE)] = 0.0
+    return samples
+
+
+class FakeBackend:
+    model = "groq"
+
+    def __init__(self, delay: float = 0.05, fail_on: int | None = None) -> None:
+        self.delay = delay
+        self.fail_on = fail_on
+        self.filenames: list[str] = []
+        self.in_flight = 0
+        self.peak = 0
+
+    async def transcribe(self, audio: bytes, filename: str, language: str) -> str:
+        self.filenames.append(filename)
+        index = int(filename.rsplit("-", 1)[1].split(".")[0])
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        if index == self.fail_on:
+            raise TranscriptionError("boom")
+        return f"parte {index} fim"
+
+
+def test_plan_chunks_cuts_in_pauses_with_overlap() -> None:
+    samples = _speech_with_pauses(70, pause_every=9.0)
+
+    spans = plan_chunks(samples, RATE, chunk_seconds=20.0, overlap_seconds=1.0)
+
+    assert spans[0][0] == 0 and spans[-1][1] == samples.size
+    for (_start, end), (next_start, _end) in zip(spans, spans[1:], strict=False):
+        assert end - next_start == RATE  # 1s overlap
+        assert samples[end] == 0.0  # cut inside a pause
+    assert all(end - start <= 20 * RATE for start, end in spans)
+
+
+def test_plan_chunks_short_audio_is_single_span() -> None:
+    samples = np.zeros(5 * RATE, np.float32)
+
+    assert plan_chunks(samples, RATE, chunk_seconds=30.0, overlap_seconds=1.0) == [
+        (0, samples.size)
+    ]
+
+
+def test_merge_transcripts_drops_overlapping_words() -> None:
+    merged = merge_transcripts(
+        ["Gastei cinquenta reais no mercado,", "no mercado e vinte", "E vinte na farmácia."]
+    )
+
+    assert merged == "Gastei cinquenta reais no mercado, e vinte na farmácia."
+
+
+@pytest.mark.asyncio
+async def test_transcribe_chunked_runs_chunks_concurrently_in_order() -> None:
+    audio = encode_opus(_speech_with_pauses(90, pause_every=9.0), 24_000)
+    backend = FakeBackend()
+    transcriber = HedgedTranscriber(backend)
+
+    result = await transcribe_chunked(
+        transcriber, audio, "long.ogg", "pt", chunk_seconds=30.0, max_parallel=2
+    )
+
+    n = len(backend.filenames)
+    assert n >= 3
+    assert backend.peak == 2
+    assert result.text == " ".join(f"parte {i} fim" for i in range(n))
+    assert result.model == "groq"
+
+
+@pytest.mark.asyncio
+async def test_transcribe_chunked_reports_finished_prefix() -> None:
+    audio = encode_opus(_speech_with_pauses(90, pause_every=9.0), 24_000)
+    progress: list[tuple[str, int, int]] = []
+
+    await transcribe_chunked(
+        HedgedTranscriber(FakeBackend()),
+        audio,
+        "long.ogg",
+        "pt",
+        chunk_seconds=30.0,
+        on_progress=lambda text, done, total: progress.append((text, done, total)),
+    )
+
+    assert progress
+    assert [done for _text, done, _total in progress] == sorted(done for _t, done, _n in progress)
+    text, done, total = progress[0]
+    assert text.startswith("parte 0 fim") and done < total
+
+
+@pytest.mark.asyncio
+async def test_transcribe_chunked_fails_when_a_chunk_fails() -> None:
+    audio = encode_opus(_speech_with_pauses(70, pause_every=9.0), 24_000)
+    transcriber = HedgedTranscriber(FakeBackend(fail_on=1))
+
+    with pytest.raises(TranscriptionError):
+        await transcribe_chunked(transcriber, audio, "long.ogg", "pt", chunk_seconds=30.0)
+
+
+@pytest.mark.asyncio
+async def test_transcribe_chunked_without_numpy_raises_transcription_error() -> None:
+    audio = encode_opus(_speech_with_pauses(40, pause_every=9.0), 24_000)
+    transcriber = HedgedTranscriber(FakeBackend())
+
+    with patch.dict(sys.modules, {"numpy": None}), pytest.raises(TranscriptionError):
+        await transcribe_chunked(transcriber, audio, "long.ogg", "pt", chunk_seconds=30.0)
+
+
+@pytest.mark.asyncio
+async def test_audio_handler_accepts_long_audio_when_chunking_enabled() -> None:
+    update = MagicMock()
+    update.message.reply_text = AsyncMock()
+    update.message.voice = MagicMock(duration=180, file_size=3)
+    queue = MagicMock(full=MagicMock(return_value=False))
+
+    with (
+        patch("src.bot.handlers.audio.settings.AUDIO_CHUNKING_ENABLED", True),
+        patch(
+            "src.bot.handlers.audio.get_authenticated_user",
+            new=AsyncMock(return_value=MagicMock(id=1)),
+        ),
+        patch(
+            "src.bot.handlers.audio.transcription_cache.lookup", new=AsyncMock(return_value=None)
+        ),
+        patch("src.bot.handlers.audio.get_audio_job_queue", return_value=queue),
+    ):
+        await audio_message_handler(update, MagicMock(uow=MagicMock(commit=AsyncMock())))
+
+    queue.submit.assert_called_once()
+    assert queue.submit.call_args.args[0].keywords == {"duration_seconds": 180}
@@ -0,0 +1,172 @@
+"""Unit tests for hedged transcription with a local fallback (RULE-010)."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from sqlalchemy import Engine
+from sqlmodel import Session
+
+from src.db.unit_of_work import UnitOfWork
+from src.models import TranscriptionCacheEntry
+from src.services.transcription import (
+    HedgedTranscriber,
+    Transcript,
+    TranscriptionError,
+    transcription_cache,
+)
+from src.services.transcription.transport import (
+    CircuitBreaker,
+    CircuitOpenError,
+    CircuitState,
+    ResilientTransport,
+)
+
+
+class FakeBackend:
+    def __init__(self, model: str, text: str = "", delay: float = 0.0, fail: bool = False):
+        self.model = model
+        self.text = text
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+        self.cancelled = False
+
+    async def transcribe(self, audio: bytes, filename: str, language: str) -> str:
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.fail:
+            raise TranscriptionError(f"{self.model} failed")
+        return self.text
+
+
+@pytest.mark.asyncio
+async def test_fast_primary_wins_without_starting_fallback() -> None:
+    primary = FakeBackend("groq", "primário")
+    fallback = FakeBackend("local", "local")
+    transcriber = HedgedTranscriber(primary, fallback, hedge_delay=0.5)
+
+    result = await transcriber.transcribe(b"ogg", "a.ogg", "pt")
+
+    assert result == Transcript("primário", "groq")
+    assert fallback.calls == 0
+    assert transcriber.stats().primary_wins == 1
+
+
+class TransportBackend(FakeBackend):
+    """Primary going through a ``ResilientTransport``, like ``GroqWhisperBackend``."""
+
+    def __init__(self, transport: ResilientTransport, delays: list[float]):
+        super().__init__("groq", "primário")
+        self.transport = transport
+        self.delays = delays
+
+    async def transcribe(self, audio: bytes, filename: str, language: str) -> str:
+        self.delay = self.delays.pop(0)
+        try:
+            return await self.transport.call(lambda: FakeBackend.transcribe(self, audio, "", ""))
+        except CircuitOpenError as exc:
+            raise TranscriptionError("circuit open") from exc
+
+
+@pytest.mark.asyncio
+async def test_fallback_winning_over_half_open_probe_keeps_groq_usable() -> None:
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+    breaker.record_failure()
+    await asyncio.sleep(0.02)
+    assert breaker.state is CircuitState.HALF_OPEN
+    transport = ResilientTransport(max_attempts=1, breaker=breaker)
+    primary = TransportBackend(transport, delays=[1.0, 0.0])
+    transcriber = HedgedTranscriber(primary, FakeBackend("local", "local"), hedge_delay=0.02)
+
+    hedged = await transcriber.transcribe(b"ogg", "a.ogg", "pt")  # probe cancelled
+    again = await transcriber.transcribe(b"ogg", "a.ogg", "pt")
+
+    assert (hedged.model, again.model) == ("local", "groq")
+    assert primary.cancelled
+    assert breaker.state is CircuitState.CLOSED
+    assert transport.stats().short_circuited == 0
+
+
+@pytest.mark.asyncio
+async def test_primary_error_falls_back_immediately() -> None:
+    primary = FakeBackend("groq", fail=True)
+    fallback = FakeBackend("local", "local")
+    transcriber = HedgedTranscriber(primary, fallback, hedge_delay=5.0)
+
+    result = await asyncio.wait_for(transcriber.transcribe(b"ogg", "a.ogg", "pt"), 1.0)
+
+    assert result == Transcript("local", "local")
+    stats = transcriber.stats()
+    assert (stats.fallback_on_error, stats.fallback_wins, stats.hedged) == (1, 1, 0)
+
+
+@pytest.mark.asyncio
+async def test_slow_primary_is_hedged_and_loser_cancelled() -> None:
+    primary = FakeBackend("groq", "primário", delay=1.0)
+    fallback = FakeBackend("local", "local", delay=0.01)
+    transcriber = HedgedTranscriber(primary, fallback, hedge_delay=0.02)
+
+    result = await transcriber.transcribe(b"ogg", "a.ogg", "pt")
+    await asyncio.sleep(0)
+
+    assert result.model == "local"
+    assert primary.cancelled
+    assert transcriber.stats().hedged == 1
+
+
+@pytest.mark.asyncio
+async def test_hedged_primary_can_still_win() -> None:
+    primary = FakeBackend("groq", "primário", delay=0.03)
+    fallback = FakeBackend("local", "local", delay=1.0)
+    transcriber = HedgedTranscriber(primary, fallback, hedge_delay=0.01)
+
+    result = await transcriber.transcribe(b"ogg", "a.ogg", "pt")
+    await asyncio.sleep(0)
+
+    assert result.model == "groq"
+    assert fallback.cancelled
+    stats = transcriber.stats()
+    assert (stats.hedged, stats.primary_wins) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_all_backends_failing_raises_transcription_error() -> None:
+    transcriber = HedgedTranscriber(
+        FakeBackend("groq", fail=True), FakeBackend("local", fail=True), hedge_delay=0.01
+    )
+
+    with pytest.raises(TranscriptionError):
+        await transcriber.transcribe(b"ogg", "a.ogg", "pt")
+    assert transcriber.stats().failures == 1
+
+
+@pytest.mark.asyncio
+async def test_without_fallback_only_primary_runs() -> None:
+    transcriber = HedgedTranscriber(FakeBackend("groq", fail=True), hedge_delay=0.01)
+
+    assert transcriber.models == ["groq"]
+    with pytest.raises(TranscriptionError):
+        await transcriber.transcribe(b"ogg", "a.ogg", "pt")
+
+
+@pytest.mark.asyncio
+async def test_cache_lookup_prefers_primary_model(test_engine: Engine, uow: UnitOfWork) -> None:
+    with Session(test_engine) as session:
+        for model, text in (("local", "texto local"), ("groq", "texto groq")):
+            session.add(
+                TranscriptionCacheEntry(
+                    file_unique_id="u1", language="pt", model=model, text=text, audio_bytes=3
+                )
+            )
+        session.commit()
+
+    assert await transcription_cache.lookup(uow.session, "u1", "pt", ["groq", "local"]) == (
+        "texto groq"
+    )
+    assert await transcription_cache.lookup(uow.session, "u1", "pt", ["other"]) is None
@@ -2,21 +2,20 @@
 
 from __future__ import annotations
 
-from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import groq
+import httpx
 import pytest
 
 from src.services.transcription import TranscriptionError, transcribe_audio
 
+_REQUEST = httpx.Request("POST", "https://api.groq.com/openai/v1/audio/transcriptions")
+
 
 @pytest.mark.asyncio
-async def test_transcribe_audio_success_returns_text(tmp_path: Path) -> None:
+async def test_transcribe_audio_success_returns_text() -> None:
     """When Groq returns text successfully, service should return the same text."""
-    audio_path = tmp_path / "audio.ogg"
-    audio_path.write_bytes(b"dummy")  # conteúdo não é relevante, chamada é mockada
-
     async_mock = AsyncMock(return_value="texto de teste")
     fake_client = MagicMock()
     fake_client.audio.transcriptions.create = async_mock
@@ -25,19 +24,18 @@ async def test_transcribe_audio_success_returns_text(tmp_path: Path) -> None:
         "src.services.transcription.groq_whisper._get_async_client",
         return_value=fake_client,
     ):
-        result = await transcribe_audio(audio_path)
+        result = await transcribe_audio(b"dummy", filename="abc.ogg")
 
     assert result == "texto de teste"
     async_mock.assert_awaited_once()
+    assert async_mock.await_args is not None
+    assert async_mock.await_args.kwargs["file"] == ("abc.ogg", b"dummy")
 
 
 @pytest.mark.asyncio
-async def test_transcribe_audio_raises_on_exception(tmp_path: Path) -> None:
+async def test_transcribe_audio_raises_on_exception() -> None:
     """If the underlying client raises, TranscriptionError should be raised."""
-    audio_path = tmp_path / "audio.ogg"
-    audio_path.write_bytes(b"dummy")
-
-    async_mock = AsyncMock(side_effect=groq.APIError(message="boom", request=None, body=None))
+    async_mock = AsyncMock(side_effect=groq.APIError(message="boom", request=_REQUEST, body=None))
     fake_client = MagicMock()
     fake_client.audio.transcriptions.create = async_mock
 
@@ -46,15 +44,12 @@ async def test_transcribe_audio_raises_on_exception(tmp_path: Path) -> None:
         return_value=fake_client,
     ):
         with pytest.raises(TranscriptionError):
-            await transcribe_audio(audio_path)
+            await transcribe_audio(b"dummy")
 
 
 @pytest.mark.asyncio
-async def test_transcribe_audio_raises_on_empty_response(tmp_path: Path) -> None:
+async def test_transcribe_audio_raises_on_empty_response() -> None:
     """Empty or whitespace-only responses are treated as errors."""
-    audio_path = tmp_path / "audio.ogg"
-    audio_path.write_bytes(b"dummy")
-
     async_mock = AsyncMock(return_value="   ")
     fake_client = MagicMock()
     fake_client.audio.transcriptions.create = async_mock
@@ -64,4 +59,27 @@ async def test_transcribe_audio_raises_on_empty_response(tmp_path: Path) -> None
         return_value=fake_client,
     ):
         with pytest.raises(TranscriptionError):
-            await transcribe_audio(audio_path)
+            await transcribe_audio(b"dummy")
+
+
+@pytest.mark.asyncio
+async def test_transcribe_audio_circuit_open_raises_transcription_error() -> None:
+    """With the breaker open, Groq is not called and TranscriptionError is raised."""
+    async_mock = AsyncMock(return_value="texto")
+    fake_client = MagicMock()
+    fake_client.audio.transcriptions.create = async_mock
+
+    with (
+        patch(
+            "src.services.transcription.groq_whisper._get_async_client",
+            return_value=fake_client,
+        ),
+        patch(
+            "src.services.transcription.groq_whisper.groq_transport.breaker.allow",
+            return_value=False,
+        ),
+    ):
+        with pytest.raises(TranscriptionError):
+            await transcribe_audio(b"dummy")
+
+    async_mock.assert_not_awaited()
@@ -0,0 +1,180 @@
+"""Unit tests for the resilient transcription transport (retry, breaker, limiter)."""
+
+import asyncio
+
+import groq
+import httpx
+import pytest
+
+from src.services.transcription.transport import (
+    CircuitBreaker,
+    CircuitOpenError,
+    CircuitState,
+    ResilientTransport,
+    is_retryable,
+)
+
+_REQUEST = httpx.Request("POST", "https://api.groq.com/openai/v1/audio/transcriptions")
+
+
+def _status_error(status: int, headers: dict[str, str] | None = None) -> groq.APIStatusError:
+    response = httpx.Response(status, headers=headers, request=_REQUEST)
+    return groq.APIStatusError(f"HTTP {status}", response=response, body=None)
+
+
+def _transport(**kwargs: object) -> ResilientTransport:
+    options: dict[str, object] = {"max_attempts": 3, "base_delay": 0.0, "max_delay": 1.0}
+    return ResilientTransport(**(options | kwargs))  # type: ignore[arg-type]
+
+
+def _flaky(*errors: Exception, result: str = "ok"):
+    calls = 0
+
+    async def request() -> str:
+        nonlocal calls
+        calls += 1
+        if calls <= len(errors):
+            raise errors[calls - 1]
+        return result
+
+    return request
+
+
+def test_is_retryable_classifies_status_codes() -> None:
+    assert is_retryable(_status_error(429))
+    assert is_retryable(_status_error(503))
+    assert is_retryable(groq.APITimeoutError(request=_REQUEST))
+    assert not is_retryable(_status_error(400))
+    assert not is_retryable(_status_error(401))
+
+
+async def test_retries_transient_errors_then_succeeds() -> None:
+    transport = _transport()
+    result = await transport.call(_flaky(_status_error(503), _status_error(429)))
+
+    assert result == "ok"
+    stats = transport.stats()
+    assert (stats.calls, stats.successes, stats.retries, stats.failures) == (1, 1, 2, 0)
+    assert stats.state is CircuitState.CLOSED
+
+
+async def test_gives_up_after_max_attempts() -> None:
+    transport = _transport(max_attempts=2)
+    with pytest.raises(groq.APIStatusError):
+        await transport.call(_flaky(*[_status_error(500)] * 3))
+    assert (transport.stats().retries, transport.stats().failures) == (1, 1)
+
+
+async def test_non_retryable_error_is_raised_immediately() -> None:
+    transport = _transport()
+    with pytest.raises(groq.APIStatusError):
+        await transport.call(_flaky(_status_error(400)))
+    assert transport.stats().retries == 0
+
+
+async def test_honors_retry_after_and_gives_up_when_too_long() -> None:
+    transport = _transport(max_delay=0.5)
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    await transport.call(_flaky(_status_error(429, {"retry-after-ms": "50"})))
+    assert loop.time() - started >= 0.05
+
+    with pytest.raises(groq.APIStatusError):
+        await transport.call(_flaky(_status_error(429, {"retry-after": "120"})))
+
+
+async def test_circuit_opens_fails_fast_and_recovers_after_probe() -> None:
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+    transport = _transport(max_attempts=1, breaker=breaker)
+    for _ in range(2):
+        with pytest.raises(groq.APIStatusError):
+            await transport.call(_flaky(_status_error(502)))
+    assert transport.stats().state is CircuitState.OPEN
+
+    never_called = _flaky(result="unused")
+    with pytest.raises(CircuitOpenError):
+        await transport.call(never_called)
+    assert transport.stats().short_circuited == 1
+
+    await asyncio.sleep(0.06)
+    assert transport.stats().state is CircuitState.HALF_OPEN
+    assert await transport.call(_flaky()) == "ok"
+    assert transport.stats().state is CircuitState.CLOSED
+
+
+async def test_failed_probe_reopens_circuit() -> None:
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+    transport = _transport(max_attempts=1, breaker=breaker)
+    with pytest.raises(groq.APIStatusError):
+        await transport.call(_flaky(_status_error(500)))
+    await asyncio.sleep(0.02)
+    with pytest.raises(groq.APIStatusError):
+        await transport.call(_flaky(_status_error(500)))
+    assert transport.stats().state is CircuitState.OPEN
+
+
+async def test_client_error_does_not_reset_failure_count() -> None:
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30.0)
+    transport = _transport(max_attempts=1, breaker=breaker)
+    for status in (502, 400, 502):
+        with pytest.raises(groq.APIStatusError):
+            await transport.call(_flaky(_status_error(status)))
+    assert transport.stats().state is CircuitState.OPEN
+
+
+async def test_client_error_on_probe_keeps_circuit_half_open() -> None:
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+    transport = _transport(max_attempts=1, breaker=breaker)
+    with pytest.raises(groq.APIStatusError):
+        await transport.call(_flaky(_status_error(500)))
+    await asyncio.sleep(0.02)
+
+    with pytest.raises(groq.APIStatusError):
+        await transport.call(_flaky(_status_error(400)))
+    assert transport.stats().state is CircuitState.HALF_OPEN
+    assert await transport.call(_flaky()) == "ok"
+    assert transport.stats().state is CircuitState.CLOSED
+
+
+async def test_concurrency_is_capped() -> None:
+    transport = _transport(max_concurrency=2)
+    peak = 0
+
+    async def request() -> str:
+        nonlocal peak
+        peak = max(peak, transport.stats().in_flight)
+        await asyncio.sleep(0.01)
+        return "ok"
+
+    await asyncio.gather(*(transport.call(request) for _ in range(6)))
+    assert peak == 2
+
+
+async def test_cancelled_probe_is_released() -> None:
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+    transport = _transport(max_attempts=1, breaker=breaker)
+    with pytest.raises(groq.APIStatusError):
+        await transport.call(_flaky(_status_error(500)))
+    await asyncio.sleep(0.02)
+
+    probe = asyncio.create_task(transport.call(asyncio.Event().wait))
+    await asyncio.sleep(0)
+    probe.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await probe
+
+    assert transport.stats().state is CircuitState.HALF_OPEN
+    assert await transport.call(_flaky()) == "ok"
+    assert transport.stats().state is CircuitState.CLOSED
+
+
+async def test_probe_failing_unexpectedly_is_released() -> None:
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+    transport = _transport(max_attempts=1, breaker=breaker)
+    with pytest.raises(groq.APIStatusError):
+        await transport.call(_flaky(_status_error(500)))
+    await asyncio.sleep(0.02)
+
+    with pytest.raises(RuntimeError):
+        await transport.call(_flaky(RuntimeError("bug")))
+    assert await transport.call(_flaky()) == "ok"
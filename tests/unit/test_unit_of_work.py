@@ -0,0 +1,84 @@
+"""Unit tests for the per-update unit of work (shared session per Telegram update)."""
+
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy import Engine, event, update
+from sqlmodel import Session, col, select
+
+from src.bot.context import BotContext
+from src.bot.handlers.categories import add_categoria_handler
+from src.db import session as db_session
+from src.db.unit_of_work import current_unit_of_work, unit_of_work
+from src.models import Category, User
+from src.services.auth import hash_pin
+
+
+async def test_unit_of_work_is_current_inside_block(test_engine: Engine) -> None:
+    assert current_unit_of_work() is None
+    async with unit_of_work() as uow:
+        assert current_unit_of_work() is uow
+    assert current_unit_of_work() is None
+
+
+async def test_unit_of_work_commits_pending_changes_on_exit(test_engine: Engine) -> None:
+    async with unit_of_work() as uow:
+        uow.session.add(User(telegram_id=1001, pin_hash="h"))
+
+    with Session(test_engine) as session:
+        assert session.exec(select(User).where(User.telegram_id == 1001)).first() is not None
+
+
+async def test_unit_of_work_commits_core_statements_on_exit(test_engine: Engine) -> None:
+    with Session(test_engine) as session:
+        session.add(User(telegram_id=1003, pin_hash="h"))
+        session.commit()
+
+    async with unit_of_work() as uow:
+        await uow.session.exec(  # type: ignore[call-overload]
+            update(User).where(col(User.telegram_id) == 1003).values(failed_attempts=2)
+        )
+
+    with Session(test_engine) as session:
+        user = session.exec(select(User).where(User.telegram_id == 1003)).one()
+        assert user.failed_attempts == 2
+
+
+async def test_unit_of_work_rolls_back_on_error(test_engine: Engine) -> None:
+    with pytest.raises(RuntimeError):
+        async with unit_of_work() as uow:
+            uow.session.add(User(telegram_id=1002, pin_hash="h"))
+            raise RuntimeError("boom")
+
+    with Session(test_engine) as session:
+        assert session.exec(select(User).where(User.telegram_id == 1002)).first() is None
+
+
+def test_bot_context_uow_requires_active_unit_of_work() -> None:
+    context = BotContext(application=MagicMock())
+    with pytest.raises(RuntimeError):
+        _ = context.uow
+
+
+async def test_auth_check_and_handler_share_one_connection_checkout(test_engine: Engine) -> None:
+    """/add_categoria: auth lookup, duplicate check and insert use one pool checkout."""
+    with Session(test_engine) as session:
+        session.add(User(telegram_id=2001, pin_hash=hash_pin("1234"), last_login=datetime.now(UTC)))
+        session.commit()
+
+    checkouts: list[object] = []
+    sync_engine = db_session.async_engine.sync_engine
+    event.listen(sync_engine, "checkout", lambda *args: checkouts.append(args))
+
+    update = MagicMock()
+    update.effective_user = MagicMock(id=2001)
+    update.message = MagicMock(text="/add_categoria Mercado", reply_text=AsyncMock())
+
+    async with unit_of_work() as uow:
+        await add_categoria_handler(update, MagicMock(uow=uow))
+
+    assert len(checkouts) == 1
+    with Session(test_engine) as session:
+        names = [c.name for c in session.exec(select(Category)).all()]
+    assert names == ["Mercado"]
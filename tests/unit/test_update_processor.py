@@ -0,0 +1,120 @@
+"""Unit tests for the per-user ordered update processor."""
+
+import asyncio
+from datetime import UTC, datetime
+
+import pytest
+from telegram import Chat, Message, Update, User
+
+from src.bot.update_processor import UserOrderedUpdateProcessor
+
+_update_ids = iter(range(1, 1_000_000))
+
+
+def _update(user_id: int) -> Update:
+    user = User(id=user_id, first_name="t", is_bot=False)
+    chat = Chat(id=user_id, type="private")
+    message = Message(message_id=1, date=datetime.now(UTC), chat=chat, from_user=user)
+    return Update(update_id=next(_update_ids), message=message)
+
+
+def _processor(**kwargs: int) -> UserOrderedUpdateProcessor:
+    options = {"max_running": 8, "max_queue_per_user": 8, "max_pending": 64} | kwargs
+    return UserOrderedUpdateProcessor(**options)
+
+
+async def test_same_user_updates_run_in_arrival_order() -> None:
+    processor = _processor()
+    order: list[int] = []
+
+    async def handle(n: int, delay: float) -> None:
+        await asyncio.sleep(delay)
+        order.append(n)
+
+    # Later updates are faster; ordering must still follow arrival
+    await asyncio.gather(
+        *(processor.process_update(_update(1), handle(n, 0.03 - n * 0.01)) for n in range(3))
+    )
+    assert order == [0, 1, 2]
+
+
+async def test_different_users_run_in_parallel() -> None:
+    processor = _processor()
+    both_running = asyncio.Event()
+    running: set[int] = set()
+
+    async def handle(user_id: int) -> None:
+        running.add(user_id)
+        if len(running) == 2:
+            both_running.set()
+        await asyncio.wait_for(both_running.wait(), timeout=1)
+
+    await asyncio.gather(
+        processor.process_update(_update(1), handle(1)),
+        processor.process_update(_update(2), handle(2)),
+    )
+    assert running == {1, 2}
+
+
+async def test_global_limit_caps_running_updates() -> None:
+    processor = _processor(max_running=2)
+    peak = 0
+
+    async def handle() -> None:
+        nonlocal peak
+        peak = max(peak, processor.stats().running)
+        await asyncio.sleep(0.01)
+
+    await asyncio.gather(*(processor.process_update(_update(u), handle()) for u in range(6)))
+    assert peak == 2
+
+
+async def test_per_user_queue_is_bounded_and_exposes_depths() -> None:
+    processor = _processor(max_queue_per_user=2)
+    release = asyncio.Event()
+    handled: list[int] = []
+
+    async def handle(n: int) -> None:
+        await release.wait()
+        handled.append(n)
+
+    tasks = [asyncio.create_task(processor.process_update(_update(7), handle(n))) for n in range(3)]
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+
+    assert processor.queue_depths() == {7: 2}
+    stats = processor.stats()
+    assert (stats.queued, stats.active_users, stats.max_user_depth, stats.dropped) == (2, 1, 2, 1)
+
+    release.set()
+    await asyncio.gather(*tasks)
+    assert handled == [0, 1]
+    assert processor.queue_depths() == {}
+
+
+async def test_cancelled_waiting_update_does_not_block_the_queue() -> None:
+    processor = _processor()
+    release = asyncio.Event()
+    handled: list[int] = []
+
+    async def handle(n: int) -> None:
+        if n == 0:
+            await release.wait()
+        handled.append(n)
+
+    first = asyncio.create_task(processor.process_update(_update(9), handle(0)))
+    second = asyncio.create_task(processor.process_update(_update(9), handle(1)))
+    third = asyncio.create_task(processor.process_update(_update(9), handle(2)))
+    await asyncio.sleep(0)
+    second.cancel()
+    release.set()
+    await first
+    await third
+    with pytest.raises(asyncio.CancelledError):
+        await second
+    assert handled == [0, 2]
+
+
+def test_rejects_non_positive_limits() -> None:
+    with pytest.raises(ValueError):
+        UserOrderedUpdateProcessor(max_running=0, max_queue_per_user=1, max_pending=10)